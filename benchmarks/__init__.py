@@ -0,0 +1 @@
+"""Benchmarks for MemoPad (run from the project's directory)."""
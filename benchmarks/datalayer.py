@@ -0,0 +1,337 @@
+"""Times operations of data layer on synthetic databases (without rendering).
+
+Example:
+    python -m benchmarks.datalayer --memos 1000 100000 --output new.json
+
+    python -m benchmarks.datalayer --baseline old.json --output new.json
+
+"""
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from statistics import mean, median
+from tempfile import gettempdir
+from time import perf_counter
+from typing import Callable, Iterable
+
+from benchmarks.dataset import DATASET_SEED, build_db
+from modules.memostore import connect_db, count_total, find_last_memos
+from modules.memostore import find_memo_by_rowid, find_memos_by_date
+from modules.memostore import find_memos_by_tag, find_memos_by_text
+from modules.memostore import find_memos_by_title, iter_memo_pages
+from modules.memostore import iter_memos, iter_snippet_pages
+from modules.memostore import parse_date_range, SEARCH_CACHE
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DATASET_SIZES: list[int] = [1000, 10000, 100000]
+RUNS = 5
+ROWID_LOOKUPS = 100
+REGRESSION_RATIO = 1.25
+OPERATIONS: dict[str, Callable[[sqlite3.Connection], int]] = {
+    # show_recent, show_last: the latest memos.
+    'find_last_memos': lambda connection: len(
+        find_last_memos(connection, 5)
+    ),
+    # show_total_memos, count_memos.
+    'count_total': count_total,
+    # show_all: every page of memos.
+    'iter_memo_pages': lambda connection: sum(
+        len(page) for page in iter_memo_pages(connection)
+    ),
+    # search_memo_by_rowid, edit-*, del-memo: lookups by primary key.
+    'find_memo_by_rowid': lambda connection: sum(
+        find_memo_by_rowid(connection, rowid) is not None
+        for rowid in range(1, ROWID_LOOKUPS + 1)
+    ),
+    # search_memo_by_date: a month in the middle of dataset.
+    'find_memos_by_date': lambda connection: len(
+        find_memos_by_date(connection, *parse_date_range('2021-06'))
+    ),
+    # batch search --title: a frequent word and a rare one.
+    'find_memos_by_title:frequent': lambda connection: len(
+        find_memos_by_title(connection, 'заметка')
+    ),
+    'find_memos_by_title:rare': lambda connection: len(
+        find_memos_by_title(connection, 'linux')
+    ),
+    # batch search --text, search-all: a prefix and two words.
+    'find_memos_by_text:prefix': lambda connection: len(
+        find_memos_by_text(connection, 'пров')
+    ),
+    'find_memos_by_text:words': lambda connection: len(
+        find_memos_by_text(connection, 'work release')
+    ),
+    # search_memo_by_text: the first page of snippets of a frequent word.
+    'iter_snippet_pages:first': lambda connection: len(
+        next(iter_snippet_pages(connection, 'bodies', 'заметка'), [])
+    ),
+    # search_memo_by_tag: a tag, a prefix and any of tags.
+    'find_memos_by_tag:exact': lambda connection: len(
+        find_memos_by_tag(connection, 'работа')
+    ),
+    'find_memos_by_tag:prefix': lambda connection: len(
+        find_memos_by_tag(connection, 'pro*')
+    ),
+    'find_memos_by_tag:any': lambda connection: len(
+        find_memos_by_tag(connection, 'sqlite | linux')
+    ),
+    # export: streaming of all memos.
+    'iter_memos': lambda connection: sum(1 for _ in iter_memos(connection)),
+}
+# Searches repeated in session are answered by `SEARCH_CACHE`: these ones
+# are timed with cache as well (as `operation:cached`).
+CACHED_OPERATIONS: list[str] = [
+    'find_memos_by_date',
+    'find_memos_by_text:words',
+    'find_memos_by_tag:exact',
+]
+
+
+def prepare_db(data_dir: Path, count: int, seed: int) -> Path:
+    """Builds database of synthetic memos (or reuses the built one).
+
+    Args:
+        data_dir (Path): PosixPath of directory for databases.
+        count (int): a number of memos.
+        seed (int): seed of random generator.
+
+    Returns:
+        Path: PosixPath of database.
+
+    """
+    path = data_dir.joinpath(f'memos-{count}-{seed}.db')
+
+    if not path.exists():
+        print(f'Building {path.name}...', file=sys.stderr)
+        build_db(path, count, seed)
+
+    return path
+
+
+def time_operation(
+    connection: sqlite3.Connection,
+    operation: Callable[[sqlite3.Connection], int],
+    runs: int,
+    cached: bool = False,
+) -> dict[str, float]:
+    """Times operation (the first run warms cache up and is not counted).
+
+    Note:
+        Session's cache of search results (`SEARCH_CACHE`) is cleared
+        before every run, so the query itself is timed; with `cached`
+        repeated searches are answered from the cache.
+
+    Args:
+        connection (Connection): connection to database.
+        operation (Callable[[Connection], int]): operation returning
+        a number of read rows.
+        runs (int): a number of timed runs.
+        cached (bool): keep cache of search results between runs.
+
+    Returns:
+        dict[str, float]: number of rows and min, median, mean and max
+        time of runs (ms).
+
+    """
+    rows = operation(connection)
+    timings = []
+
+    for _ in range(runs):
+        if not cached:
+            SEARCH_CACHE.clear()
+
+        start = perf_counter()
+        operation(connection)
+        timings.append((perf_counter() - start) * 1000)
+
+    return {
+        'rows': rows,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(median(timings), 3),
+        'mean_ms': round(mean(timings), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+def run_benchmarks(
+    data_dir: Path, sizes: Iterable[int], runs: int, seed: int
+) -> list[dict[str, object]]:
+    """Times every operation of `OPERATIONS` on databases of given sizes.
+
+    Note:
+        Operations of `CACHED_OPERATIONS` are timed twice: without cache
+        of search results and with it.
+
+    Args:
+        data_dir (Path): PosixPath of directory for databases.
+        sizes (Iterable[int]): numbers of memos in databases.
+        runs (int): a number of timed runs of every operation.
+        seed (int): seed of random generator.
+
+    Returns:
+        list[dict[str, object]]: results (size, operation and timings).
+
+    """
+    results = []
+
+    for count in sizes:
+        path = prepare_db(data_dir, count, seed)
+        connection = connect_db(path)
+
+        try:
+            timed = [
+                (name, operation, False)
+                for name, operation in OPERATIONS.items()
+            ] + [
+                (f'{name}:cached', OPERATIONS[name], True)
+                for name in CACHED_OPERATIONS
+            ]
+
+            for name, operation, cached in timed:
+                results.append(
+                    {
+                        'memos': count,
+                        'operation': name,
+                        **time_operation(connection, operation, runs, cached),
+                    }
+                )
+                print(
+                    f'{count:>8} {name:<34} '
+                    + f'{results[-1]["median_ms"]:>10.3f} ms',
+                    file=sys.stderr,
+                )
+        finally:
+            connection.close()
+
+    return results
+
+
+def describe_environment() -> dict[str, str]:
+    """Describes environment of run (to compare runs across commits).
+
+    Returns:
+        dict[str, str]: commit, time of run and versions of Python
+        and SQLite.
+
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ''
+
+    return {
+        'commit': commit,
+        'date_time': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+    }
+
+
+def compare_results(
+    baseline: list[dict[str, object]],
+    results: list[dict[str, object]],
+    ratio: float,
+) -> list[str]:
+    """Compares median timings of run with baseline.
+
+    Args:
+        baseline (list[dict[str, object]]): results of previous run.
+        results (list[dict[str, object]]): results of this run.
+        ratio (float): ratio of medians regarded as regression.
+
+    Returns:
+        list[str]: regressed operations, e.g. `100000 iter_memos`.
+
+    """
+    previous = {
+        (result['memos'], result['operation']): result['median_ms']
+        for result in baseline
+    }
+    regressions = []
+
+    for result in results:
+        key = (result['memos'], result['operation'])
+
+        if key not in previous:
+            continue
+
+        change = result['median_ms'] / max(previous[key], 0.001)
+        print(
+            f'{key[0]:>8} {key[1]:<34} {previous[key]:>10.3f} -> '
+            + f'{result["median_ms"]:>10.3f} ms (x{change:.2f})',
+            file=sys.stderr,
+        )
+
+        if change > ratio:
+            regressions.append(f'{key[0]} {key[1]}')
+
+    return regressions
+
+
+def main() -> int:
+    """Runs benchmarks and writes results as JSON.
+
+    Returns:
+        int: 0 if no operation regressed against baseline, 1 otherwise.
+
+    """
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--memos', type=int, nargs='+', default=DATASET_SIZES)
+    parser.add_argument('--runs', type=int, default=RUNS)
+    parser.add_argument('--seed', type=int, default=DATASET_SEED)
+    parser.add_argument(
+        '--data-dir', type=Path, default=Path(gettempdir(), 'memopad-bench')
+    )
+    parser.add_argument('--output', type=Path, default=Path('-'))
+    parser.add_argument('--baseline', type=Path)
+    parser.add_argument('--ratio', type=float, default=REGRESSION_RATIO)
+    args = parser.parse_args()
+
+    report = {
+        'environment': describe_environment(),
+        'runs': args.runs,
+        'seed': args.seed,
+        'results': run_benchmarks(
+            args.data_dir, args.memos, args.runs, args.seed
+        ),
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if str(args.output) == '-':
+        print(text)
+    else:
+        args.output.write_text(text + '\n', encoding='utf-8')
+
+    regressions = []
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare_results(
+            baseline['results'], report['results'], args.ratio
+        )
+
+    if regressions:
+        print(
+            f'Regressed (x{args.ratio} slower): {", ".join(regressions)}',
+            file=sys.stderr,
+        )
+        print('FAIL', file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
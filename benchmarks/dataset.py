@@ -0,0 +1,184 @@
+"""Generates synthetic databases of memos for benchmarks.
+
+Example:
+    python -m benchmarks.dataset --memos 100000 --output /tmp/memos.db
+
+"""
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from pathlib import Path
+from random import Random
+from typing import Iterator
+
+from modules.importer import insert_memos
+from modules.memostore import connect_db, make_memo, migrate_db
+
+DATASET_SEED = 1967
+INSERT_BATCH_SIZE = 5000
+FIRST_DATE = datetime(2019, 1, 1)
+DATASET_DAYS = 5 * 365
+CYRILLIC_WORDS: list[str] = (
+    'заметка работа проект встреча задача идея список план отчёт письмо '
+    'книга статья покупки дом семья отпуск поездка здоровье спорт бюджет '
+    'договор клиент звонок вопрос ответ решение ошибка версия релиз код '
+    'сервер база данные запрос таблица поиск индекс память время неделя '
+    'месяц утро вечер важно срочно позже сегодня завтра вчера обсудить '
+    'проверить купить прочитать написать отправить исправить улучшить'
+).split()
+LATIN_WORDS: list[str] = (
+    'memo work project meeting task idea list plan report letter book '
+    'article shopping home family vacation trip health sport budget '
+    'contract client call question answer decision error version release '
+    'code server database query table search index memory time week month '
+    'morning evening important urgent later today tomorrow yesterday '
+    'discuss check buy read write send fix improve python sqlite linux'
+).split()
+TAGS: list[str] = (
+    'работа дом идеи проект книги покупки здоровье финансы учёба поездки '
+    'work home ideas project books todo python sqlite linux reading '
+    'meeting personal archive draft review release bug feature docs misc'
+).split()
+LATIN_SHARE = 0.3
+LONG_BODY_SHARE = 0.05
+NO_TAG_SHARE = 0.1
+
+
+def make_weights(count: int) -> list[float]:
+    """Makes cumulative weights of Zipf's distribution (1/rank).
+
+    Args:
+        count (int): a number of items (words or tags).
+
+    Returns:
+        list[float]: cumulative weights for `Random.choices`.
+
+    """
+    return list(accumulate(1 / rank for rank in range(1, count + 1)))
+
+
+def generate_memos(
+    count: int, seed: int = DATASET_SEED
+) -> Iterator[tuple[str, ...]]:
+    """Generates realistic memos (reproducible by seed).
+
+    Note:
+        Words and tags follow Zipf's distribution (the first words of
+        `CYRILLIC_WORDS`, `LATIN_WORDS` and `TAGS` are the most frequent),
+        30% of memos are written in Latin, 5% of memos have long texts
+        (compressed by `pack_body`), 10% of memos have no tags; dates are
+        spread over `DATASET_DAYS` days in order of creation.
+
+    Args:
+        count (int): a number of memos.
+        seed (int): seed of random generator.
+
+    Yields:
+        tuple[str, ...]: memo (date_time, title, body and tag).
+
+    """
+    random = Random(seed)
+    cyrillic_weights = make_weights(len(CYRILLIC_WORDS))
+    latin_weights = make_weights(len(LATIN_WORDS))
+    tag_weights = make_weights(len(TAGS))
+    step = DATASET_DAYS * 86400 / max(count, 1)
+
+    for number in range(count):
+        if random.random() < LATIN_SHARE:
+            words, weights = LATIN_WORDS, latin_weights
+        else:
+            words, weights = CYRILLIC_WORDS, cyrillic_weights
+
+        if random.random() < LONG_BODY_SHARE:
+            length = random.randint(300, 1500)
+        else:
+            length = random.randint(5, 80)
+
+        title = random.choices(words, cum_weights=weights, k=3)
+        body = random.choices(words, cum_weights=weights, k=length)
+        lines = [
+            ' '.join(body[start : start + 12]).capitalize() + '.'
+            for start in range(0, length, 12)
+        ]
+
+        if random.random() < NO_TAG_SHARE:
+            tags = []
+        else:
+            tags = random.choices(
+                TAGS, cum_weights=tag_weights, k=random.randint(1, 3)
+            )
+
+        date_time = FIRST_DATE + timedelta(seconds=int(number * step))
+
+        yield make_memo(
+            ' '.join(title).capitalize(),
+            '\n'.join(lines),
+            ' '.join(dict.fromkeys(tags)),
+            date_time.strftime('%Y-%m-%d %H:%M:%S'),
+        )
+
+
+def build_db(path: Path, count: int, seed: int = DATASET_SEED) -> int:
+    """Creates database with synthetic memos (schema of the latest version).
+
+    Args:
+        path (Path): PosixPath of new database (must not exist).
+        count (int): a number of memos.
+        seed (int): seed of random generator.
+
+    Returns:
+        int: number of inserted memos.
+
+    Raises:
+        FileExistsError: If database already exists.
+        DatabaseError: If operation failed.
+
+    """
+    if path.exists():
+        raise FileExistsError(path)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = connect_db(path)
+    memos = generate_memos(count, seed)
+    inserted = 0
+
+    try:
+        migrate_db(connection)
+
+        while batch := list(islice(memos, INSERT_BATCH_SIZE)):
+            inserted += insert_memos(connection, batch)
+
+        connection.execute('PRAGMA optimize;')
+        connection.execute('PRAGMA wal_checkpoint(TRUNCATE);')
+    finally:
+        connection.close()
+
+    return inserted
+
+
+def main() -> int:
+    """Builds database of synthetic memos.
+
+    Returns:
+        int: 0 if database is built, 1 if it already exists.
+
+    """
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--memos', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=DATASET_SEED)
+    parser.add_argument('--output', type=Path, required=True)
+    args = parser.parse_args()
+
+    try:
+        inserted = build_db(args.output, args.memos, args.seed)
+    except FileExistsError:
+        print(f'Database already exists: {args.output}', file=sys.stderr)
+        return 1
+
+    print(f'Inserted {inserted} memos into {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
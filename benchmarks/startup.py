@@ -0,0 +1,137 @@
+"""Measures cold start of MemoPad (until prompt `memopad >>>` appears).
+
+Example:
+    python -m benchmarks.startup --runs 5 --budget 400
+
+"""
+import os
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_MS = 400.0
+IMPORT_DEPTH = 2
+IMPORT_TIME = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)')
+LAZY_MODULES: list[str] = [
+    'pyperclip',
+    'modules.sqlconnector',
+    'modules.memoeditor',
+    'help.commandshelp',
+]
+STARTUP_SCRIPT = """
+import sys
+import time
+
+START = time.perf_counter()
+
+import modules.prompter
+
+
+def reach_prompt(*args, **kwargs):
+    elapsed = (time.perf_counter() - START) * 1000
+    print(f'STARTUP_MS {elapsed:.1f}', file=sys.stderr)
+    print('IMPORTED ' + ' '.join(sorted(sys.modules)), file=sys.stderr)
+    raise SystemExit(0)
+
+
+modules.prompter.prompt = reach_prompt
+
+import main
+
+main.main()
+"""
+
+
+def run_startup(home: Path) -> tuple[float, dict[str, int], set[str]]:
+    """Runs MemoPad in a new interpreter until the first prompt.
+
+    Args:
+        home (Path): temporary home directory (for database).
+
+    Returns:
+        tuple[float, dict[str, int], set[str]]: time to prompt (ms),
+        cumulative import time of modules up to `IMPORT_DEPTH` (us)
+        and names of all imported modules.
+
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=PROJECT_DIR,
+        env={**os.environ, 'HOME': str(home)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    startup_ms = 0.0
+    import_times = {}
+    imported = set()
+
+    for line in result.stderr.splitlines():
+        if line.startswith('STARTUP_MS '):
+            startup_ms = float(line.split()[1])
+        elif line.startswith('IMPORTED '):
+            imported = set(line.split()[1:])
+        elif match := IMPORT_TIME.match(line):
+            depth = len(match.group(2)) // 2
+
+            if depth <= IMPORT_DEPTH:
+                import_times[match.group(3)] = int(match.group(1))
+
+    return startup_ms, import_times, imported
+
+
+def main() -> int:
+    """Runs benchmark and checks startup time against budget.
+
+    Returns:
+        int: 0 if median startup time fits budget and lazy modules
+        are not imported at startup, 1 otherwise.
+
+    """
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    timings = []
+
+    with TemporaryDirectory() as home:
+        for _ in range(args.runs):
+            startup_ms, import_times, imported = run_startup(Path(home))
+            timings.append(startup_ms)
+
+    top_imports = sorted(
+        import_times.items(), key=lambda item: item[1], reverse=True
+    )[: args.top]
+
+    print(
+        f'Startup (until prompt): median {median(timings):.1f} ms, '
+        f'min {min(timings):.1f} ms, max {max(timings):.1f} ms '
+        f'(budget {args.budget:.1f} ms)'
+    )
+    print('Heaviest imports (cumulative, last run):')
+
+    for module, microseconds in top_imports:
+        print(f'  {module:<30} {microseconds / 1000:8.1f} ms')
+
+    eager_modules = [module for module in LAZY_MODULES if module in imported]
+
+    if eager_modules:
+        print(f'Imported at startup (must be lazy): {" ".join(eager_modules)}')
+
+    if median(timings) > args.budget or eager_modules:
+        print('FAIL')
+        return 1
+
+    print('OK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
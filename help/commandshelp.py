@@ -11,17 +11,27 @@ COMMANDS: str = """
 
 - `view-recent`(`-vr`) - просмотр последней (по времени создания) заметки
 - `view-last`(`-vl`) - просмотр последних 5 заметок
-- `view-all`(`-va`) - просмотр всех заметок
+- `view-all`(`-va`) - просмотр всех заметок (по страницам)
 - `count`(`-c`) - количество заметок в базе
 
 `add`(`-a`) - добавление новой заметки
 
+`import`(`-i`) - импорт заметок из папки с Markdown-файлами
+
+`export`(`-x`) - экспорт заметок (JSONL, CSV или Markdown-файлы)
+
 `edit`(`-e`) - редактирование заметки из базы, показывает команды:
 
 - `edit-title`(`-et`) - редактирование заголовка
 - `edit-text`(`-ex`) - редактирование основного текста (тела) заметки
 - `edit-tag`(`-eg`) - редактирование тега заметки
 
+`history`(`-hs`) - прежние версии заметок, показывает команды:
+
+- `history-list`(`-hl`) - список прежних версий заметки (по ID)
+- `history-view`(`-hv`) - просмотр прежней версии заметки
+- `history-restore`(`-hr`) - восстановление прежней версии заметки
+
 `del`(`-d`) - удаление заметок из базы, показывает команды:
 
 - `del-memo`(`-dm`) - удаление заметки из базы (по ID)
@@ -30,10 +40,12 @@ COMMANDS: str = """
 `search`(`-s`) - поиск заметки в базе, показывает команды:
 
 - `search-id`(`-si`) - поиск заметки по ID
-- `search-date`(`-sd`) - поиск заметки по дате создания (редактирования)
+- `search-date`(`-sd`) - поиск заметок за день или период (месяц, год...)
 - `search-title`(`-st`) - поиск заметки по заголовку
 - `search-text`(`-sx`) - поиск заметки по основному тексту (телу)
 - `search-tag`(`-sg`) - поиск заметки по тегу
+- `search-part`(`-sp`) - поиск заметок по фрагменту (части слова)
+- `search-all`(`-sa`) - поиск заметок по тексту во всех блокнотах
 
 `howto`(`-w`) - редактирование текста, показывает инструкции:
 
@@ -42,12 +54,24 @@ COMMANDS: str = """
 
 `backup`(`-b`) - резервное копирование и восстановление, показывает команды:
 
-- `backup-db`(`-bd`) - создание резервной копии базы заметок
-- `restore-db`(`-od`) - восстановление базы заметок из резервной копии
-- `check-db`(`-kd`) - проверка целостности базы заметок
+- `backup-db`(`-bd`) - резервная копия базы заметок (только изменения)
+- `restore-db`(`-od`) - восстановление базы из выбранной резервной копии
+- `check-db`(`-kd`) - проверка целостности базы заметок (в фоне)
+- `tune-db`(`-td`) - перестроение файла базы по файлу настроек
 - `recreate-db`(`-ed`) - пересоздание базы заметок
 - `clear`(`-r`) - удаление всех данных (включая папку программы)
 
+`stats`(`-t`) - время запросов к базе и вывода на экран за сеанс
+
+`use`(`-u`) - выбор блокнота (отдельной базы заметок) или создание нового
+
+Размещение и параметры файла базы задаются в файле настроек
+`~/.memopad/config` (раздел `[storage]`): `path` - путь к базе заметок,
+`mmap_size` - объём чтения через отображение в память (байт), `cache_size` -
+кэш страниц (отрицательное число - КиБ), `page_size` - размер страницы,
+`journal_mode` - режим журнала (`wal`, `delete`...), `backup_compression` -
+сжатие резервных копий (`xz`, `gz`, `none`)
+
 `quit`(`-q`) - выход из программы
 
 Для подтверждения или отмены операций с базой заметок используются команды:
@@ -26,7 +26,7 @@ VIEW: str = """
 
 - `view-recent`(`-vr`) - просмотр последней (по времени создания) заметки
 - `view-last`(`-vl`) - просмотр последних 5 заметок
-- `view-all`(`-va`) - просмотр всех заметок
+- `view-all`(`-va`) - просмотр всех заметок (по страницам)
 - `count`(`-c`) - количество заметок в базе
 
 """
@@ -37,6 +37,14 @@ EDIT: str = """
 - `edit-text`(`-ex`) - редактирование основного текста (тела) заметки
 - `edit-tag`(`-eg`) - редактирование тега заметки
 
+"""
+HISTORY: str = """
+`history` показывает команды по работе с прежними версиями заметок:
+
+- `history-list`(`-hl`) - список прежних версий заметки (по ID)
+- `history-view`(`-hv`) - просмотр прежней версии заметки
+- `history-restore`(`-hr`) - восстановление прежней версии заметки
+
 """
 DEL: str = """
 `del` показывает команды по удалению заметок из базы:
@@ -49,18 +57,21 @@ SEARCH: str = """
 `search` показывает команды поиска заметок в базе:
 
 - `search-id`(`-si`) - поиск заметки по ID
-- `search-date`(`-sd`) - поиск заметки по дате создания (редактирования)
+- `search-date`(`-sd`) - поиск заметок за день или период (месяц, год...)
 - `search-title`(`-st`) - поиск заметки по заголовку
 - `search-text`(`-sx`) - поиск заметки по основному тексту (телу)
 - `search-tag`(`-sg`) - поиск заметки по тегу
+- `search-part`(`-sp`) - поиск заметок по фрагменту (части слова)
+- `search-all`(`-sa`) - поиск заметок по тексту во всех блокнотах
 
 """
 BACKUP: str = """
 `backup` показывает команды резервного копирования и восстановления:
 
-- `backup-db`(`-bd`) - создание резервной копии базы заметок
-- `restore-db`(`-od`) - восстановление базы заметок из резервной копии
-- `check-db`(`-kd`) - проверка целостности базы заметок
+- `backup-db`(`-bd`) - резервная копия базы заметок (только изменения)
+- `restore-db`(`-od`) - восстановление базы из выбранной резервной копии
+- `check-db`(`-kd`) - проверка целостности базы заметок (в фоне)
+- `tune-db`(`-td`) - перестроение файла базы по файлу настроек
 - `recreate-db`(`-ed`) - пересоздание базы заметок
 - `clear`(`-r`) - удаление всех данных (включая папку программы)
 
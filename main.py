@@ -1,127 +1,213 @@
 #!/usr/bin/env python3
 """MemoPad - CLI program using SQLite to store memos (version 1.2.0)."""
 import sys
+from importlib import import_module
+from typing import Any
 
-from prompt_toolkit.shortcuts import set_title
-
-from help.commandshelp import COMMANDS
-from modules.dbmanager import set_db_path
-from modules.dbmanager import backup_db, remove_db, restore_db, clear_data
-from help.howtokeys import HOTKEYS
-from help.howtomd import MARKDOWN
-from modules.mdprinter import print_new_memo, print_md
-from modules.memoeditor import create_new_memo
-from help.messages import HOWTO, VIEW, EDIT, DEL, SEARCH, BACKUP
-from help.messages import TITLE, INFO, COPYRIGHT, CLEAR
-from modules.prompter import check_command
-from modules.sqlconnector import add_memo, delete_memo, delete_all
-from modules.sqlconnector import check_db_integrity, check_db_path_and_table
-from modules.sqlconnector import create_db
-from modules.sqlconnector import edit_title, edit_body, edit_tag
-from modules.sqlconnector import search_memo_by_rowid, search_memo_by_date
-from modules.sqlconnector import search_memo_by_tag
-from modules.sqlconnector import search_memo_by_title, search_memo_by_text
-from modules.sqlconnector import show_recent, show_last
-from modules.sqlconnector import show_all, show_total_memos
+from help.messages import TITLE, INFO, COPYRIGHT
+from modules.memostore import set_db_path
+
+
+def load(name: str) -> Any:
+    """Imports handler of command (or help) on first use.
+
+    Note:
+        Modules of commands and their dependencies (e.g. `pyperclip`) are not
+        imported at startup, so prompt appears faster; imported modules
+        are cached by Python, next calls take no time.
+
+    Args:
+        name (str): names of module and object, e.g.
+        `modules.sqlconnector:show_all`.
+
+    Returns:
+        Any: function (handler of command) or help's text.
+
+    """
+    module_name, _, object_name = name.partition(':')
+
+    return getattr(import_module(module_name), object_name)
 
 
 def main() -> None:
     """Memopad - CLI program using SQLite to store memos: main module.
 
-    Runs command in a command-line interpreter.
+    Runs command in a command-line interpreter or, if command-line arguments
+    are given, runs one command in batch mode (see `modules.batch`).
+
+    Example:
+        memopad
+
+        memopad search --tag work --format jsonl
+
+    """
+    if len(sys.argv) > 1:
+        sys.exit(load('modules.batch:run_batch')(sys.argv[1:]))
+
+    run_interpreter()
+
+
+def run_interpreter() -> None:
+    """Runs command in a command-line interpreter.
 
     Note:
-        `main` prompts user to create database's backup before exit.
+        Interpreter opens one connection to database for the whole session
+        and passes it to commands; SQL-queries and rendering of commands
+        are measured by `modules.profiler` (see command `stats`).
+
+        Interpreter prompts user to create database's backup before exit.
 
     Example:
         memopad >>> help
 
     """
+    set_title = load('prompt_toolkit.shortcuts:set_title')
+    print_md = load('modules.mdprinter:print_md')
+    check_command = load('modules.prompter:check_command')
+    get_command_name = load('modules.prompter:get_command_name')
+    set_command = load('modules.profiler:set_command')
+    profiled = load('modules.profiler:ProfiledConnection')
+
     set_title('MemoPad')
 
     print_md(TITLE)
     print_md(INFO)
 
-    path = set_db_path()
-    check_db_path_and_table(path)
+    try:
+        path = set_db_path()
+    except ValueError as error:
+        print_md(f'Ошибка в файле настроек: {error}.')
+        sys.exit(1)
+
+    connection = load('modules.dbconnector:check_db_path_and_table')(
+        path, profiled
+    )
 
     command = check_command()
 
     while command not in ['quit', '-q']:
+        set_command(get_command_name(command))
+        check = load('modules.dbchecker:pop_finished_check')()
+
+        if check is not None:
+            load('modules.sqlconnector:report_db_integrity')(
+                check, check.path
+            )
+
         if command in ['help', '-h']:
-            print_md(COMMANDS)
+            print_md(load('help.commandshelp:COMMANDS'))
         elif command in ['howto', '-w']:
-            print_md(HOWTO)
+            print_md(load('help.messages:HOWTO'))
         elif command in ['howto-md', '-wm']:
-            print_md(MARKDOWN)
+            print_md(load('help.howtomd:MARKDOWN'))
         elif command in ['howto-hotkeys', '-wk']:
-            print_md(HOTKEYS)
+            print_md(load('help.howtokeys:HOTKEYS'))
 
         elif command in ['view', '-v']:
-            print_md(VIEW)
+            print_md(load('help.messages:VIEW'))
         elif command in ['view-recent', '-vr']:
-            show_recent(path)
+            load('modules.sqlconnector:show_recent')(connection)
         elif command in ['view-last', '-vl']:
-            show_last(path)
+            load('modules.sqlconnector:show_last')(connection)
         elif command in ['view-all', '-va']:
-            show_all(path)
+            load('modules.sqlconnector:show_all')(connection)
         elif command in ['count', '-c']:
-            show_total_memos(path)
+            load('modules.sqlconnector:show_total_memos')(connection)
 
         elif command in ['add', '-a']:
-            memo = create_new_memo()
-            print_new_memo(memo)
-            add_memo(path, memo)
+            memo = load('modules.memoeditor:create_new_memo')()
+            load('modules.mdprinter:print_new_memo')(memo)
+            load('modules.sqlconnector:add_memo')(connection, memo)
+        elif command in ['import', '-i']:
+            load('modules.sqlconnector:import_memos')(connection)
+        elif command in ['export', '-x']:
+            load('modules.sqlconnector:export_to_file')(connection)
 
         elif command in ['edit', '-e']:
-            print_md(EDIT)
+            print_md(load('help.messages:EDIT'))
         elif command in ['edit-title', '-et']:
-            edit_title(path)
+            load('modules.sqlconnector:edit_title')(connection)
         elif command in ['edit-text', '-ex']:
-            edit_body(path)
+            load('modules.sqlconnector:edit_body')(connection)
         elif command in ['edit-tag', '-eg']:
-            edit_tag(path)
+            load('modules.sqlconnector:edit_tag')(connection)
+
+        elif command in ['history', '-hs']:
+            print_md(load('help.messages:HISTORY'))
+        elif command in ['history-list', '-hl']:
+            load('modules.sqlconnector:show_history')(connection)
+        elif command in ['history-view', '-hv']:
+            load('modules.sqlconnector:show_version')(connection)
+        elif command in ['history-restore', '-hr']:
+            load('modules.sqlconnector:restore_version')(connection)
 
         elif command in ['del', '-d']:
-            print_md(DEL)
+            print_md(load('help.messages:DEL'))
         elif command in ['del-memo', '-dm']:
-            delete_memo(path)
+            load('modules.sqlconnector:delete_memo')(connection)
         elif command in ['del-all', '-da']:
-            delete_all(path)
+            load('modules.sqlconnector:delete_all')(connection)
 
         elif command in ['search', '-s']:
-            print_md(SEARCH)
+            print_md(load('help.messages:SEARCH'))
         elif command in ['search-id', '-si']:
-            search_memo_by_rowid(path)
+            load('modules.sqlconnector:search_memo_by_rowid')(connection)
         elif command in ['search-date', '-sd']:
-            search_memo_by_date(path)
+            load('modules.sqlconnector:search_memo_by_date')(connection)
         elif command in ['search-title', '-st']:
-            search_memo_by_title(path)
+            load('modules.sqlconnector:search_memo_by_title')(connection)
         elif command in ['search-text', '-sx']:
-            search_memo_by_text(path)
+            load('modules.sqlconnector:search_memo_by_text')(connection)
         elif command in ['search-tag', '-sg']:
-            search_memo_by_tag(path)
+            load('modules.sqlconnector:search_memo_by_tag')(connection)
+        elif command in ['search-part', '-sp']:
+            load('modules.sqlconnector:search_memo_by_part')(connection)
+        elif command in ['search-all', '-sa']:
+            load('modules.sqlconnector:search_all_notebooks')(path)
 
         elif command in ['backup', '-b']:
-            print_md(BACKUP)
+            print_md(load('help.messages:BACKUP'))
         elif command in ['backup-db', '-bd']:
-            backup_db(path)
+            load('modules.dbmanager:backup_db')(path)
         elif command in ['restore-db', '-od']:
-            restore_db(path)
+            connection.close()
+            load('modules.dbmanager:restore_db')(path)
+            connection = load('modules.dbconnector:open_db')(path, profiled)
+            load('modules.dbconnector:create_db')(connection)
         elif command in ['check-db', '-kd']:
-            check_db_integrity(path)
+            load('modules.sqlconnector:check_db_integrity')(path)
+        elif command in ['tune-db', '-td']:
+            load('modules.sqlconnector:tune_db')(connection, path)
         elif command in ['recreate-db', '-ed']:
-            remove_db(path)
-            create_db(path)
+            connection.close()
+            load('modules.dbmanager:remove_db')(path)
+            connection = load('modules.dbconnector:open_db')(path, profiled)
+            load('modules.dbconnector:create_db')(connection)
 
         elif command in ['clear', '-r']:
-            clear_data(path)
-            print_md(CLEAR)
+            connection.close()
+            load('modules.dbmanager:clear_data')(path)
+            print_md(load('help.messages:CLEAR'))
             sys.exit()
 
+        elif command in ['stats', '-t']:
+            load('modules.sqlconnector:show_stats')(path)
+
+        elif command in ['use', '-u']:
+            notebook = load('modules.dbmanager:choose_notebook')(path)
+
+            if notebook is not None:
+                connection.close()
+                path = notebook
+                connection = load(
+                    'modules.dbconnector:check_db_path_and_table'
+                )(path, profiled)
+
         command = check_command()
 
-    backup_db(path)
+    set_command('quit')
+    connection.close()
+    load('modules.dbmanager:backup_db')(path)
     print_md(COPYRIGHT)
 
 
@@ -0,0 +1,769 @@
+"""Stores rotating generations of DB's backups (without user's interface)."""
+import gzip
+import lzma
+import os
+import re
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from shutil import copyfileobj
+from sqlite3 import connect, Connection
+from typing import Callable, IO, Iterator, NamedTuple, Optional
+
+from modules.dbconfig import apply_config, get_config
+from modules.memostore import DEFAULT_NOTEBOOK, migrate_db
+from modules.memostore import register_functions
+
+BACKUP_STEP_PAGES = 1024
+BACKUP_GENERATIONS = 7
+COMPRESSIONS: dict[str, Callable[..., IO[bytes]]] = {
+    'xz': lzma.open,
+    'gz': gzip.open,
+}
+COMPRESSION_MAGIC: dict[bytes, str] = {
+    b'\xfd7zXZ\x00': 'xz',
+    b'\x1f\x8b': 'gz',
+}
+COPY_CHUNK_SIZE = 1024 * 1024
+LEGACY_BACKUP = 'memos.db.backup'
+GENERATION_FILE = re.compile(r'^(\d{6})\.(full|delta)\.db(?:\.(?:xz|gz))?$')
+SQL_CREATE_DELTA: tuple[str, ...] = (
+    """CREATE TABLE delta.memos
+           (
+           memo_id INTEGER PRIMARY KEY,
+           date_time DATETIME NOT NULL,
+           titles TEXT NOT NULL,
+           bodies TEXT NOT NULL,
+           body_format INTEGER NOT NULL,
+           tags TEXT NOT NULL
+           );""",
+    """CREATE TABLE delta.memo_tags
+           (
+           tag TEXT NOT NULL,
+           memo_id INTEGER NOT NULL
+           );""",
+    """CREATE TABLE delta.changes
+           (
+           memo_id INTEGER PRIMARY KEY
+           );""",
+    """CREATE TABLE delta.memo_revisions
+           (
+           id INTEGER PRIMARY KEY,
+           memo_id INTEGER NOT NULL,
+           date_time DATETIME NOT NULL,
+           delta BLOB NOT NULL
+           );""",
+)
+
+
+class Generation(NamedTuple):
+    """Generation of backup: full copy of DB or delta (changed memos)."""
+
+    number: int
+    is_full: bool
+    path: Path
+
+
+def set_backup_path(path: Path) -> Path:
+    """Sets path of directory of database's backups.
+
+    Note:
+        Backups of other notebooks are kept in subdirectories, e.g.
+        `~/.memopad/backups/work`.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    Returns:
+        Path: PosixPath of directory of backups (`~/.memopad/backups`).
+
+    """
+    working_dir = path.parent
+    path_backup = working_dir.joinpath('backups')
+
+    if path.stem != DEFAULT_NOTEBOOK:
+        path_backup = path_backup.joinpath(path.stem)
+
+    return path_backup
+
+
+def check_backup(path: Path) -> bool:
+    """Checks if database's backup of memos exists.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    Returns:
+        bool: True if any generation of backup (or backup of older
+        versions, see `import_legacy_backup`) exists, False otherwise.
+
+    """
+    return bool(list_generations(path)) or bool(find_legacy_backup(path))
+
+
+def list_generations(path: Path) -> list[Generation]:
+    """Lists generations of backup (from the oldest one).
+
+    Note:
+        The oldest generation is always full copy of DB, next ones
+        are deltas (memos changed since the previous generation) or full
+        copies (e.g. after DB was restored from older generation).
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    Returns:
+        list[Generation]: generations ordered by number.
+
+    """
+    path_backup = set_backup_path(path)
+
+    if not path_backup.is_dir():
+        return []
+
+    generations = []
+
+    for file in path_backup.iterdir():
+        match = GENERATION_FILE.match(file.name)
+
+        if match:
+            generations.append(
+                Generation(int(match[1]), match[2] == 'full', file)
+            )
+
+    return sorted(generations)
+
+
+def find_legacy_backup(path: Path) -> Optional[Path]:
+    """Finds backup of older versions (`memos.db.backup`) of DB.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    Returns:
+        Optional[Path]: PosixPath of the backup; None if it does not exist
+        (other notebooks have no such backup).
+
+    """
+    path_legacy = path.with_name(LEGACY_BACKUP)
+
+    if path.stem != DEFAULT_NOTEBOOK or not path_legacy.is_file():
+        return None
+
+    return path_legacy
+
+
+def import_legacy_backup(path: Path) -> Optional[Generation]:
+    """Imports backup of older versions (`memos.db.backup`) as generation.
+
+    Note:
+        Older versions kept the only full copy of DB next to it; the copy
+        is moved to directory of backups as the oldest full generation
+        (number 1 or the one before the oldest generation), so it is listed
+        and restored as any other generation. It is called once before
+        backup or restore (the moved file is not found again).
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    Returns:
+        Optional[Generation]: imported generation; None if there is
+        no backup of older versions.
+
+    Raises:
+        ValueError: If generation 0 exists (no number is older).
+        OSError: If the backup can not be moved.
+
+    """
+    path_legacy = find_legacy_backup(path)
+
+    if path_legacy is None:
+        return None
+
+    path_backup = set_backup_path(path)
+    path_backup.mkdir(parents=True, exist_ok=True)
+    numbers = [generation.number for generation in list_generations(path)]
+    number = min(numbers) - 1 if numbers else 1
+
+    if number < 0:
+        raise ValueError('generation 0 exists')
+
+    generation = Generation(
+        number, True, path_backup.joinpath(f'{number:06d}.full.db')
+    )
+    os.replace(path_legacy, generation.path)
+
+    return generation
+
+
+def describe_generation(generation: Generation) -> tuple[str, str]:
+    """Describes generation by time of creation and size of file.
+
+    Args:
+        generation (Generation): generation of backup.
+
+    Returns:
+        tuple[str, str]: date_time of generation and size of its file
+        (in KiB).
+
+    """
+    stat = generation.path.stat()
+    created = datetime.fromtimestamp(stat.st_mtime)
+
+    return created.strftime('%Y-%m-%d %H:%M:%S'), f'{stat.st_size / 1024:.0f}'
+
+
+def backup_generation(
+    path: Path,
+    progress: Optional[Callable[[int, int], None]] = None,
+    compression: Optional[str] = None,
+) -> Optional[Generation]:
+    """Backups DB as a new generation (delta or full copy).
+
+    Note:
+        Triggers record ROWIDs of changed memos to table `memo_changes`;
+        if DB was backed up to the latest generation, a new generation
+        contains only these memos with their revisions (and ROWIDs
+        of deleted ones). Otherwise
+        (the first backup or DB restored from older generation) DB is copied
+        fully.
+
+        DB is locked for writing while generation is made, so no change
+        is lost between copying and clearing of `memo_changes`; files
+        of generations appear complete (renamed from temporary files).
+
+        The oldest generations are merged, so only `BACKUP_GENERATIONS`
+        generations are kept.
+
+        Generation is compressed (if `compression` is given) after DB
+        is unlocked.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+        progress (Optional[Callable[[int, int], None]]): function called
+        with numbers of copied and total pages (for full copy).
+        compression (Optional[str]): `xz` or `gz` (see `COMPRESSIONS`,
+        e.g. set by config file); None to keep generation uncompressed.
+
+    Returns:
+        Optional[Generation]: new generation; None if DB was not changed
+        since the latest generation.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    generations = list_generations(path)
+    latest = generations[-1].number if generations else 0
+    number = latest + 1
+
+    path_backup = set_backup_path(path)
+    path_backup.mkdir(parents=True, exist_ok=True)
+    path_delta = path_backup.joinpath(f'{number:06d}.delta.db')
+    path_full = path_backup.joinpath(f'{number:06d}.full.db')
+    path_temp = path_delta.with_name(f'.{path_delta.name}.tmp')
+    path_temp.unlink(missing_ok=True)
+
+    connection = connect_rw(path)
+    cursor = connection.cursor()
+
+    sql_select_generation = """SELECT generation FROM backup_state;"""
+    sql_count_changes = """SELECT COUNT(*) FROM memo_changes;"""
+    sql_clear_changes = """DELETE FROM memo_changes;"""
+    sql_update_generation = """UPDATE backup_state SET generation = ?;"""
+    sql_copy_changes = """INSERT INTO delta.changes (memo_id)
+                              SELECT memo_id FROM memo_changes;"""
+    sql_copy_memos = """INSERT INTO delta.memos (memo_id, date_time, titles,
+                                                 bodies, body_format, tags)
+                            SELECT ROWID, date_time, titles, bodies,
+                                   body_format, tags
+                                FROM memos
+                                WHERE ROWID IN (SELECT memo_id
+                                                    FROM memo_changes);"""
+    sql_copy_tags = """INSERT INTO delta.memo_tags (tag, memo_id)
+                           SELECT tag, memo_id
+                               FROM memo_tags
+                               WHERE memo_id IN (SELECT memo_id
+                                                     FROM memo_changes);"""
+    sql_copy_revisions = """INSERT INTO delta.memo_revisions
+                                (id, memo_id, date_time, delta)
+                                SELECT id, memo_id, date_time, delta
+                                    FROM memo_revisions
+                                    WHERE memo_id IN (SELECT memo_id
+                                                      FROM memo_changes);"""
+
+    try:
+        # ATTACH is not allowed inside of transaction.
+        cursor.execute('ATTACH DATABASE ? AS delta;', (str(path_temp),))
+        cursor.execute('BEGIN IMMEDIATE;')
+        cursor.execute(sql_select_generation)
+        is_delta = bool(latest) and cursor.fetchone()[0] == latest
+
+        if is_delta:
+            cursor.execute(sql_count_changes)
+
+            if not cursor.fetchone()[0]:
+                cursor.execute('ROLLBACK;')
+
+                return None
+
+            for sql_create in SQL_CREATE_DELTA:
+                cursor.execute(sql_create)
+
+            cursor.execute(sql_copy_changes)
+            cursor.execute(sql_copy_memos)
+            cursor.execute(sql_copy_tags)
+            cursor.execute(sql_copy_revisions)
+        else:
+            copy_db(path, path_full, progress)
+
+        cursor.execute(sql_clear_changes)
+        cursor.execute(sql_update_generation, (number,))
+        cursor.execute('COMMIT;')
+        cursor.execute('DETACH DATABASE delta;')
+
+        if is_delta:
+            os.replace(path_temp, path_delta)
+
+    finally:
+        if connection.in_transaction:
+            cursor.execute('ROLLBACK;')
+
+        connection.close()
+        path_temp.unlink(missing_ok=True)
+
+    generation = Generation(
+        number, not is_delta, path_delta if is_delta else path_full
+    )
+
+    if compression:
+        generation = generation._replace(
+            path=compress_file(generation.path, compression)
+        )
+
+    rotate_generations(path)
+
+    return generation
+
+
+def restore_generation(
+    path: Path,
+    number: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Generation:
+    """Restores DB from generation of backup (the latest one by default).
+
+    Note:
+        The nearest older full copy is copied to temporary file, deltas
+        up to the generation are applied to it, then the file replaces
+        DB (connection to DB have to be closed). Full copy of older schema
+        (e.g. imported by `import_legacy_backup`) is migrated first.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+        number (Optional[int]): number of generation; None for the latest.
+        progress (Optional[Callable[[int, int], None]]): function called
+        with numbers of copied and total pages of full copy.
+
+    Returns:
+        Generation: restored generation.
+
+    Raises:
+        ValueError: If there is no such generation.
+        OSError: If file of generation can not be read (e.g. compressed
+        data is broken), DB is not changed.
+        DatabaseError: If operation failed (DB is not changed).
+
+    """
+    generations = list_generations(path)
+    chosen = [
+        generation
+        for generation in generations
+        if number is None or generation.number == number
+    ]
+
+    if not chosen:
+        raise ValueError(f'generation {number} is not found')
+
+    target = chosen[-1]
+    base = [
+        generation
+        for generation in generations
+        if generation.is_full and generation.number <= target.number
+    ][-1]
+    deltas = [
+        generation
+        for generation in generations
+        if not generation.is_full
+        and base.number <= generation.number <= target.number
+    ]
+
+    path_temp = path.with_name(f'.{path.name}.restore')
+
+    with open_generation(base) as path_base:
+        copy_db(path_base, path_temp, progress)
+
+    connection = connect_rw(path_temp)
+    cursor = connection.cursor()
+
+    sql_clear_changes = """DELETE FROM memo_changes;"""
+    sql_update_generation = """UPDATE backup_state SET generation = ?;"""
+
+    try:
+        migrate_db(connection)
+
+        for delta in deltas:
+            with open_generation(delta) as path_delta:
+                apply_delta(connection, path_delta)
+
+        cursor.execute(sql_clear_changes)
+        cursor.execute(sql_update_generation, (target.number,))
+
+    except BaseException:
+        connection.close()
+        path_temp.unlink(missing_ok=True)
+        raise
+
+    connection.close()
+
+    for suffix in ('-wal', '-shm'):
+        path.with_name(f'{path.name}{suffix}').unlink(missing_ok=True)
+
+    os.replace(path_temp, path)
+
+    return target
+
+
+def apply_delta(connection: Connection, path_delta: Path) -> None:
+    """Applies delta (changed and deleted memos) to DB in one transaction.
+
+    Note:
+        Changed memos are deleted and inserted again, so triggers keep
+        full-text index and total of memos up to date; applying the same
+        delta twice gives the same DB. Deleting memos deletes their
+        revisions (by trigger), so revisions of changed memos are inserted
+        again from delta.
+
+        Columns of memos are taken from delta, so deltas written before
+        a migration of schema are applied to full copies of the same time
+        (or to migrated ones); older deltas have no revisions.
+
+    Args:
+        connection (Connection): connection to DB (in autocommit mode).
+        path_delta (Path): PosixPath of delta's file.
+
+    Raises:
+        DatabaseError: If operation failed (transaction is rolled back).
+
+    """
+    cursor = connection.cursor()
+
+    sql_delete_memos = """DELETE FROM memos
+                              WHERE ROWID IN (SELECT memo_id
+                                                  FROM delta.changes);"""
+    sql_select_columns = """SELECT name
+                                FROM delta.pragma_table_info('memos')
+                                WHERE name <> 'memo_id';"""
+    sql_insert_tags = """INSERT OR IGNORE INTO memo_tags (tag, memo_id)
+                             SELECT tag, memo_id FROM delta.memo_tags;"""
+    sql_check_revisions = """SELECT COUNT(*)
+                                 FROM delta.sqlite_master
+                                 WHERE name = 'memo_revisions';"""
+    sql_insert_revisions = """INSERT OR REPLACE INTO memo_revisions
+                                  (id, memo_id, date_time, delta)
+                                  SELECT id, memo_id, date_time, delta
+                                      FROM delta.memo_revisions;"""
+
+    cursor.execute('ATTACH DATABASE ? AS delta;', (str(path_delta),))
+
+    try:
+        cursor.execute(sql_select_columns)
+        columns = ', '.join(column for (column,) in cursor.fetchall())
+        sql_insert_memos = f"""INSERT INTO memos (ROWID, {columns})
+                                   SELECT memo_id, {columns}
+                                       FROM delta.memos;"""
+
+        cursor.execute(sql_check_revisions)
+        has_revisions = bool(cursor.fetchone()[0])
+
+        cursor.execute('BEGIN;')
+        cursor.execute(sql_delete_memos)
+        cursor.execute(sql_insert_memos)
+        cursor.execute(sql_insert_tags)
+
+        if has_revisions:
+            cursor.execute(sql_insert_revisions)
+
+        cursor.execute('COMMIT;')
+
+    finally:
+        if connection.in_transaction:
+            cursor.execute('ROLLBACK;')
+
+        cursor.execute('DETACH DATABASE delta;')
+
+
+def rotate_generations(path: Path) -> None:
+    """Merges the oldest generations, keeping `BACKUP_GENERATIONS` ones.
+
+    Note:
+        The oldest full copy is renamed (or decompressed) to the next
+        generation before next delta is applied to it, so (if operation
+        is interrupted) the delta is applied again on restore; the copy
+        is migrated first (as on restore, so revisions of delta are kept),
+        merged copy is compressed as the oldest one was.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    generations = list_generations(path)
+
+    while len(generations) > BACKUP_GENERATIONS:
+        oldest, following = generations[:2]
+
+        if following.is_full:
+            oldest.path.unlink()
+        else:
+            compression = detect_compression(oldest.path)
+            path_merged = oldest.path.with_name(
+                f'{following.number:06d}.full.db'
+            )
+
+            if compression:
+                decompress_file(oldest.path, path_merged)
+                oldest.path.unlink()
+            else:
+                os.replace(oldest.path, path_merged)
+
+            connection = connect_rw(path_merged)
+
+            try:
+                migrate_db(connection)
+
+                with open_generation(following) as path_delta:
+                    apply_delta(connection, path_delta)
+            finally:
+                connection.close()
+
+            # Merged copy keeps time of the generation it represents.
+            stat = following.path.stat()
+            os.utime(path_merged, (stat.st_atime, stat.st_mtime))
+
+            if compression:
+                compress_file(path_merged, compression)
+
+            following.path.unlink()
+
+        generations = list_generations(path)
+
+
+def detect_compression(path: Path) -> Optional[str]:
+    """Detects compression of file by its first bytes (magic number).
+
+    Args:
+        path (Path): PosixPath of file (e.g. generation of backup).
+
+    Returns:
+        Optional[str]: `xz` or `gz`; None if file is not compressed.
+
+    """
+    with path.open('rb') as file:
+        header = file.read(6)
+
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return compression
+
+    return None
+
+
+def compress_file(path: Path, compression: str) -> Path:
+    """Compresses file by chunks (the file is replaced by compressed one).
+
+    Args:
+        path (Path): PosixPath of file.
+        compression (str): `xz` or `gz` (see `COMPRESSIONS`).
+
+    Returns:
+        Path: PosixPath of compressed file (with suffix `.xz` or `.gz`).
+
+    Raises:
+        OSError: If operation failed (the file is not changed).
+
+    """
+    path_compressed = path.with_name(f'{path.name}.{compression}')
+    path_temp = path.with_name(f'.{path_compressed.name}.tmp')
+
+    try:
+        with path.open('rb') as source:
+            with COMPRESSIONS[compression](path_temp, 'wb') as target:
+                copyfileobj(source, target, COPY_CHUNK_SIZE)
+
+        os.replace(path_temp, path_compressed)
+
+    except BaseException:
+        path_temp.unlink(missing_ok=True)
+        raise
+
+    stat = path.stat()
+    os.utime(path_compressed, (stat.st_atime, stat.st_mtime))
+    path.unlink()
+
+    return path_compressed
+
+
+def decompress_file(path: Path, target: Path) -> Path:
+    """Decompresses file (compression is detected) by chunks.
+
+    Args:
+        path (Path): PosixPath of compressed file.
+        target (Path): PosixPath of decompressed file.
+
+    Returns:
+        Path: PosixPath of decompressed file.
+
+    Raises:
+        OSError: If file can not be read, compressed data is broken
+        (`lzma.LZMAError`, `zlib.error`) or truncated (`EOFError`).
+
+    """
+    compression = detect_compression(path)
+    path_temp = target.with_name(f'.{target.name}.tmp')
+    open_compressed = COMPRESSIONS[compression] if compression else open
+
+    try:
+        with open_compressed(path, 'rb') as source:
+            with path_temp.open('wb') as decompressed:
+                copyfileobj(source, decompressed, COPY_CHUNK_SIZE)
+
+        os.replace(path_temp, target)
+
+    except (lzma.LZMAError, zlib.error, EOFError) as error:
+        path_temp.unlink(missing_ok=True)
+        raise OSError(f'compressed file `{path}` is broken') from error
+
+    except BaseException:
+        path_temp.unlink(missing_ok=True)
+        raise
+
+    return target
+
+
+@contextmanager
+def open_generation(generation: Generation) -> Iterator[Path]:
+    """Gives path of generation's DB, decompressing it if necessary.
+
+    Note:
+        Compressed generation is decompressed to temporary file, which
+        is removed on exit.
+
+    Args:
+        generation (Generation): generation of backup.
+
+    Yields:
+        Path: PosixPath of uncompressed DB.
+
+    """
+    if not detect_compression(generation.path):
+        yield generation.path
+        return
+
+    path_plain = generation.path.with_name(f'.{generation.path.stem}')
+
+    try:
+        yield decompress_file(generation.path, path_plain)
+    finally:
+        path_plain.unlink(missing_ok=True)
+
+
+def connect_rw(path: Path) -> Connection:
+    """Opens connection to existing DB with transactions controlled by SQL.
+
+    Note:
+        SQL-functions of schema are registered (triggers of table `memos`
+        call them), settings of reading are taken from config file.
+
+    Args:
+        path (Path): PosixPath of DB.
+
+    Returns:
+        Connection: connection in autocommit mode (`BEGIN` and `COMMIT`
+        are executed explicitly).
+
+    Raises:
+        DatabaseError: If DB does not exist (mode `rw` does not create it).
+
+    """
+    connection = connect(
+        f'{path.resolve().as_uri()}?mode=rw', uri=True, isolation_level=None
+    )
+    register_functions(connection)
+    apply_config(connection, get_config(), reading_only=True)
+
+    return connection
+
+
+def copy_db(
+    source: Path,
+    target: Path,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Path:
+    """Copies DB using SQLite's online backup API (by steps of pages).
+
+    Note:
+        Pages are copied by `BACKUP_STEP_PAGES` in a step, so DB is not
+        locked for the whole copy and the copy is consistent even if DB
+        is changed meanwhile (SQLite restarts the copy).
+
+        The copy is written to temporary file in the same directory
+        and then is renamed to `target` (atomically), so `target`
+        is either the previous file or the complete copy; the copy is kept
+        in rollback journal mode (without `-wal` and `-shm` files).
+
+    Args:
+        source (Path): PosixPath of DB to copy.
+        target (Path): PosixPath of copy.
+        progress (Optional[Callable[[int, int], None]]): function called
+        after every step with numbers of copied and total pages.
+
+    Returns:
+        Path: PosixPath of copy.
+
+    Raises:
+        DatabaseError: If operation failed (temporary file is removed).
+
+    """
+    path_temp = target.with_name(f'.{target.name}.tmp')
+    path_temp.unlink(missing_ok=True)
+
+    def report_progress(status: int, remaining: int, total: int) -> None:
+        if progress:
+            progress(total - remaining, total)
+
+    source_connection = connect_rw(source)
+    target_connection = connect(path_temp)
+
+    try:
+        source_connection.backup(
+            target_connection,
+            pages=BACKUP_STEP_PAGES,
+            progress=report_progress,
+        )
+        target_connection.execute('PRAGMA journal_mode = DELETE;')
+        target_connection.close()
+        os.replace(path_temp, target)
+
+    except BaseException:
+        target_connection.close()
+        path_temp.unlink(missing_ok=True)
+        raise
+
+    finally:
+        source_connection.close()
+
+    return target
@@ -0,0 +1,651 @@
+"""Runs commands of MemoPad non-interactively (batch mode for scripts)."""
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from contextlib import closing
+from pathlib import Path
+from sqlite3 import Connection, DatabaseError
+from typing import Iterable
+
+from modules.backupstore import backup_generation, restore_generation
+from modules.backupstore import find_legacy_backup, import_legacy_backup
+from modules.dbconfig import BACKUP_COMPRESSIONS, get_config
+from modules.exporter import EXPORT_FORMATS, export_memos
+from modules.exporter import write_csv, write_jsonl
+from modules.importer import expand_dir, find_md_files, import_md_files
+from modules.memostore import connect_db, migrate_db, set_db_path
+from modules.memostore import count_total, insert_memo, iter_memo_pages
+from modules.memostore import find_last_memos, find_memo_by_rowid
+from modules.memostore import find_memos_by_date, parse_date_range
+from modules.memostore import find_memos_by_title, find_memos_by_text
+from modules.memostore import find_memos_by_tag, make_memo, iter_memos
+from modules.memostore import compress_bodies, find_memos_by_substring
+from modules.memostore import delete_memo_by_rowid, find_revisions
+from modules.memostore import set_datetime, update_memo, rebuild_db
+from modules.memostore import list_notebooks, search_notebooks
+from modules.memostore import set_notebook_path
+
+FORMATS: list[str] = ['md', 'jsonl']
+
+
+def run_batch(arguments: list[str]) -> int:
+    """Runs command given by command-line arguments (without REPL).
+
+    Note:
+        Commands do not prompt for confirmation and do not print banner;
+        messages are printed to `stderr`, memos to `stdout` (as Markdown
+        or as JSON Lines for scripts).
+
+    Example:
+        memopad add --title T --tag x < body.md
+
+        memopad search --text foo --format jsonl
+
+        memopad --notebook work search --tag todo
+
+    Args:
+        arguments (list[str]): command-line arguments (without program).
+
+    Returns:
+        int: exit status - 0 if command succeeded, 1 if memos are
+        not found or operation failed, 2 if arguments are not valid.
+
+    """
+    args = make_parser().parse_args(arguments)
+
+    try:
+        path = set_db_path()
+    except ValueError as error:
+        print(f'Ошибка в файле настроек: {error}.', file=sys.stderr)
+
+        return 2
+
+    if args.notebook is not None:
+        try:
+            path = set_notebook_path(path, args.notebook)
+        except ValueError:
+            print(
+                f'Неверное название блокнота: {args.notebook}', file=sys.stderr
+            )
+
+            return 2
+
+    args.path = path
+
+    try:
+        if not args.opens_db:
+            # Files of DB are copied or replaced: a damaged DB is not opened.
+            return args.handler(args)
+
+        connection = connect_db(path)
+        migrate_db(connection)
+
+        try:
+            return args.handler(connection, args)
+        finally:
+            connection.close()
+
+    except DatabaseError:
+        print('Ошибка обращения к базе заметок.', file=sys.stderr)
+
+        return 1
+
+    except BrokenPipeError:
+        # Output is closed by reader (e.g. `| head`): nothing is flushed.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+        return 1
+
+
+def make_parser() -> ArgumentParser:
+    """Makes parser of command-line arguments for batch mode.
+
+    Returns:
+        ArgumentParser: parser with subcommands `add`, `import`, `export`,
+        `view`, `search`, `count`, `delete`, `history`, `backup-db`,
+        `restore-db`, `compress-bodies` and `tune-db`.
+
+    """
+    parser = ArgumentParser(
+        prog='memopad',
+        description='MemoPad - консольный редактор и база заметок '
+        + '(без аргументов запускается интерактивный режим).',
+    )
+    parser.add_argument(
+        '--notebook', help='блокнот (отдельная база заметок), например work'
+    )
+    parser.set_defaults(opens_db=True)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser(
+        'add', help='добавить заметку (текст читается из stdin)'
+    )
+    add_parser.add_argument('--title', default='', help='заголовок')
+    add_parser.add_argument(
+        '--tag', action='append', default=[], help='тег (можно повторять)'
+    )
+    add_parser.add_argument('--text', help='текст (вместо stdin)')
+    add_parser.add_argument('--format', choices=FORMATS, default='md')
+    add_parser.set_defaults(handler=add_command)
+
+    import_parser = subparsers.add_parser(
+        'import', help='импортировать папку с Markdown-файлами'
+    )
+    import_parser.add_argument('directory', help='папка (с подпапками)')
+    import_parser.add_argument(
+        '--workers', type=int, help='число процессов разбора файлов'
+    )
+    import_parser.set_defaults(handler=import_command)
+
+    export_parser = subparsers.add_parser(
+        'export', help='экспортировать заметки (в JSONL, CSV или Markdown)'
+    )
+    export_parser.add_argument(
+        '--format', choices=EXPORT_FORMATS, default='jsonl'
+    )
+    export_parser.add_argument(
+        '--output',
+        default='-',
+        help='файл (`-` - stdout) или папка для формата md',
+    )
+    export_parser.add_argument('--date', help='дата или период')
+    export_parser.add_argument('--tag', help='тег (tag, tag*, a b, a | b)')
+    export_parser.set_defaults(handler=export_command)
+
+    view_parser = subparsers.add_parser('view', help='показать заметки')
+    view_group = view_parser.add_mutually_exclusive_group()
+    view_group.add_argument('--id', type=int, help='заметка с ID')
+    view_group.add_argument(
+        '--last', type=int, default=5, help='последние N заметок'
+    )
+    view_group.add_argument('--all', action='store_true', help='все заметки')
+    view_parser.add_argument('--format', choices=FORMATS, default='md')
+    view_parser.set_defaults(handler=view_command)
+
+    search_parser = subparsers.add_parser('search', help='найти заметки')
+    search_group = search_parser.add_mutually_exclusive_group(required=True)
+    search_group.add_argument('--title', help='слова заголовка')
+    search_group.add_argument('--text', help='слова текста')
+    search_group.add_argument('--tag', help='тег (tag, tag*, a b, a | b)')
+    search_group.add_argument('--date', help='дата или период')
+    search_group.add_argument('--part', help='фрагмент (часть слова)')
+    search_parser.add_argument(
+        '--all-notebooks',
+        action='store_true',
+        help='искать во всех блокнотах (ID - блокнот:ID)',
+    )
+    search_parser.add_argument('--format', choices=FORMATS, default='md')
+    search_parser.set_defaults(handler=search_command)
+
+    count_parser = subparsers.add_parser('count', help='количество заметок')
+    count_parser.set_defaults(handler=count_command)
+
+    delete_parser = subparsers.add_parser('delete', help='удалить заметку')
+    delete_parser.add_argument('--id', type=int, required=True)
+    delete_parser.set_defaults(handler=delete_command)
+
+    history_parser = subparsers.add_parser(
+        'history', help='прежние версии заметки (список, просмотр, возврат)'
+    )
+    history_parser.add_argument('--id', type=int, required=True)
+    history_group = history_parser.add_mutually_exclusive_group()
+    history_group.add_argument('--version', type=int, help='показать версию')
+    history_group.add_argument(
+        '--restore', type=int, help='восстановить версию'
+    )
+    history_parser.add_argument('--format', choices=FORMATS, default='md')
+    history_parser.set_defaults(handler=history_command)
+
+    backup_parser = subparsers.add_parser(
+        'backup-db', help='создать резервную копию (новое поколение)'
+    )
+    backup_parser.add_argument(
+        '--compress',
+        choices=BACKUP_COMPRESSIONS,
+        help='сжатие копии (lzma, gzip, без сжатия), по умолчанию - '
+        + 'backup_compression из файла настроек',
+    )
+    backup_parser.set_defaults(handler=backup_command, opens_db=False)
+
+    restore_parser = subparsers.add_parser(
+        'restore-db', help='восстановить базу из резервной копии'
+    )
+    restore_parser.add_argument(
+        '--at', type=int, help='номер поколения (по умолчанию последнее)'
+    )
+    restore_parser.set_defaults(handler=restore_command, opens_db=False)
+
+    compress_parser = subparsers.add_parser(
+        'compress-bodies', help='сжать длинные тексты существующих заметок'
+    )
+    compress_parser.set_defaults(handler=compress_command)
+
+    tune_parser = subparsers.add_parser(
+        'tune-db', help='перестроить файл базы по файлу настроек'
+    )
+    tune_parser.set_defaults(handler=tune_command)
+
+    return parser
+
+
+def add_command(connection: Connection, args: Namespace) -> int:
+    """Adds new memo (text is read from `stdin` if not given).
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): arguments `title`, `tag`, `text` and `format`.
+
+    Returns:
+        int: exit status.
+
+    """
+    text = args.text if args.text is not None else sys.stdin.read()
+    memo = make_memo(args.title, text, ' '.join(args.tag))
+
+    with connection:
+        rowid = insert_memo(connection, memo)
+
+    return print_memos([(rowid, *memo)], args.format)
+
+
+def import_command(connection: Connection, args: Namespace) -> int:
+    """Imports memos from directory of Markdown-files.
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): arguments `directory` and `workers`.
+
+    Returns:
+        int: exit status.
+
+    """
+    directory = expand_dir(args.directory)
+
+    if directory is None:
+        print(f'Папка {args.directory} не найдена!', file=sys.stderr)
+
+        return 1
+
+    imported, skipped, seconds = import_md_files(
+        connection, find_md_files(directory), args.workers
+    )
+    print(
+        f'Импортировано заметок: {imported} '
+        + f'({imported / max(seconds, 1e-6):.0f} заметок/с).'
+    )
+
+    if skipped:
+        print(f'Не удалось прочитать файлов: {skipped}.', file=sys.stderr)
+
+    return 0
+
+
+def export_command(connection: Connection, args: Namespace) -> int:
+    """Exports memos (filtered by period and tags) to file or `stdout`.
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): arguments `format`, `output`, `date` and `tag`.
+
+    Returns:
+        int: exit status.
+
+    """
+    start, end = '', ''
+
+    if args.date:
+        try:
+            start, end = parse_date_range(args.date)
+        except ValueError:
+            print('Введена неверная дата!', file=sys.stderr)
+
+            return 2
+
+    if args.format == 'md' and args.output == '-':
+        print('Для формата md укажите папку (--output).', file=sys.stderr)
+
+        return 2
+
+    with closing(iter_memos(connection, start, end, args.tag or '')) as memos:
+        if args.output == '-' and args.format == 'csv':
+            exported = write_csv(memos, sys.stdout)
+        elif args.output == '-':
+            exported = write_jsonl(memos, sys.stdout)
+        else:
+            try:
+                exported = export_memos(memos, Path(args.output), args.format)
+            except OSError:
+                print(f'Ошибка записи в {args.output}.', file=sys.stderr)
+
+                return 1
+
+    print(f'Экспортировано заметок: {exported}.', file=sys.stderr)
+
+    return 0
+
+
+def view_command(connection: Connection, args: Namespace) -> int:
+    """Shows memo by ID, last memos or all memos.
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): arguments `id`, `last`, `all` and `format`.
+
+    Returns:
+        int: exit status.
+
+    """
+    if args.id is not None:
+        memo = find_memo_by_rowid(connection, args.id)
+        memos = [memo] if memo else []
+    elif args.all:
+        memos = (memo for page in iter_memo_pages(connection) for memo in page)
+    else:
+        memos = find_last_memos(connection, args.last)
+
+    return print_memos(memos, args.format)
+
+
+def search_command(connection: Connection, args: Namespace) -> int:
+    """Searches memos by title, text, tag, date or fragment.
+
+    Note:
+        With `--all-notebooks` every notebook is searched (in parallel),
+        found memos are ordered by date, their IDs are `notebook:ID`.
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): one of arguments `title`, `text`, `tag`, `date`,
+        `part` and arguments `all_notebooks` and `format`.
+
+    Returns:
+        int: exit status.
+
+    """
+    if args.title is not None:
+        search, query = find_memos_by_title, (args.title,)
+    elif args.text is not None:
+        search, query = find_memos_by_text, (args.text,)
+    elif args.tag is not None:
+        search, query = find_memos_by_tag, (args.tag,)
+    elif args.part is not None:
+        search, query = find_memos_by_substring, (args.part,)
+    else:
+        try:
+            query = parse_date_range(args.date)
+        except ValueError:
+            print('Введена неверная дата!', file=sys.stderr)
+
+            return 2
+
+        search = find_memos_by_date
+
+    if not args.all_notebooks:
+        return print_memos(search(connection, *query), args.format)
+
+    found, skipped = search_notebooks(
+        list_notebooks(args.path), search, *query
+    )
+
+    for notebook in skipped:
+        print(f'Ошибка поиска в блокноте {notebook}.', file=sys.stderr)
+
+    return print_memos(
+        [(f'{notebook}:{memo[0]}', *memo[1:]) for notebook, memo in found],
+        args.format,
+    )
+
+
+def count_command(connection: Connection, args: Namespace) -> int:
+    """Prints total of memos in DB.
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): no arguments are used.
+
+    Returns:
+        int: exit status.
+
+    """
+    print(count_total(connection))
+
+    return 0
+
+
+def delete_command(connection: Connection, args: Namespace) -> int:
+    """Deletes memo by ID (without confirmation).
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): argument `id`.
+
+    Returns:
+        int: exit status.
+
+    """
+    if not delete_memo_by_rowid(connection, args.id):
+        print(f'Заметка с ID {args.id} не найдена.', file=sys.stderr)
+
+        return 1
+
+    return 0
+
+
+def history_command(connection: Connection, args: Namespace) -> int:
+    """Lists previous versions of memo, shows or restores one of them.
+
+    Note:
+        Without `--version` and `--restore` versions are listed as lines
+        `number<TAB>date_time<TAB>title`.
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): arguments `id`, `version`, `restore` and `format`.
+
+    Returns:
+        int: exit status.
+
+    """
+    versions = find_revisions(connection, args.id)
+    number = args.version if args.version is not None else args.restore
+
+    if not versions:
+        print(
+            f'Прежние версии заметки с ID {args.id} не найдены.',
+            file=sys.stderr,
+        )
+
+        return 1
+
+    if number is None:
+        for version_number, date_time, title, _, _ in versions:
+            print(f'{version_number}\t{date_time}\t{title.lstrip("# ")}')
+
+        return 0
+
+    if not 0 < number <= len(versions):
+        print(f'Версия {number} не найдена.', file=sys.stderr)
+
+        return 1
+
+    _, date_time, title, body, tags = versions[number - 1]
+
+    if args.restore is not None:
+        date_time = set_datetime()
+        update_memo(
+            connection, args.id, date_time, title=title, body=body, tags=tags
+        )
+
+    return print_memos([(args.id, date_time, title, body, tags)], args.format)
+
+
+def print_memos(memos: Iterable[tuple[str, ...]], output_format: str) -> int:
+    """Prints memos as Markdown (`md`) or as JSON Lines (`jsonl`).
+
+    Args:
+        memos (Iterable[tuple[str, ...]]): memos (rowid, date_time, title,
+        body and tag).
+        output_format (str): `md` or `jsonl`.
+
+    Returns:
+        int: exit status - 0 if any memo is printed, 1 otherwise.
+
+    """
+    if output_format == 'jsonl':
+        printed = write_jsonl(memos, sys.stdout)
+    else:
+        from modules.mdprinter import print_memo_from_db
+
+        printed = 0
+
+        for memo in memos:
+            print_memo_from_db(memo)
+            printed += 1
+
+    if not printed:
+        print('Заметки не найдены.', file=sys.stderr)
+
+        return 1
+
+    return 0
+
+
+def backup_command(args: Namespace) -> int:
+    """Backups DB as a new generation of backup (without confirmation).
+
+    Note:
+        DB is not opened by session's connection (see `run_batch`).
+
+    Args:
+        args (Namespace): arguments `compress` (compression; `none`
+        to keep copy uncompressed; if not given, `backup_compression`
+        of config file is used) and `path` (DB of notebook).
+
+    Returns:
+        int: exit status.
+
+    """
+    import_legacy(args.path)
+    compression = args.compress or get_config().backup_compression
+
+    try:
+        generation = backup_generation(
+            args.path,
+            compression=None if compression == 'none' else compression,
+        )
+    except OSError:
+        print('Ошибка создания резервной копии.', file=sys.stderr)
+
+        return 1
+
+    if generation is None:
+        print('База заметок не изменилась.', file=sys.stderr)
+    else:
+        print(generation.path)
+
+    return 0
+
+
+def import_legacy(path: Path) -> None:
+    """Imports backup of older versions (if any) as generation of backup.
+
+    Args:
+        path (Path): PosixPath of DB (see `import_legacy_backup`).
+
+    """
+    path_legacy = find_legacy_backup(path)
+
+    try:
+        generation = import_legacy_backup(path)
+    except (ValueError, OSError):
+        print(
+            f'Резервная копия прежней версии {path_legacy} не перенесена.',
+            file=sys.stderr,
+        )
+        return
+
+    if generation is not None:
+        print(
+            f'Резервная копия прежней версии: поколение {generation.number}.',
+            file=sys.stderr,
+        )
+
+
+def restore_command(args: Namespace) -> int:
+    """Restores DB from generation of backup (without confirmation).
+
+    Note:
+        DB is not opened by session's connection, so damaged DB
+        is restored as well (see `run_batch`).
+
+    Args:
+        args (Namespace): arguments `at` (number of generation) and `path`
+        (DB of notebook).
+
+    Returns:
+        int: exit status.
+
+    """
+    import_legacy(args.path)
+
+    try:
+        generation = restore_generation(args.path, args.at)
+    except ValueError:
+        print(f'Поколение {args.at} не найдено.', file=sys.stderr)
+
+        return 1
+    except OSError:
+        print('Ошибка чтения резервной копии.', file=sys.stderr)
+
+        return 1
+
+    print(f'Восстановлено поколение {generation.number}.', file=sys.stderr)
+
+    return 0
+
+
+def compress_command(connection: Connection, args: Namespace) -> int:
+    """Compresses long texts of existing memos (by batches).
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): no arguments are used.
+
+    Returns:
+        int: exit status.
+
+    """
+    checked, compressed = 0, 0
+
+    for checked, compressed in compress_bodies(connection):
+        print(f'Проверено заметок: {checked}', end='\r', file=sys.stderr)
+
+    print(
+        f'Проверено заметок: {checked}, сжато: {compressed}.', file=sys.stderr
+    )
+
+    return 0
+
+
+def tune_command(connection: Connection, args: Namespace) -> int:
+    """Rebuilds file of DB with size of pages set by config file.
+
+    Args:
+        connection (Connection): connection to database.
+        args (Namespace): no arguments are used.
+
+    Returns:
+        int: exit status.
+
+    """
+    config = get_config()
+    previous_page_size, page_size = rebuild_db(
+        connection, config.page_size, config.journal_mode
+    )
+    print(
+        f'Файл базы перестроен: страница {previous_page_size} '
+        + f'-> {page_size} байт.',
+        file=sys.stderr,
+    )
+
+    return 0
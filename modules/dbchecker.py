@@ -0,0 +1,183 @@
+"""Checks integrity of DB in background thread (without user's UI)."""
+from pathlib import Path
+from sqlite3 import connect, Connection, DatabaseError
+from threading import Event, Thread
+from time import perf_counter
+from typing import Optional
+
+from modules.dbconfig import apply_config, get_config
+
+CHECK_MODES: list[str] = ['quick', 'full']
+PROGRESS_OPERATIONS = 100000
+RUNNING_CHECK: list[Optional['IntegrityCheck']] = [None]
+
+
+class IntegrityCheck(Thread):
+    """Thread checking DB on its own read-only connection.
+
+    Note:
+        Mode `quick` runs `PRAGMA quick_check` (structure of file and
+        tables), mode `full` runs it and then `PRAGMA integrity_check`
+        for every table (with its indexes) one by one, so progress is known
+        by checked tables. Check is interrupted by SQLite's progress handler
+        (every `PROGRESS_OPERATIONS` operations) after `cancel`.
+
+    """
+
+    def __init__(self, path: Path, mode: str) -> None:
+        """Prepares check of DB (it is started by `start`).
+
+        Args:
+            path (Path): PosixPath of DB.
+            mode (str): one of `CHECK_MODES`.
+
+        """
+        super().__init__(name='memopad-check', daemon=True)
+        self.path = path
+        self.mode = mode
+        self.done = 0
+        self.total = 1
+        self.seconds = 0.0
+        self.errors: list[str] = []
+        self.failure: Optional[DatabaseError] = None
+        self.cancelled = Event()
+
+    def run(self) -> None:
+        """Runs checks, keeps found errors (or failure of check)."""
+        start = perf_counter()
+
+        try:
+            connection = connect(
+                f'{self.path.resolve().as_uri()}?mode=ro', uri=True
+            )
+        except DatabaseError as error:
+            self.failure = error
+            return
+
+        connection.set_progress_handler(
+            self.cancelled.is_set, PROGRESS_OPERATIONS
+        )
+
+        try:
+            apply_config(connection, get_config(), reading_only=True)
+            sql_checks = make_checks(connection, self.mode)
+            self.total = len(sql_checks)
+
+            for sql_check in sql_checks:
+                cursor = connection.cursor()
+                cursor.execute(sql_check)
+                self.errors.extend(
+                    row[0] for row in cursor.fetchall() if row[0] != 'ok'
+                )
+                self.done += 1
+
+        except DatabaseError as error:
+            if not self.cancelled.is_set():
+                self.failure = error
+        finally:
+            connection.close()
+            self.seconds = perf_counter() - start
+
+    def cancel(self) -> None:
+        """Interrupts check and waits for the thread."""
+        self.cancelled.set()
+        self.join()
+
+
+def make_checks(connection: Connection, mode: str) -> list[str]:
+    """Makes SQL-queries of check.
+
+    Args:
+        connection (Connection): connection to database.
+        mode (str): one of `CHECK_MODES`.
+
+    Returns:
+        list[str]: `PRAGMA quick_check` and (for mode `full`)
+        `PRAGMA integrity_check` of every table.
+
+    """
+    cursor = connection.cursor()
+
+    sql_select_tables = """SELECT name FROM sqlite_schema
+                               WHERE type = 'table' AND rootpage > 0
+                               ORDER BY name;"""
+    sql_checks = ['PRAGMA quick_check;']
+
+    if mode == 'full':
+        cursor.execute(sql_select_tables)
+        names = [name.replace('"', '""') for (name,) in cursor.fetchall()]
+        sql_checks.extend(
+            f'PRAGMA integrity_check("{name}");' for name in names
+        )
+
+    return sql_checks
+
+
+def start_check(path: Path, mode: str) -> IntegrityCheck:
+    """Starts check of DB in background (one check at a time).
+
+    Args:
+        path (Path): PosixPath of DB.
+        mode (str): one of `CHECK_MODES`.
+
+    Returns:
+        IntegrityCheck: running check.
+
+    """
+    cancel_check()
+
+    check = IntegrityCheck(path, mode)
+    RUNNING_CHECK[0] = check
+    check.start()
+
+    return check
+
+
+def find_running_check() -> Optional[IntegrityCheck]:
+    """Finds check which is still running.
+
+    Returns:
+        Optional[IntegrityCheck]: running check or None.
+
+    """
+    check = RUNNING_CHECK[0]
+
+    return check if check is not None and check.is_alive() else None
+
+
+def pop_finished_check() -> Optional[IntegrityCheck]:
+    """Takes finished check (to report its result once).
+
+    Returns:
+        Optional[IntegrityCheck]: finished check or None.
+
+    """
+    check = RUNNING_CHECK[0]
+
+    if check is None or check.is_alive():
+        return None
+
+    RUNNING_CHECK[0] = None
+
+    return check
+
+
+def cancel_check() -> bool:
+    """Cancels running check (e.g. before DB is replaced or removed).
+
+    Note:
+        Finished check is not cancelled, its result is still reported.
+
+    Returns:
+        bool: True if check was running, False otherwise.
+
+    """
+    check = RUNNING_CHECK[0]
+
+    if check is None or not check.is_alive():
+        return False
+
+    check.cancel()
+    RUNNING_CHECK[0] = None
+
+    return True
@@ -0,0 +1,204 @@
+"""Reads settings of DB's storage from config file (without user's UI)."""
+from configparser import ConfigParser, Error as ConfigParserError
+from pathlib import Path
+from sqlite3 import Connection
+from typing import NamedTuple, Optional
+
+CONFIG_FILE = 'config'
+CONFIG_SECTION = 'storage'
+JOURNAL_MODES: list[str] = ['wal', 'delete', 'truncate', 'persist', 'memory']
+PAGE_SIZES: list[int] = [2**power for power in range(9, 17)]
+BACKUP_COMPRESSIONS: list[str] = ['xz', 'gz', 'none']
+CONFIG: list[Optional['StorageConfig']] = [None]
+
+
+class StorageConfig(NamedTuple):
+    """Settings of DB's storage (section `[storage]` of config file).
+
+    Note:
+        `path` - file of DB (default `~/.memopad/memos.db`, relative paths
+        are relative to program's working directory); `mmap_size` - bytes
+        of DB read by memory-mapped I/O (0 - disabled); `cache_size` -
+        SQLite's page cache (negative - KiB, positive - pages);
+        `page_size` - size of DB's pages (new DB or `tune-db`);
+        `journal_mode` - one of `JOURNAL_MODES`; `backup_compression` -
+        compression of backup's generations, one of `BACKUP_COMPRESSIONS`
+        (None if `none`).
+
+    Example:
+        [storage]
+        path = ~/notes/memos.db
+        mmap_size = 268435456
+        page_size = 8192
+        backup_compression = xz
+
+    """
+
+    path: Optional[Path] = None
+    mmap_size: int = 0
+    cache_size: int = -16000
+    page_size: int = 4096
+    journal_mode: str = 'wal'
+    backup_compression: Optional[str] = None
+
+
+def set_config_path(working_dir: Path) -> Path:
+    """Sets path of config file (in program's working directory).
+
+    Args:
+        working_dir (Path): PosixPath of program's working directory.
+
+    Returns:
+        Path: PosixPath of config file, e.g. `~/.memopad/config`.
+
+    """
+    return working_dir.joinpath(CONFIG_FILE)
+
+
+def load_config(working_dir: Path, reload: bool = False) -> StorageConfig:
+    """Loads config once per session (see `get_config`).
+
+    Args:
+        working_dir (Path): PosixPath of program's working directory.
+        reload (bool): read config file again (e.g. after it is edited).
+
+    Returns:
+        StorageConfig: settings of DB's storage.
+
+    Raises:
+        ValueError: If config file is not valid.
+
+    """
+    if CONFIG[0] is None or reload:
+        CONFIG[0] = read_config(set_config_path(working_dir))
+
+    return CONFIG[0]
+
+
+def get_config() -> StorageConfig:
+    """Gets settings loaded by `load_config` (defaults if not loaded).
+
+    Returns:
+        StorageConfig: settings of DB's storage.
+
+    """
+    return CONFIG[0] or StorageConfig()
+
+
+def read_config(path: Path) -> StorageConfig:
+    """Reads config file (defaults are used for missing settings).
+
+    Args:
+        path (Path): PosixPath of config file.
+
+    Returns:
+        StorageConfig: settings of DB's storage.
+
+    Raises:
+        ValueError: If config file can not be parsed, setting is unknown
+        or its value is not valid.
+
+    """
+    parser = ConfigParser()
+
+    try:
+        parser.read(path, encoding='utf-8')
+    except (ConfigParserError, UnicodeDecodeError) as error:
+        raise ValueError(f'файл `{path}` не разобран') from error
+
+    if not parser.has_section(CONFIG_SECTION):
+        return StorageConfig()
+
+    settings = {}
+
+    for key, value in parser.items(CONFIG_SECTION):
+        if key not in StorageConfig._fields:
+            raise ValueError(f'неизвестный параметр `{key}`')
+
+        settings[key] = parse_setting(key, value.strip(), path.parent)
+
+    return StorageConfig(**settings)
+
+
+def parse_setting(
+    key: str, value: str, working_dir: Path
+) -> Optional[Path | int | str]:
+    """Parses and checks value of setting.
+
+    Args:
+        key (str): name of setting (field of `StorageConfig`).
+        value (str): value from config file.
+        working_dir (Path): PosixPath of program's working directory.
+
+    Returns:
+        Optional[Path | int | str]: value of setting.
+
+    Raises:
+        ValueError: If value is not valid.
+
+    """
+    if key == 'path':
+        db_path = Path(value).expanduser()
+
+        if not value or db_path.is_dir():
+            raise ValueError(f'`{key} = {value}` - не путь к файлу')
+
+        return db_path if db_path.is_absolute() else working_dir / db_path
+
+    if key == 'journal_mode':
+        if value.lower() not in JOURNAL_MODES:
+            raise ValueError(
+                f'`{key} = {value}` - допустимо: {", ".join(JOURNAL_MODES)}'
+            )
+
+        return value.lower()
+
+    if key == 'backup_compression':
+        if value.lower() not in BACKUP_COMPRESSIONS:
+            raise ValueError(
+                f'`{key} = {value}` - допустимо: '
+                + ', '.join(BACKUP_COMPRESSIONS)
+            )
+
+        return None if value.lower() == 'none' else value.lower()
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f'`{key} = {value}` - не целое число') from None
+
+    if key == 'page_size' and number not in PAGE_SIZES:
+        raise ValueError(f'`{key} = {value}` - степень двойки от 512 до 65536')
+    if key == 'mmap_size' and number < 0:
+        raise ValueError(f'`{key} = {value}` - отрицательное число')
+    if key == 'cache_size' and number == 0:
+        raise ValueError(f'`{key} = {value}` - кэш не может быть пустым')
+
+    return number
+
+
+def apply_config(
+    connection: Connection, config: StorageConfig, reading_only: bool = False
+) -> None:
+    """Applies settings to connection using PRAGMAs.
+
+    Note:
+        `page_size` takes effect for a new DB only (existing DB is rebuilt
+        by `tune-db`); auxiliary connections (e.g. of integrity check
+        or backup) get settings of reading only (`mmap_size`
+        and `cache_size`), file of DB is set by session's connection.
+
+    Args:
+        connection (Connection): connection to database.
+        config (StorageConfig): settings of DB's storage.
+        reading_only (bool): apply settings of reading only.
+
+    """
+    cursor = connection.cursor()
+
+    if not reading_only:
+        cursor.execute(f'PRAGMA page_size = {config.page_size};')
+        cursor.execute(f'PRAGMA journal_mode = {config.journal_mode};')
+
+    cursor.execute(f'PRAGMA cache_size = {config.cache_size};')
+    cursor.execute(f'PRAGMA mmap_size = {config.mmap_size};')
@@ -0,0 +1,110 @@
+"""Connects to SQLite-database and keeps its schema up to date."""
+from pathlib import Path
+from sqlite3 import connect, Connection, DatabaseError
+
+from modules.dbmanager import restore_db
+from modules.mdprinter import print_md
+from modules.backupstore import check_backup, set_backup_path
+from modules.memostore import check_db
+from modules.memostore import connect_db, migrate_db, register_functions
+from modules.prompter import check_confirmation
+
+
+def check_db_path_and_table(
+    path: Path, factory: type[Connection] = Connection
+) -> Connection:
+    """Checks database's path, connects to DB and creates it if not exists.
+
+    Note:
+        If database's backup exist, restores database from backup.
+
+     Args:
+         path (Path): PosixPath of program's working directory.
+         factory (type[Connection]): class of connection (see `connect_db`).
+
+    Returns:
+        Connection: session's connection to database.
+
+    """
+    is_db = check_db(path)
+
+    if is_db:
+        print_md(f'Существующая база заметок: `{path}`.')
+    else:
+        is_backup = check_backup(path)
+        confirmation = 'no'
+
+        if is_backup:
+            path_backup = set_backup_path(path)
+
+            print_md(f'База заметок `{path}` не найдена!')
+            print_md(
+                'Восстановить базу заметок из резервной копии '
+                + f'`{path_backup}`?'
+            )
+            confirmation = check_confirmation()
+
+            if confirmation == 'yes':
+                restore_db(path)
+
+        if confirmation != 'yes':
+            print_md(f'Будет создана новая база заметок: `{path}`.')
+
+    connection = open_db(path, factory)
+    create_db(connection)
+
+    return connection
+
+
+def open_db(path: Path, factory: type[Connection] = Connection) -> Connection:
+    """Opens session's connection to DB even if DB is damaged.
+
+    Note:
+        If file of DB is damaged (e.g. it is not a database), prints error
+        and opens connection without PRAGMAs, so commands `restore-db`
+        and `recreate-db` are still available.
+
+    Args:
+        path (Path): PosixPath of DB.
+        factory (type[Connection]): class of connection (see `connect_db`).
+
+    Returns:
+        Connection: session's connection to database.
+
+    """
+    try:
+        return connect_db(path, factory)
+
+    except DatabaseError:
+        print_md(f'Ошибка обращения к базе заметок `{path}`!')
+        print_md(
+            'Восстановите её из резервной копии (`restore-db`) '
+            + 'или создайте заново (`recreate-db`).'
+        )
+
+    connection = connect(path, factory=factory, check_same_thread=False)
+    register_functions(connection)
+
+    return connection
+
+
+def create_db(connection: Connection) -> None:
+    """Creates empty DB of memos if not exists and upgrades its schema.
+
+    Note:
+        Uses function `migrate_db` (SQL-queries of schema are listed
+        in module `memostore`).
+
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    try:
+        migrate_db(connection)
+
+    except DatabaseError:
+        print_md('Ошибка обновления базы заметок.')
+
@@ -1,122 +1,174 @@
-"""Sets path, check if database exists, backup and restore database."""
+"""Backups, restores and removes database (and all data of program)."""
+from functools import partial
 from pathlib import Path
-from shutil import copy as db_copy
+from shutil import rmtree
+from sqlite3 import DatabaseError
+from typing import Optional
+
+from modules.backupstore import backup_generation, describe_generation
+from modules.backupstore import list_generations, restore_generation
+from modules.backupstore import check_backup, set_backup_path
+from modules.backupstore import LEGACY_BACKUP, import_legacy_backup
+from modules.backupstore import find_legacy_backup
+from modules.dbchecker import cancel_check
+from modules.dbconfig import get_config, set_config_path
+from modules.mdprinter import print_md, print_progress
+from modules.memostore import DEFAULT_NOTEBOOK, check_db, list_notebooks
+from modules.memostore import set_notebook_path, set_working_dir
+from modules.profiler import set_stats_path
+from modules.prompter import check_confirmation, get_generation
+from modules.prompter import get_notebook
 
-from modules.mdprinter import print_md
-from modules.prompter import check_confirmation
 
+def backup_db(path: Path) -> None:
+    """Backups DB of memos as a new generation of backup.
 
-def set_db_path() -> Path:
-    """Creates (in not exists) a directory and set path to store DB.
+    Note:
+        Uses function `backup_generation`: the first backup is full copy
+        of DB (made by SQLite's online backup API), next ones contain only
+        memos changed since the previous backup; generation is compressed
+        if `backup_compression` is set by config file.
 
-    Returns:
-        Path: PosixPath of working directory.
+    Args:
+        path: PosixPath of program's working directory.
 
     """
-    home = Path.home()
-
-    working_dir = home.joinpath('.memopad')
-    working_dir.mkdir(parents=True, exist_ok=True)
-
-    db = 'memos.db'
-    path = working_dir.joinpath(db)
-
-    return path
+    print_md('Создать резервную копию базы заметок?')
+    confirmation = check_confirmation()
 
+    if confirmation == 'yes':
+        import_legacy(path)
 
-def set_backup_path(path: Path) -> Path:
-    """Sets path of database's backup.
+        try:
+            generation = backup_generation(
+                path,
+                partial(print_progress, 'Копирование'),
+                get_config().backup_compression,
+            )
 
-    Args:
-        path (Path): PosixPath of program's working directory.
+            if generation is None:
+                print_md(
+                    'База заметок не изменилась после создания '
+                    + 'последней резервной копии.'
+                )
+            else:
+                print_md(
+                    'Резервная копия базы заметок создана: '
+                    + f'поколение {generation.number} (`{generation.path}`).'
+                )
 
-    Returns:
-        Path: PosixPath of database's backup file.
+        except (DatabaseError, OSError):
+            print_md('Ошибка создания резервной копии базы заметок.')
 
-    """
-    working_dir = path.parent
-    db = path.name
-    path_backup = working_dir.joinpath(f'{db}.backup')
-
-    return path_backup
 
+def restore_db(path: Path) -> None:
+    """Restores DB from generation of backup chosen by user.
 
-def check_db(path: Path) -> bool:
-    """Checks if DB of memos exists.
+    Note:
+        Connection to DB have to be closed; DB is replaced by restored
+        copy atomically (see `restore_generation`).
 
     Args:
         path (Path): PosixPath of program's working directory.
 
-    Returns:
-        bool: bool: True if path exists and backup is file, False otherwise.
-
     """
-    return path.exists() and path.is_file()
-
+    import_legacy(path)
 
-def check_backup(path: Path) -> bool:
-    """Checks if database's backup of memos exists.
+    if not check_backup(path):
+        print_md('Резервная копия базы заметок не найдена!')
+        return
 
-    Args:
-        path (Path): PosixPath of program's working directory.
+    number = choose_generation(path)
 
-    Returns:
-        bool: True if path exists and backup is file, False otherwise.
+    if check_db(path):
+        print_md('Восстановить базу заметок c перезаписью файла?')
+        confirmation = check_confirmation()
 
-    """
-    path_backup = set_backup_path(path)
+        if confirmation != 'yes':
+            return
 
-    return path_backup.exists() and path_backup.is_file()
+    cancel_check()
 
+    try:
+        generation = restore_generation(
+            path, number, partial(print_progress, 'Восстановление')
+        )
+        print_md(
+            f'База заметок `{path}` восстановлена из резервной копии '
+            + f'(поколение {generation.number}).'
+        )
 
-def backup_db(path: Path) -> None:
-    """Backups DB of memos.
+    except (DatabaseError, OSError, EOFError, ValueError):
+        print_md('Ошибка чтения резервной копии базы заметок.')
 
-    Args:
-        path: PosixPath of program's working directory.
 
-    """
-    path_backup = set_backup_path(path)
+def import_legacy(path: Path) -> None:
+    """Imports backup of older versions (if any) as generation of backup.
 
-    print_md('Создать резервную копию базы заметок?')
-    confirmation = check_confirmation()
-
-    if confirmation == 'yes':
-        db_backup = db_copy(path, path_backup)
-        print_md(f'Резервная копия базы заметок создана: `{db_backup}`.')
+    Note:
+        Uses function `import_legacy_backup`; if the backup can not
+        be imported, user is told about it (the file is kept).
 
+    Args:
+        path (Path): PosixPath of program's working directory.
 
-def restore_db(path: Path) -> None:
-    """Restores DB from backup.
+    """
+    path_legacy = find_legacy_backup(path)
+
+    try:
+        generation = import_legacy_backup(path)
+    except ValueError:
+        print_md(
+            f'Резервная копия прежней версии `{path_legacy}` не перенесена: '
+            + 'поколение 0 уже существует (восстановите её вручную '
+            + 'или удалите).'
+        )
+        return
+    except OSError:
+        print_md(
+            f'Ошибка переноса резервной копии прежней версии `{path_legacy}`.'
+        )
+        return
+
+    if generation is not None:
+        print_md(
+            'Резервная копия прежней версии перенесена: '
+            + f'поколение {generation.number} (`{generation.path}`).'
+        )
+
+
+def choose_generation(path: Path) -> Optional[int]:
+    """Shows generations of backup and prompts user to choose one.
 
     Args:
         path (Path): PosixPath of program's working directory.
 
+    Returns:
+        Optional[int]: number of generation; None for the latest one.
+
     """
-    is_db = check_db(path)
-    is_backup = check_backup(path)
-    path_backup = set_backup_path(path)
+    generations = list_generations(path)
+    numbers = [generation.number for generation in generations]
+    rows = []
 
-    if is_backup:
+    for generation in generations:
+        created, size = describe_generation(generation)
+        kind = 'полная копия' if generation.is_full else 'изменения'
+        rows.append(f'| {generation.number} | {created} | {kind} | {size} |')
 
-        if is_db:
-            print_md('Восстановить базу заметок c перезаписью файла?')
-            confirmation: str = check_confirmation()
+    print_md(
+        '| Поколение | Дата | Тип | Размер, КиБ |\n'
+        + '|---|---|---|---|\n'
+        + '\n'.join(rows)
+    )
+    print_md('Введите номер поколения (`ENTER` - последнее):')
+    number = get_generation()
 
-            if confirmation == 'yes':
-                db_replaced_from_backup: Path = db_copy(path_backup, path)
-                print_md(
-                    f'База заметок `{db_replaced_from_backup}` '
-                    + 'перезаписана из резервной копии.'
-                )
-        else:
-            db_restored_from_backup: Path = db_copy(path_backup, path)
-            print_md(
-                f'База заметок `{db_restored_from_backup}` '
-                + 'восстановлена из резервной копии.'
-            )
-    else:
-        print_md('Резервная копия базы заметок не найдена!')
+    while number is not None and number not in numbers:
+        print_md('Такого поколения нет, введите номер из таблицы:')
+        number = get_generation()
+
+    return number
 
 
 def remove_db(path: Path) -> None:
@@ -133,27 +185,106 @@ def remove_db(path: Path) -> None:
         confirmation = check_confirmation()
 
         if confirmation == 'yes':
-            path.unlink()
+            unlink_db(path)
+
+
+def unlink_db(path: Path) -> None:
+    """Deletes file of DB with its write-ahead log and shared-memory files.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    """
+    cancel_check()
+    path.unlink()
+
+    for suffix in ('-wal', '-shm'):
+        path.with_name(f'{path.name}{suffix}').unlink(missing_ok=True)
 
 
 def clear_data(path: Path) -> None:
     """Clears all data and remove working directory.
 
+    Note:
+        All notebooks (see `use`) and their backups are deleted. If DB
+        is placed outside working directory by config file, its directory
+        is kept (DB, backups and log of statistics are deleted).
+
     Args:
         path (Path): PosixPath of program's working directory.
 
     """
-    working_dir = path.parent
-    backup_path = set_backup_path(path)
-    is_db = check_db(path)
-    is_backup = check_backup(path)
-
-    print_md('Очистить все данные и удалить папку приложения?')
+    working_dir = set_working_dir()
+    notebooks = list_notebooks(path)
+    backup_path = set_backup_path(path.with_name(f'{DEFAULT_NOTEBOOK}.db'))
+    names = ', '.join(f'`{notebook.stem}`' for notebook in notebooks)
+
+    print_md(
+        f'Очистить все данные (блокноты: {names or "нет"}) '
+        + 'и удалить папку приложения?'
+    )
     confirmation = check_confirmation()
 
     if confirmation == 'yes':
-        if is_db:
-            path.unlink()
-        if is_backup:
-            backup_path.unlink()
+        for notebook in notebooks:
+            unlink_db(notebook)
+        if backup_path.is_dir():
+            rmtree(backup_path)
+        working_dir.joinpath(LEGACY_BACKUP).unlink(missing_ok=True)
+        set_stats_path(path).unlink(missing_ok=True)
+        set_config_path(working_dir).unlink(missing_ok=True)
         Path.rmdir(working_dir)
+
+
+def choose_notebook(path: Path) -> Optional[Path]:
+    """Shows notebooks and prompts user to choose one.
+
+    Note:
+        Notebook is a separate DB of memos in the same directory, e.g.
+        `~/.memopad/work.db` (the default one is `memos.db`); user have
+        to confirm creation of new notebook.
+
+    Args:
+        path (Path): PosixPath of the current notebook.
+
+    Returns:
+        Optional[Path]: PosixPath of chosen notebook; None if user cancels
+        choice.
+
+    """
+    notebooks = list_notebooks(path)
+    rows = [
+        f'| {notebook.stem} | {notebook.stat().st_size // 1024} '
+        + f'| {"открыт" if notebook == path else ""} |'
+        for notebook in notebooks
+    ]
+
+    print_md(
+        '| Блокнот | Размер, КиБ | |\n'
+        + '|---|--:|---|\n'
+        + '\n'.join(rows)
+    )
+    print_md('Введите название блокнота (`ENTER` - отмена):')
+    name = get_notebook([notebook.stem for notebook in notebooks]).strip()
+
+    if not name:
+        return None
+
+    try:
+        notebook = set_notebook_path(path, name)
+    except ValueError:
+        print_md('Название блокнота - буквы, цифры, `_` и `-`.')
+        return None
+
+    if notebook == path:
+        print_md(f'Блокнот `{name}` уже открыт.')
+        return None
+
+    if not check_db(notebook):
+        print_md(f'Блокнот `{name}` не найден. Создать новый блокнот?')
+        confirmation = check_confirmation()
+
+        if confirmation != 'yes':
+            return None
+
+    return notebook
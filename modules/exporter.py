@@ -0,0 +1,179 @@
+"""Exports memos to JSON Lines, CSV or Markdown-files (without user's UI)."""
+import csv
+import json
+import re
+from pathlib import Path
+from typing import Iterable, TextIO
+
+from modules.memostore import NO_TAG
+
+EXPORT_FORMATS: list[str] = ['jsonl', 'csv', 'md']
+CSV_FIELDS: list[str] = ['id', 'date_time', 'title', 'text', 'tags']
+FILE_NAME_LENGTH = 50
+NOT_FILE_NAME = re.compile(r'[^\w-]+')
+
+
+def memo_to_dict(memo: tuple[str, ...]) -> dict[str, object]:
+    """Converts memo to dictionary (for JSON).
+
+    Args:
+        memo (tuple[str, ...]): memo (rowid, date_time, title, body and tag).
+
+    Returns:
+        dict[str, object]: memo with keys `id`, `date_time`, `title`
+        (without `##`), `text` and `tags` (list of tags without `#`, empty
+        for `NO_TAG`).
+
+    """
+    rowid, date_time, title, body, tags = memo
+
+    return {
+        'id': rowid,
+        'date_time': date_time,
+        'title': title.removeprefix('## '),
+        'text': body,
+        'tags': [tag.lstrip('#') for tag in tags.split() if tag != NO_TAG],
+    }
+
+
+def export_memos(
+    memos: Iterable[tuple[str, ...]], path: Path, export_format: str
+) -> int:
+    """Exports memos to file (`jsonl`, `csv`) or directory (`md`).
+
+    Note:
+        Memos are written one by one while they are read from cursor
+        (see `modules.memostore.iter_memos`), so memory does not depend
+        on a number of memos.
+
+    Args:
+        memos (Iterable[tuple[str, ...]]): memos (rowid, date_time, title,
+        body and tag).
+        path (Path): PosixPath of file (or directory for `md`).
+        export_format (str): one of `EXPORT_FORMATS`.
+
+    Returns:
+        int: number of exported memos.
+
+    Raises:
+        OSError: If file (directory) can not be written.
+
+    """
+    if export_format == 'md':
+        return write_md_files(memos, path)
+
+    with path.open('w', encoding='utf-8', newline='') as file:
+        if export_format == 'csv':
+            return write_csv(memos, file)
+
+        return write_jsonl(memos, file)
+
+
+def write_jsonl(memos: Iterable[tuple[str, ...]], file: TextIO) -> int:
+    """Writes memos as JSON Lines (one JSON-object per line).
+
+    Args:
+        memos (Iterable[tuple[str, ...]]): memos to write.
+        file (TextIO): opened file (or `stdout`).
+
+    Returns:
+        int: number of written memos.
+
+    """
+    written = 0
+
+    for memo in memos:
+        file.write(json.dumps(memo_to_dict(memo), ensure_ascii=False) + '\n')
+        written += 1
+
+    return written
+
+
+def write_csv(memos: Iterable[tuple[str, ...]], file: TextIO) -> int:
+    """Writes memos as CSV with header (tags are divided by spaces).
+
+    Args:
+        memos (Iterable[tuple[str, ...]]): memos to write.
+        file (TextIO): opened file (or `stdout`).
+
+    Returns:
+        int: number of written memos.
+
+    """
+    writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    written = 0
+
+    for memo in memos:
+        row = memo_to_dict(memo)
+        row['tags'] = ' '.join(row['tags'])
+        writer.writerow(row)
+        written += 1
+
+    return written
+
+
+def write_md_files(memos: Iterable[tuple[str, ...]], directory: Path) -> int:
+    """Writes every memo to its own Markdown-file with front-matter.
+
+    Note:
+        Front-matter (title, tags and date) is read back by command
+        `import`, e.g. file `42-Заметка.md`:
+
+            ---
+            title: "Заметка"
+            tags: ["work", "idea"]
+            date: 2023-05-17 10:30:00
+            ---
+            Текст заметки
+
+        Title and tags are quoted and escaped as JSON-strings (valid
+        double-quoted YAML-scalars), so quotes, `:`, `#` and brackets
+        in them are read back as is.
+
+    Args:
+        memos (Iterable[tuple[str, ...]]): memos to write.
+        directory (Path): PosixPath of directory (created if not exists).
+
+    Returns:
+        int: number of written memos.
+
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    written = 0
+
+    for memo in memos:
+        row = memo_to_dict(memo)
+        path = directory.joinpath(make_file_name(row['id'], row['title']))
+        title = json.dumps(row['title'], ensure_ascii=False)
+        tags = ', '.join(
+            json.dumps(tag, ensure_ascii=False) for tag in row['tags']
+        )
+        path.write_text(
+            '---\n'
+            + f'title: {title}\n'
+            + f'tags: [{tags}]\n'
+            + f'date: {row["date_time"]}\n'
+            + '---\n'
+            + f'{row["text"]}\n',
+            encoding='utf-8',
+        )
+        written += 1
+
+    return written
+
+
+def make_file_name(rowid: int, title: str) -> str:
+    """Makes name of Markdown-file for memo (ID and words of title).
+
+    Args:
+        rowid (int): ROWID of memo.
+        title (str): title of memo (without `##`).
+
+    Returns:
+        str: name of file, e.g. `42-Заметка-о-работе.md`.
+
+    """
+    words = NOT_FILE_NAME.sub('-', title).strip('-_')[:FILE_NAME_LENGTH]
+
+    return f'{rowid}-{words}.md' if words else f'{rowid}.md'
@@ -0,0 +1,319 @@
+"""Imports memos from directories of Markdown-files (without user's UI)."""
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from sqlite3 import Connection, DatabaseError
+from time import perf_counter
+from typing import Iterable, Iterator, Optional
+
+from modules.memostore import make_memo, pack_body, split_tags
+
+IMPORT_BATCH_SIZE = 5000
+PARSE_CHUNK_SIZE = 64
+MIN_FILES_FOR_POOL = 256
+FRONT_MATTER = re.compile(r'\A---[ \t]*\n(.*?)\n---[ \t]*(?:\n|\Z)', re.S)
+FRONT_MATTER_KEY = re.compile(r'^([A-Za-z_]+)[ \t]*:[ \t]*(.*)$')
+FRONT_MATTER_ITEM = re.compile(
+    r'[ \t]*("(?:[^"\\]|\\.)*"|\'(?:[^\']|\'\')*\'|[^,]+)'
+)
+
+
+def find_md_files(directory: Path) -> list[Path]:
+    """Finds Markdown-files in directory and its subdirectories.
+
+    Args:
+        directory (Path): PosixPath of directory to import.
+
+    Returns:
+        list[Path]: sorted paths of files `*.md`.
+
+    """
+    return sorted(path for path in directory.rglob('*.md') if path.is_file())
+
+
+def parse_md_file(path: Path) -> Optional[tuple[str, ...]]:
+    """Parses Markdown-file to memo.
+
+    Note:
+        Title, tags and date are read from front-matter, e.g.:
+
+            ---
+            title: Заголовок
+            tags: [work, idea]
+            date: 2023-05-17 10:30
+            ---
+
+        Without front-matter title is taken from the first header `# ...`
+        (or from name of file) and date - from time of file's modification.
+
+    Args:
+        path (Path): PosixPath of Markdown-file.
+
+    Returns:
+        Optional[tuple[str, ...]]: memo (date_time, title, body and tag);
+        None if file can not be read.
+
+    """
+    try:
+        text = path.read_text(encoding='utf-8')
+        modified = path.stat().st_mtime
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    meta = {}
+    front_matter = FRONT_MATTER.match(text)
+
+    if front_matter:
+        meta = parse_front_matter(front_matter.group(1))
+        text = text[front_matter.end():]
+
+    title = meta.get('title', '')
+
+    if not title:
+        header, _, rest = text.lstrip().partition('\n')
+
+        if header.startswith('# '):
+            title, text = header[2:], rest
+        else:
+            title = path.stem
+
+    date_time = parse_date(meta.get('date', ''))
+
+    if not date_time:
+        date_time = datetime.fromtimestamp(modified).strftime(
+            '%Y-%m-%d %H:%M:%S'
+        )
+
+    tags = meta.get('tags', '').replace(',', ' ')
+    tags = ' '.join(tag.lstrip('#') for tag in tags.split())
+
+    return make_memo(title, text, tags, date_time)
+
+
+def parse_front_matter(front_matter: str) -> dict[str, str]:
+    """Parses front-matter (simple YAML: `key: value` and lists).
+
+    Args:
+        front_matter (str): lines between `---`.
+
+    Returns:
+        dict[str, str]: lowercase keys and values (items of lists are
+        joined by spaces, quoted values are unquoted by `parse_scalar`).
+
+    """
+    meta: dict[str, str] = {}
+    key = ''
+
+    for line in front_matter.splitlines():
+        key_value = FRONT_MATTER_KEY.match(line)
+
+        if key_value:
+            key = key_value.group(1).lower()
+            value = key_value.group(2).strip()
+
+            if value.startswith('[') and value.endswith(']'):
+                items = FRONT_MATTER_ITEM.findall(value[1:-1])
+                meta[key] = ' '.join(
+                    parse_scalar(item) for item in items if item.strip()
+                )
+            else:
+                meta[key] = parse_scalar(value)
+
+        elif key and line.lstrip().startswith('- '):
+            item = parse_scalar(line.lstrip()[2:])
+            meta[key] = f'{meta[key]} {item}'.strip()
+
+    return meta
+
+
+def parse_scalar(value: str) -> str:
+    """Parses value of front-matter (plain, single- or double-quoted).
+
+    Note:
+        Only one pair of surrounding quotes is removed: escapes
+        of double-quoted value are processed as in JSON (e.g. `\\"`, `\\n`),
+        in single-quoted value `''` is a quote (as in YAML); quotes inside
+        plain value are kept, e.g. `Don't panic`.
+
+    Args:
+        value (str): value of key or item of list.
+
+    Returns:
+        str: unquoted value.
+
+    """
+    value = value.strip()
+
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value[1:-1]
+
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+
+    return value
+
+
+def parse_date(date: str) -> str:
+    """Parses date (and time) of front-matter.
+
+    Args:
+        date (str): date in ISO format, e.g. `2023-05-17` or
+        `2023-05-17T10:30:00`.
+
+    Returns:
+        str: date_time of memo; empty string if date is not valid.
+
+    """
+    try:
+        date_time = datetime.fromisoformat(date.strip())
+    except ValueError:
+        return ''
+
+    return date_time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def parse_md_files(
+    paths: list[Path], workers: Optional[int] = None
+) -> Iterator[Optional[tuple[str, ...]]]:
+    """Parses Markdown-files in pool of processes (keeping order of files).
+
+    Note:
+        Small directories (less than `MIN_FILES_FOR_POOL` files) are parsed
+        in the current process, because starting the pool takes longer.
+
+    Args:
+        paths (list[Path]): paths of Markdown-files.
+        workers (Optional[int]): number of processes; number of CPUs
+        if None.
+
+    Yields:
+        Optional[tuple[str, ...]]: memo (or None if file is not read).
+
+    """
+    if len(paths) < MIN_FILES_FOR_POOL or workers == 1:
+        yield from map(parse_md_file, paths)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            parse_md_file, paths, chunksize=PARSE_CHUNK_SIZE
+        )
+
+
+def insert_memos(
+    connection: Connection, memos: Iterable[tuple[str, ...]]
+) -> int:
+    """Inserts memos (with their tags) into DB in one transaction.
+
+    Note:
+        ROWIDs are assigned to memos in advance (after the greatest
+        existing ROWID, under the lock of `BEGIN IMMEDIATE`), so memos and
+        tags are inserted by `executemany` without round trip per memo.
+
+    Args:
+        connection (Connection): connection to database.
+        memos (Iterable[tuple[str, ...]]): memos (date_time, title, body
+        and tag).
+
+    Returns:
+        int: number of inserted memos.
+
+    Raises:
+        DatabaseError: If operation failed (transaction is rolled back).
+
+    """
+    cursor = connection.cursor()
+
+    sql_max_rowid = """SELECT COALESCE(MAX(ROWID), 0) FROM memos;"""
+    sql_add_memos = """INSERT INTO memos (ROWID, date_time, titles, bodies,
+                                          body_format, tags)
+                            VALUES (?, ?, ?, ?, ?, ?);"""
+    sql_add_tags = """INSERT OR IGNORE INTO memo_tags (tag, memo_id)
+                           VALUES (?, ?);"""
+
+    try:
+        cursor.execute('BEGIN IMMEDIATE;')
+        cursor.execute(sql_max_rowid)
+        rows = [
+            (rowid, date_time, title, *pack_body(body), tags)
+            for rowid, (date_time, title, body, tags) in enumerate(
+                memos, start=cursor.fetchone()[0] + 1
+            )
+        ]
+
+        cursor.executemany(sql_add_memos, rows)
+        cursor.executemany(
+            sql_add_tags,
+            [(tag, row[0]) for row in rows for tag in split_tags(row[5])],
+        )
+        connection.commit()
+
+    except DatabaseError:
+        connection.rollback()
+        raise
+
+    return len(rows)
+
+
+def import_md_files(
+    connection: Connection,
+    paths: list[Path],
+    workers: Optional[int] = None,
+) -> tuple[int, int, float]:
+    """Imports Markdown-files as memos.
+
+    Note:
+        Files are parsed in pool of processes, parsed memos are inserted
+        by batches of `IMPORT_BATCH_SIZE` memos (one transaction each)
+        while next files are being parsed.
+
+    Args:
+        connection (Connection): connection to database.
+        paths (list[Path]): paths of Markdown-files (see `find_md_files`).
+        workers (Optional[int]): number of processes to parse files.
+
+    Returns:
+        tuple[int, int, float]: numbers of imported memos and skipped
+        (unreadable) files and time of import in seconds.
+
+    Raises:
+        DatabaseError: If operation failed (memos of previous batches
+        stay imported).
+
+    """
+    start = perf_counter()
+    memos = parse_md_files(paths, workers)
+
+    imported = 0
+    skipped = 0
+
+    while batch := list(islice(memos, IMPORT_BATCH_SIZE)):
+        parsed = [memo for memo in batch if memo is not None]
+        skipped += len(batch) - len(parsed)
+
+        if parsed:
+            imported += insert_memos(connection, parsed)
+
+    return imported, skipped, perf_counter() - start
+
+
+def expand_dir(directory: str) -> Optional[Path]:
+    """Expands user's path of directory (e.g. `~/notes`).
+
+    Args:
+        directory (str): path entered by user.
+
+    Returns:
+        Optional[Path]: PosixPath of directory; None if it does not exist.
+
+    """
+    path = Path(os.path.expanduser(directory.strip()))
+
+    return path if path.is_dir() else None
@@ -1,8 +1,83 @@
 """Prints help and memos using Markdown markup language."""
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from threading import Lock
+from typing import Iterable
+
 from rich.console import Console
 from rich.markdown import Markdown
 
+from modules.profiler import profile_render
+
+CONSOLE = Console()
+RENDER_CACHE: OrderedDict[tuple[bytes, int], str] = OrderedDict()
+RENDER_CACHE_SIZE = 256
+RENDER_LOCK = Lock()
+RENDER_WORKERS = 2
+RENDER_AHEAD = 16
+
+
+def render_md(text: str) -> str:
+    """Renders Markdown to text with terminal's styles (using LRU-cache).
+
+    Note:
+        Rendered text is cached by hash of Markdown and width of terminal,
+        so repeated memos and help are printed without parsing; cache keeps
+        up to `RENDER_CACHE_SIZE` last rendered texts (it is shared by
+        threads of `print_memos_from_db`, so it is used under lock).
+
+    Args:
+        text (str): multi-line strings of Markdown.
+
+    Returns:
+        str: rendered text (with ANSI-codes of styles).
+
+    """
+    key = (blake2b(text.encode(), digest_size=16).digest(), CONSOLE.width)
+
+    with RENDER_LOCK:
+        rendered = RENDER_CACHE.get(key)
+
+        if rendered is not None:
+            RENDER_CACHE.move_to_end(key)
+
+            return rendered
+
+    with CONSOLE.capture() as capture:
+        CONSOLE.print(Markdown(text))
+    rendered = capture.get()
+
+    with RENDER_LOCK:
+        RENDER_CACHE[key] = rendered
+
+        if len(RENDER_CACHE) > RENDER_CACHE_SIZE:
+            RENDER_CACHE.popitem(last=False)
+
+    return rendered
+
+
+def render_memo(memo: tuple[str, ...]) -> str:
+    """Renders memo from DB to text with terminal's styles.
+
+    Args:
+        memo (tuple[str, ...]): tuple contains memo's elements
+        (rowid, date_time, title, body and tag).
+
+    Returns:
+        str: rendered memo (header, title and text with ANSI-codes).
 
+    """
+    rowid, date_time, title, body, tag = memo
+
+    with CONSOLE.capture() as capture:
+        CONSOLE.print('')
+        CONSOLE.print(f'{date_time} {tag} (ID: {rowid})')
+
+    return capture.get() + render_md(title) + render_md(body) + '\n'
+
+
+@profile_render
 def print_new_memo(memo: tuple[str, ...]) -> None:
     """Prints creating memo (process Markdown using module `rich`).
 
@@ -11,17 +86,16 @@ def print_new_memo(memo: tuple[str, ...]) -> None:
         (date_time, title, body and tag).
 
     """
-    console = Console()
-
     date_time, title, body, tag = memo
 
-    console.print('')
-    console.print(f'{date_time} {tag}')
-    console.print(Markdown(title))
-    console.print(Markdown(body))
-    console.print('')
+    CONSOLE.print('')
+    CONSOLE.print(f'{date_time} {tag}')
+    CONSOLE.file.write(render_md(title))
+    CONSOLE.file.write(render_md(body))
+    CONSOLE.print('')
 
 
+@profile_render
 def print_memo_from_db(memo: tuple[str, ...]) -> None:
     """Prints memo from DB (process Markdown using module `rich`).
 
@@ -30,23 +104,45 @@ def print_memo_from_db(memo: tuple[str, ...]) -> None:
         (rowid, date_time, title, body and tag).
 
     """
-    console = Console()
+    CONSOLE.file.write(render_memo(memo))
 
-    (
-        rowid,
-        date_time,
-        title,
-        body,
-        tag,
-    ) = memo
 
-    console.print('')
-    console.print(f'{date_time} {tag} (ID: {rowid})')
-    console.print(Markdown(title))
-    console.print(Markdown(body))
-    console.print('')
+@profile_render
+def print_memos_from_db(memos: Iterable[tuple[str, ...]]) -> int:
+    """Prints memos from DB rendered in pool of threads (keeping order).
+
+    Note:
+        Up to `RENDER_AHEAD` memos are rendered by `RENDER_WORKERS` threads
+        while previous memos are written to terminal, so long lists
+        are printed as fast as terminal shows them.
+
+    Args:
+        memos (Iterable[tuple[str, ...]]): memos (rowid, date_time, title,
+        body and tag), e.g. read by `modules.memostore.read_ahead`.
+
+    Returns:
+        int: number of printed memos.
+
+    """
+    printed = 0
+    rendered = deque()
 
+    with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as executor:
+        for memo in memos:
+            rendered.append(executor.submit(render_memo, memo))
 
+            if len(rendered) >= RENDER_AHEAD:
+                CONSOLE.file.write(rendered.popleft().result())
+                printed += 1
+
+        while rendered:
+            CONSOLE.file.write(rendered.popleft().result())
+            printed += 1
+
+    return printed
+
+
+@profile_render
 def print_md(text: str) -> None:
     """Prints help and messages (process Markdown using module `rich`).
 
@@ -54,17 +150,31 @@ def print_md(text: str) -> None:
         text (str): multi-line strings of help and messages.
 
     """
-    console = Console()
+    CONSOLE.file.write(render_md(text))
+
 
-    console.print(Markdown(text))
+@profile_render
+def print_progress(text: str, done: int, total: int) -> None:
+    """Prints progress of long operation in the same line.
 
+    Args:
+        text (str): name of operation.
+        done (int): number of done steps (e.g. copied pages of DB).
+        total (int): total number of steps.
 
+    """
+    percent = done * 100 // total if total else 100
+
+    CONSOLE.print(
+        f'{text}: {percent}%', end='\n' if done >= total else '\r'
+    )
+
+
+@profile_render
 def print_total(total: int) -> None:
     """Prints total of memos in DB.
 
     Args:
         total (int): total of existing memos in database.
     """
-    console = Console()
-
-    console.print(f'Всего заметок в базе: {total}.')
+    CONSOLE.print(f'Всего заметок в базе: {total}.')
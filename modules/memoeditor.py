@@ -1,7 +1,7 @@
 """Creates new memo with date_time, title, body and tag."""
-from datetime import datetime
-
 from modules.mdprinter import print_md
+from modules.memostore import format_title, format_body, format_tags
+from modules.memostore import set_datetime
 from modules.prompter import get_new_title, get_new_text, get_new_tag
 from modules.prompter import get_title_to_edit, get_text_to_edit
 from modules.prompter import get_tag_to_edit
@@ -20,18 +20,6 @@ def create_new_memo() -> tuple[str, ...]:
     return memo
 
 
-def set_datetime() -> str:
-    """Sets date_time of new memo.
-
-    Returns:
-        str: date_time of memo generated by module `datetime`.
-
-    """
-    now = datetime.now()
-
-    return now.strftime('%Y-%m-%d %H:%M:%S')
-
-
 def input_title() -> str:
     """Enters and returns title of new memo.
 
@@ -39,18 +27,11 @@ def input_title() -> str:
         str: title of memo using function `get_new_title`.
 
         If user does not enter any own title,
-        then default title from variable `no_title` is returned.
+        then default title `NO_TITLE` is returned.
 
     """
-    no_title = '## [Без заголовка]'
-
     print_md('Введите заголовок или просто нажмите `ENTER`:')
-    title = get_new_title().strip()
-
-    if title:
-        title = f'## {title}'
-    else:
-        title = no_title
+    title = format_title(get_new_title())
 
     return title
 
@@ -62,16 +43,11 @@ def input_body() -> str:
         str: text of memo using function `get_new_text`.
 
         If user does not enter any own text,
-        then default text from variable `no_text` is returned.
+        then default text `NO_TEXT` is returned.
 
     """
-    no_text = '[Пустая заметка]'
-
     print_md('Напишите заметку, для выхода нажмите `ESC` и затем `ENTER`:')
-    text = get_new_text().strip()
-
-    if not text:
-        text = no_text
+    text = format_body(get_new_text())
 
     return text
 
@@ -85,21 +61,14 @@ def input_tag() -> str:
         User can enter several tags divided by spaces.
 
         If user does not enter any own tag,
-        then default tag from variable `no_tag` is returned.
+        then default tag `NO_TAG` is returned.
 
     """
-    no_tag = '#no_tag'
-
     print_md(
         'Введите тег (теги, разделённые пробелами) или просто нажмите '
         '`ENTER`:'
     )
-    tags = get_new_tag().strip()
-
-    if tags:
-        tags = ' '.join([f'#{tag.strip()}' for tag in tags.split(' ') if tag])
-    else:
-        tags = no_tag
+    tags = format_tags(get_new_tag().strip())
 
     return tags
 
@@ -114,21 +83,14 @@ def input_corrected_title() -> tuple[str, str]:
         edited by user.
 
         If user does not enter any own title,
-        then default title from variable `no_title` is returned.
+        then default title `NO_TITLE` is returned.
 
     """
-    no_title = '## [Без заголовка]'
-
     print_md(
         'Вставьте прежний текст из буфера (`CTRL+Y`) и внесите в него '
         + 'исправления, затем нажмите `ENTER`:'
     )
-    corrected_title = get_title_to_edit().strip()
-
-    if corrected_title:
-        corrected_title = f'## {corrected_title}'
-    else:
-        corrected_title = no_title
+    corrected_title = format_title(get_title_to_edit())
 
     updated_date_time = set_datetime()
 
@@ -145,19 +107,14 @@ def input_corrected_body() -> tuple[str, str]:
         edited by user.
 
         If user does not enter any own text,
-        then default text from variable `no_text` is returned.
+        then default text `NO_TEXT` is returned.
 
     """
-    no_text = '[Пустая заметка]'
-
     print_md(
         'Вставьте прежний текст из буфера (`CTRL+Y`) и внесите в него '
         + 'исправления, для выхода нажмите `ESCAPE` и затем `ENTER`:'
     )
-    corrected_text = get_text_to_edit().strip()
-
-    if not corrected_text:
-        corrected_text = no_text
+    corrected_text = format_body(get_text_to_edit())
 
     updated_date_time = set_datetime()
 
@@ -176,22 +133,13 @@ def input_corrected_tag() -> tuple[str, str]:
         edited by user.
 
         If user does not enter any own tag,
-        then default tag from variable `no_tag` is returned.
+        then default tag `NO_TAG` is returned.
     """
-    no_tag = '#no_tag'
-
     print_md(
         'Вставьте прежний тег или теги из буфера (`CTRL+Y`) и внесите '
         + 'исправления, затем нажмите `ENTER`:'
     )
-    corrected_tags = get_tag_to_edit().strip()
-
-    if corrected_tags:
-        corrected_tags = ' '.join(
-            [f'#{tag.strip()}' for tag in corrected_tags.split(' ') if tag]
-        )
-    else:
-        corrected_tags = no_tag
+    corrected_tags = format_tags(get_tag_to_edit().strip())
 
     updated_date_time = set_datetime()
 
@@ -0,0 +1,1785 @@
+"""Stores memos in SQLite-database (SQL-queries without user's interface)."""
+import heapq
+import json
+import re
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as date_type, datetime, timedelta
+from difflib import SequenceMatcher
+from functools import wraps
+from pathlib import Path
+from queue import Empty, Queue
+from sqlite3 import connect, Connection, DatabaseError
+from threading import Event, Thread
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional
+
+from modules.dbconfig import apply_config, get_config, load_config
+
+SQL_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS memos
+                           (
+                           date_time DATETIME NOT NULL,
+                           titles TEXT NOT NULL,
+                           bodies TEXT NOT NULL,
+                           tags TEXT NOT NULL
+                           );"""
+SQL_MIGRATIONS: tuple[str, ...] = (
+    # 1: full-text index (FTS5) of titles and bodies, synced by triggers.
+    """CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts
+           USING fts5(
+           titles,
+           bodies,
+           content='memos',
+           tokenize='unicode61 remove_diacritics 2'
+           );
+       CREATE TRIGGER IF NOT EXISTS memos_fts_insert AFTER INSERT ON memos
+       BEGIN
+           INSERT INTO memos_fts (rowid, titles, bodies)
+           VALUES (new.ROWID, new.titles, new.bodies);
+       END;
+       CREATE TRIGGER IF NOT EXISTS memos_fts_delete AFTER DELETE ON memos
+       BEGIN
+           INSERT INTO memos_fts (memos_fts, rowid, titles, bodies)
+           VALUES ('delete', old.ROWID, old.titles, old.bodies);
+       END;
+       CREATE TRIGGER IF NOT EXISTS memos_fts_update AFTER UPDATE ON memos
+       BEGIN
+           INSERT INTO memos_fts (memos_fts, rowid, titles, bodies)
+           VALUES ('delete', old.ROWID, old.titles, old.bodies);
+           INSERT INTO memos_fts (rowid, titles, bodies)
+           VALUES (new.ROWID, new.titles, new.bodies);
+       END;
+       INSERT INTO memos_fts (memos_fts) VALUES ('rebuild');""",
+    # 2: total of memos (single row), maintained by triggers.
+    """CREATE TABLE IF NOT EXISTS memos_stats
+           (
+           id INTEGER PRIMARY KEY CHECK (id = 1),
+           total INTEGER NOT NULL
+           );
+       INSERT OR REPLACE INTO memos_stats (id, total)
+       SELECT 1, COUNT(*) FROM memos;
+       CREATE TRIGGER IF NOT EXISTS memos_stats_insert AFTER INSERT ON memos
+       BEGIN
+           UPDATE memos_stats SET total = total + 1 WHERE id = 1;
+       END;
+       CREATE TRIGGER IF NOT EXISTS memos_stats_delete AFTER DELETE ON memos
+       BEGIN
+           UPDATE memos_stats SET total = total - 1 WHERE id = 1;
+       END;""",
+    # 3: normalized tags (casefolded, without `#`) with covering index.
+    """CREATE TABLE IF NOT EXISTS memo_tags
+           (
+           tag TEXT NOT NULL,
+           memo_id INTEGER NOT NULL,
+           PRIMARY KEY (tag, memo_id)
+           ) WITHOUT ROWID;
+       CREATE INDEX IF NOT EXISTS memo_tags_memo_id ON memo_tags (memo_id);
+       CREATE TRIGGER IF NOT EXISTS memo_tags_delete AFTER DELETE ON memos
+       BEGIN
+           DELETE FROM memo_tags WHERE memo_id = old.ROWID;
+       END;
+       WITH RECURSIVE split (memo_id, tag, rest) AS (
+           SELECT ROWID, '', tags || ' ' FROM memos
+           UNION ALL
+           SELECT memo_id,
+                  substr(rest, 1, instr(rest, ' ') - 1),
+                  substr(rest, instr(rest, ' ') + 1)
+               FROM split
+               WHERE rest <> ''
+       )
+       INSERT OR IGNORE INTO memo_tags (tag, memo_id)
+       SELECT CASEFOLD(ltrim(tag, '#')), memo_id
+           FROM split
+           WHERE ltrim(tag, '#') <> '';""",
+    # 4: index of date and time of memos (for search by period).
+    """CREATE INDEX IF NOT EXISTS memos_date_time ON memos (date_time);""",
+    # 5: ROWIDs of memos changed since the last backup's generation.
+    """CREATE TABLE IF NOT EXISTS memo_changes
+           (
+           memo_id INTEGER PRIMARY KEY
+           );
+       CREATE TABLE IF NOT EXISTS backup_state
+           (
+           id INTEGER PRIMARY KEY CHECK (id = 1),
+           generation INTEGER NOT NULL
+           );
+       INSERT OR IGNORE INTO backup_state (id, generation) VALUES (1, 0);
+       CREATE TRIGGER IF NOT EXISTS memo_changes_insert AFTER INSERT ON memos
+       BEGIN
+           INSERT OR IGNORE INTO memo_changes (memo_id) VALUES (new.ROWID);
+       END;
+       CREATE TRIGGER IF NOT EXISTS memo_changes_update AFTER UPDATE ON memos
+       BEGIN
+           INSERT OR IGNORE INTO memo_changes (memo_id) VALUES (new.ROWID);
+       END;
+       CREATE TRIGGER IF NOT EXISTS memo_changes_delete AFTER DELETE ON memos
+       BEGIN
+           INSERT OR IGNORE INTO memo_changes (memo_id) VALUES (old.ROWID);
+       END;""",
+    # 6: bodies compressed by zlib (format 1), FTS5 reads decompressed text;
+    # the next backup is full (deltas would not fit older schema).
+    """ALTER TABLE memos ADD COLUMN body_format INTEGER NOT NULL DEFAULT 0;
+       DROP TRIGGER IF EXISTS memos_fts_insert;
+       DROP TRIGGER IF EXISTS memos_fts_delete;
+       DROP TRIGGER IF EXISTS memos_fts_update;
+       DROP TABLE IF EXISTS memos_fts;
+       CREATE VIEW IF NOT EXISTS memos_content AS
+           SELECT ROWID AS memo_id, titles,
+                  MEMO_BODY(bodies, body_format) AS bodies
+               FROM memos;
+       CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts
+           USING fts5(
+           titles,
+           bodies,
+           content='memos_content',
+           content_rowid='memo_id',
+           tokenize='unicode61 remove_diacritics 2'
+           );
+       CREATE TRIGGER IF NOT EXISTS memos_fts_insert AFTER INSERT ON memos
+       BEGIN
+           INSERT INTO memos_fts (rowid, titles, bodies)
+           VALUES (new.ROWID, new.titles,
+                   MEMO_BODY(new.bodies, new.body_format));
+       END;
+       CREATE TRIGGER IF NOT EXISTS memos_fts_delete AFTER DELETE ON memos
+       BEGIN
+           INSERT INTO memos_fts (memos_fts, rowid, titles, bodies)
+           VALUES ('delete', old.ROWID, old.titles,
+                   MEMO_BODY(old.bodies, old.body_format));
+       END;
+       CREATE TRIGGER IF NOT EXISTS memos_fts_update AFTER UPDATE ON memos
+       BEGIN
+           INSERT INTO memos_fts (memos_fts, rowid, titles, bodies)
+           VALUES ('delete', old.ROWID, old.titles,
+                   MEMO_BODY(old.bodies, old.body_format));
+           INSERT INTO memos_fts (rowid, titles, bodies)
+           VALUES (new.ROWID, new.titles,
+                   MEMO_BODY(new.bodies, new.body_format));
+       END;
+       INSERT INTO memos_fts (memos_fts) VALUES ('rebuild');
+       UPDATE backup_state SET generation = 0;""",
+    # 7: trigram index (contentless FTS5) of casefolded titles, bodies
+    # and tags for search of any substring.
+    """CREATE VIRTUAL TABLE IF NOT EXISTS memos_trigram
+           USING fts5(
+           titles,
+           bodies,
+           tags,
+           content='',
+           columnsize=0,
+           tokenize='trigram'
+           );
+       CREATE TRIGGER IF NOT EXISTS memos_trigram_insert AFTER INSERT ON memos
+       BEGIN
+           INSERT INTO memos_trigram (rowid, titles, bodies, tags)
+           VALUES (new.ROWID, CASEFOLD(new.titles),
+                   CASEFOLD(MEMO_BODY(new.bodies, new.body_format)),
+                   CASEFOLD(new.tags));
+       END;
+       CREATE TRIGGER IF NOT EXISTS memos_trigram_delete AFTER DELETE ON memos
+       BEGIN
+           INSERT INTO memos_trigram (memos_trigram, rowid, titles, bodies,
+                                      tags)
+           VALUES ('delete', old.ROWID, CASEFOLD(old.titles),
+                   CASEFOLD(MEMO_BODY(old.bodies, old.body_format)),
+                   CASEFOLD(old.tags));
+       END;
+       CREATE TRIGGER IF NOT EXISTS memos_trigram_update AFTER UPDATE ON memos
+       BEGIN
+           INSERT INTO memos_trigram (memos_trigram, rowid, titles, bodies,
+                                      tags)
+           VALUES ('delete', old.ROWID, CASEFOLD(old.titles),
+                   CASEFOLD(MEMO_BODY(old.bodies, old.body_format)),
+                   CASEFOLD(old.tags));
+           INSERT INTO memos_trigram (rowid, titles, bodies, tags)
+           VALUES (new.ROWID, CASEFOLD(new.titles),
+                   CASEFOLD(MEMO_BODY(new.bodies, new.body_format)),
+                   CASEFOLD(new.tags));
+       END;
+       INSERT INTO memos_trigram (rowid, titles, bodies, tags)
+           SELECT ROWID, CASEFOLD(titles),
+                  CASEFOLD(MEMO_BODY(bodies, body_format)), CASEFOLD(tags)
+               FROM memos;""",
+    # 8: previous versions (revisions) of memos as deltas against their
+    # successors, recorded by trigger when title, text or tags change.
+    """CREATE TABLE IF NOT EXISTS memo_revisions
+           (
+           id INTEGER PRIMARY KEY,
+           memo_id INTEGER NOT NULL,
+           date_time DATETIME NOT NULL,
+           delta BLOB NOT NULL
+           );
+       CREATE INDEX IF NOT EXISTS memo_revisions_memo_id
+           ON memo_revisions (memo_id);
+       CREATE TRIGGER IF NOT EXISTS memo_revisions_update
+           AFTER UPDATE OF titles, bodies, tags ON memos
+           WHEN old.titles IS NOT new.titles OR old.tags IS NOT new.tags
+                OR MEMO_BODY(old.bodies, old.body_format)
+                   IS NOT MEMO_BODY(new.bodies, new.body_format)
+       BEGIN
+           INSERT INTO memo_revisions (memo_id, date_time, delta)
+           VALUES (old.ROWID, old.date_time,
+                   MEMO_DELTA(old.titles,
+                              MEMO_BODY(old.bodies, old.body_format),
+                              old.tags, new.titles,
+                              MEMO_BODY(new.bodies, new.body_format),
+                              new.tags));
+       END;
+       CREATE TRIGGER IF NOT EXISTS memo_revisions_delete AFTER DELETE ON memos
+       BEGIN
+           DELETE FROM memo_revisions WHERE memo_id = old.ROWID;
+       END;""",
+)
+SQL_PRAGMAS: tuple[str, ...] = (
+    'PRAGMA synchronous = NORMAL;',
+    'PRAGMA temp_store = MEMORY;',
+    'PRAGMA busy_timeout = 5000;',
+)
+CACHED_STATEMENTS = 256
+BODY_TEXT = 0
+BODY_ZLIB = 1
+BODY_COMPRESSION_THRESHOLD = 1024
+PAGE_SIZE = 10
+SEARCH_CACHE: OrderedDict[tuple[Hashable, ...], list[tuple[str, ...]]] = (
+    OrderedDict()
+)
+SEARCH_CACHE_SIZE = 64
+SEARCH_CACHE_ROWS = 20000
+SEARCH_CACHE_STATE: list[Any] = [None, 0, 0]
+TRIGRAM_LENGTH = 3
+DELTA_TOKEN = re.compile(r'\S+\s*|\s+')
+DEFAULT_NOTEBOOK = 'memos'
+NOTEBOOK_NAME = re.compile(r'[\w-]+')
+NOTEBOOK_WORKERS = 4
+NO_TITLE = '## [Без заголовка]'
+NO_TEXT = '[Пустая заметка]'
+NO_TAG = '#no_tag'
+
+
+def set_working_dir() -> Path:
+    """Creates (in not exists) program's working directory.
+
+    Returns:
+        Path: PosixPath of working directory, e.g. `~/.memopad`.
+
+    """
+    home = Path.home()
+
+    working_dir = home.joinpath('.memopad')
+    working_dir.mkdir(parents=True, exist_ok=True)
+
+    return working_dir
+
+
+def set_db_path() -> Path:
+    """Creates (in not exists) a directory and set path to store DB.
+
+    Note:
+        Path may be set by config file (see `modules.dbconfig`), which
+        is loaded here for the whole session.
+
+    Returns:
+        Path: PosixPath of working directory.
+
+    Raises:
+        ValueError: If config file is not valid.
+
+    """
+    working_dir = set_working_dir()
+    config = load_config(working_dir)
+
+    db = f'{DEFAULT_NOTEBOOK}.db'
+    path = config.path or working_dir.joinpath(db)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    return path
+
+
+def check_db(path: Path) -> bool:
+    """Checks if DB of memos exists.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    Returns:
+        bool: bool: True if path exists and backup is file, False otherwise.
+
+    """
+    return path.exists() and path.is_file()
+
+
+def connect_db(
+    path: Path, factory: type[Connection] = Connection
+) -> Connection:
+    """Opens session's connection to DB and tunes it using PRAGMAs.
+
+    Note:
+        The session's connection is opened once (in `main`) and passed
+        to every command; prepared SQL-statements are cached by the connection
+        (up to `CACHED_STATEMENTS`), PRAGMAs are listed in `SQL_PRAGMAS`
+        and set by config file (see `modules.dbconfig.apply_config`).
+
+        The connection may be used by a thread reading memos ahead (see
+        `read_ahead`), but never by two threads at the same time.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+        factory (type[Connection]): class of connection, e.g.
+        `modules.profiler.ProfiledConnection` measuring SQL-queries.
+
+    Returns:
+        Connection: connection to database.
+
+    Raises:
+        DatabaseError: If file of DB is damaged (e.g. it is not a database),
+        the connection is closed.
+
+    """
+    connection = connect(
+        path,
+        factory=factory,
+        cached_statements=CACHED_STATEMENTS,
+        check_same_thread=False,
+    )
+    register_functions(connection)
+
+    try:
+        cursor = connection.cursor()
+        apply_config(connection, get_config())
+
+        for sql_pragma in SQL_PRAGMAS:
+            cursor.execute(sql_pragma)
+
+    except DatabaseError:
+        connection.close()
+        raise
+
+    return connection
+
+
+def set_notebook_path(path: Path, notebook: str) -> Path:
+    """Sets path of notebook (DB of memos next to the current one).
+
+    Args:
+        path (Path): PosixPath of DB (e.g. `~/.memopad/memos.db`).
+        notebook (str): name of notebook (letters, digits, `_` and `-`).
+
+    Returns:
+        Path: PosixPath of notebook, e.g. `~/.memopad/work.db`.
+
+    Raises:
+        ValueError: If name of notebook is not valid.
+
+    """
+    if not NOTEBOOK_NAME.fullmatch(notebook):
+        raise ValueError(notebook)
+
+    return path.with_name(f'{notebook}.db')
+
+
+def list_notebooks(path: Path) -> list[Path]:
+    """Lists notebooks (files `*.db` in directory of DB).
+
+    Args:
+        path (Path): PosixPath of DB (e.g. `~/.memopad/memos.db`).
+
+    Returns:
+        list[Path]: PosixPaths of notebooks ordered by name.
+
+    """
+    return sorted(file for file in path.parent.glob('*.db') if file.is_file())
+
+
+def connect_reader(path: Path) -> Connection:
+    """Opens read-only connection to existing DB (e.g. for search thread).
+
+    Args:
+        path (Path): PosixPath of DB.
+
+    Returns:
+        Connection: connection to database (SQL-functions of schema
+        are registered, settings of reading are taken from config file).
+
+    Raises:
+        DatabaseError: If DB does not exist.
+
+    """
+    connection = connect(f'{path.resolve().as_uri()}?mode=ro', uri=True)
+    register_functions(connection)
+    apply_config(connection, get_config(), reading_only=True)
+
+    return connection
+
+
+def search_notebooks(
+    paths: Iterable[Path], search: Callable[..., Any], *args: Any
+) -> tuple[list[tuple[str, tuple[str, ...]]], list[str]]:
+    """Searches memos in all notebooks in parallel and merges results by date.
+
+    Note:
+        Every notebook is searched by its own read-only connection
+        in thread pool (up to `NOTEBOOK_WORKERS` threads, SQLite does not
+        hold GIL while executing queries); session's cache of search results
+        is not used (see `cache_search`). Notebooks which can not be
+        searched (e.g. of older schema) are skipped.
+
+    Args:
+        paths (Iterable[Path]): PosixPaths of notebooks (see
+        `list_notebooks`).
+        search (Callable[..., Any]): search function, e.g.
+        `find_memos_by_text`.
+        *args (Any): arguments of search (without connection).
+
+    Returns:
+        tuple[list[tuple[str, tuple[str, ...]]], list[str]]: found memos
+        with names of their notebooks (ordered by date_time) and names
+        of skipped notebooks.
+
+    """
+    search = getattr(search, '__wrapped__', search)
+    paths = list(paths)
+
+    def search_notebook(path: Path) -> list[tuple[str, tuple[str, ...]]]:
+        connection = connect_reader(path)
+
+        try:
+            memos = search(connection, *args)
+        finally:
+            connection.close()
+
+        return sorted(((path.stem, memo) for memo in memos), key=memo_date)
+
+    results = []
+    skipped = []
+
+    with ThreadPoolExecutor(
+        max_workers=max(min(len(paths), NOTEBOOK_WORKERS), 1)
+    ) as executor:
+        futures = [executor.submit(search_notebook, path) for path in paths]
+
+        for path, future in zip(paths, futures):
+            try:
+                results.append(future.result())
+            except DatabaseError:
+                skipped.append(path.stem)
+
+    return list(heapq.merge(*results, key=memo_date)), skipped
+
+
+def memo_date(found: tuple[str, tuple[str, ...]]) -> str:
+    """Gets date_time of memo found in notebook (key of sorting).
+
+    Args:
+        found (tuple[str, tuple[str, ...]]): name of notebook and memo
+        (rowid, date_time, title, body and tag).
+
+    Returns:
+        str: date_time of memo.
+
+    """
+    return found[1][1]
+
+
+def rebuild_db(
+    connection: Connection, page_size: int, journal_mode: str
+) -> tuple[int, int]:
+    """Rebuilds file of DB with new size of pages (using `VACUUM`).
+
+    Note:
+        Size of pages of DB in WAL mode can not be changed, so DB
+        is switched to rollback journal for `VACUUM` and then to
+        `journal_mode`; other connections to DB have to be closed.
+
+    Args:
+        connection (Connection): connection to database.
+        page_size (int): new size of pages (power of two).
+        journal_mode (str): journal mode after rebuilding, e.g. `wal`.
+
+    Returns:
+        tuple[int, int]: previous and new size of pages.
+
+    Raises:
+        DatabaseError: If operation failed (e.g. DB is locked).
+
+    """
+    cursor = connection.cursor()
+
+    connection.commit()
+    cursor.execute('PRAGMA page_size;')
+    previous_page_size = cursor.fetchone()[0]
+
+    cursor.execute('PRAGMA journal_mode = DELETE;')
+
+    if cursor.fetchone()[0] != 'delete':
+        raise DatabaseError('journal mode is not changed (DB is locked)')
+
+    try:
+        cursor.execute(f'PRAGMA page_size = {page_size};')
+        cursor.execute('VACUUM;')
+    finally:
+        cursor.execute(f'PRAGMA journal_mode = {journal_mode};')
+
+    cursor.execute('PRAGMA page_size;')
+
+    return previous_page_size, cursor.fetchone()[0]
+
+
+def register_functions(connection: Connection) -> None:
+    """Registers SQL-functions used by schema (migrations and triggers).
+
+    Note:
+        `CASEFOLD(text)` normalizes tags, `MEMO_BODY(bodies, body_format)`
+        returns text of memo (decompressed if necessary), `MEMO_DELTA(...)`
+        makes delta of revision (see `make_delta`); every connection
+        changing table `memos` needs them.
+
+    Args:
+        connection (Connection): connection to database.
+
+    """
+    connection.create_function(
+        'CASEFOLD', 1, lambda x: x.casefold(), deterministic=True
+    )
+    connection.create_function('MEMO_BODY', 2, unpack_body, deterministic=True)
+    connection.create_function('MEMO_DELTA', 6, make_delta, deterministic=True)
+
+
+def pack_body(body: str) -> tuple[str | bytes, int]:
+    """Packs text of memo for storing (compresses long text by zlib).
+
+    Note:
+        Texts longer than `BODY_COMPRESSION_THRESHOLD` bytes are stored
+        as BLOB (format `BODY_ZLIB`) if it makes them shorter, others -
+        as TEXT (format `BODY_TEXT`).
+
+    Args:
+        body (str): text of memo.
+
+    Returns:
+        tuple[str | bytes, int]: stored text (or BLOB) and its format.
+
+    """
+    encoded = body.encode()
+
+    if len(encoded) > BODY_COMPRESSION_THRESHOLD:
+        compressed = zlib.compress(encoded)
+
+        if len(compressed) < len(encoded):
+            return compressed, BODY_ZLIB
+
+    return body, BODY_TEXT
+
+
+def unpack_body(body: str | bytes, body_format: int) -> str:
+    """Unpacks stored text of memo (SQL-function `MEMO_BODY`).
+
+    Args:
+        body (str | bytes): stored text (or BLOB) of memo.
+        body_format (int): `BODY_TEXT` or `BODY_ZLIB`.
+
+    Returns:
+        str: text of memo.
+
+    """
+    if body_format == BODY_ZLIB:
+        return zlib.decompress(body).decode()
+
+    return body
+
+
+def make_delta(
+    old_title: str,
+    old_body: str,
+    old_tags: str,
+    title: str,
+    body: str,
+    tags: str,
+) -> bytes:
+    """Makes delta of previous version of memo (SQL-function `MEMO_DELTA`).
+
+    Note:
+        Every element of previous version is described against the new one
+        by words (with following spaces): ranges `[start, end]` of words
+        kept from the new version and inserted text of previous version;
+        delta is JSON compressed by zlib.
+
+    Args:
+        old_title (str): title of previous version.
+        old_body (str): text of previous version.
+        old_tags (str): tag(s) of previous version.
+        title (str): new title of memo.
+        body (str): new text of memo.
+        tags (str): new tag(s) of memo.
+
+    Returns:
+        bytes: delta to restore previous version (see `undo_delta`).
+
+    """
+    delta = [
+        diff_text(old_text, text)
+        for old_text, text in (
+            (old_title, title),
+            (old_body, body),
+            (old_tags, tags),
+        )
+    ]
+
+    return zlib.compress(
+        json.dumps(delta, ensure_ascii=False, separators=(',', ':')).encode(),
+        9,
+    )
+
+
+def diff_text(old_text: str, text: str) -> list[list[int] | str]:
+    """Describes previous text against new one (by words).
+
+    Args:
+        old_text (str): previous text.
+        text (str): new text.
+
+    Returns:
+        list[list[int] | str]: ranges of words of new text and inserted
+        fragments of previous text.
+
+    """
+    words = DELTA_TOKEN.findall(text)
+
+    if old_text == text:
+        return [[0, len(words)]]
+
+    old_words = DELTA_TOKEN.findall(old_text)
+    matcher = SequenceMatcher(None, words, old_words)
+    operations: list[list[int] | str] = []
+
+    for operation, start, end, old_start, old_end in matcher.get_opcodes():
+        if operation == 'equal':
+            operations.append([start, end])
+        elif old_end > old_start:
+            operations.append(''.join(old_words[old_start:old_end]))
+
+    return operations
+
+
+def undo_delta(memo: tuple[str, ...], delta: bytes) -> tuple[str, ...]:
+    """Restores previous version of memo from its successor and delta.
+
+    Args:
+        memo (tuple[str, ...]): title, text and tag(s) of successor.
+        delta (bytes): delta of previous version (see `make_delta`).
+
+    Returns:
+        tuple[str, ...]: title, text and tag(s) of previous version.
+
+    """
+    operations = json.loads(zlib.decompress(delta))
+    restored = []
+
+    for text, text_operations in zip(memo, operations):
+        words = DELTA_TOKEN.findall(text)
+        restored.append(
+            ''.join(
+                ''.join(words[operation[0] : operation[1]])
+                if isinstance(operation, list)
+                else operation
+                for operation in text_operations
+            )
+        )
+
+    return tuple(restored)
+
+
+def compress_bodies(
+    connection: Connection, batch_size: int = 500
+) -> Iterator[tuple[int, int]]:
+    """Compresses long texts of existing memos by batches.
+
+    Note:
+        Every batch of memos (by ROWID) is updated and committed in its
+        own transaction, so DB is not locked for the whole conversion;
+        texts are compressed by `pack_body`.
+
+    Args:
+        connection (Connection): connection to database.
+        batch_size (int): a number of memos in a batch.
+
+    Yields:
+        tuple[int, int]: numbers of checked and compressed memos so far.
+
+    Raises:
+        DatabaseError: If operation failed (batch is rolled back).
+
+    """
+    cursor = connection.cursor()
+
+    sql_select_batch = """SELECT ROWID, bodies
+                               FROM memos
+                               WHERE ROWID > ? AND body_format = ?
+                               ORDER BY ROWID
+                               LIMIT ?;"""
+    sql_update_body = """UPDATE memos
+                              SET bodies = ?, body_format = ?
+                              WHERE ROWID = ?;"""
+    last_rowid = 0
+    checked = 0
+    compressed = 0
+
+    while True:
+        cursor.execute(sql_select_batch, (last_rowid, BODY_TEXT, batch_size))
+        batch = cursor.fetchall()
+
+        if not batch:
+            break
+
+        packed = [(*pack_body(body), rowid) for rowid, body in batch]
+        packed = [row for row in packed if row[1] == BODY_ZLIB]
+
+        try:
+            cursor.executemany(sql_update_body, packed)
+            connection.commit()
+
+        except DatabaseError:
+            connection.rollback()
+            raise
+
+        last_rowid = batch[-1][0]
+        checked += len(batch)
+        compressed += len(packed)
+
+        yield checked, compressed
+
+
+def migrate_db(connection: Connection) -> None:
+    """Creates table of memos and upgrades schema to the latest version.
+
+    Note:
+        Version of schema is stored in SQLite's `PRAGMA user_version`,
+        each script from `SQL_MIGRATIONS` is applied in its own transaction.
+
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    cursor = connection.cursor()
+
+    try:
+        cursor.execute(SQL_CREATE_TABLE)
+        connection.commit()
+
+        cursor.execute('PRAGMA user_version;')
+        version = cursor.fetchone()[0]
+
+        for number, sql_migration in enumerate(
+            SQL_MIGRATIONS[version:], start=version + 1
+        ):
+            cursor.executescript(
+                f'BEGIN; {sql_migration} PRAGMA user_version = {number}; '
+                + 'COMMIT;'
+            )
+
+    except DatabaseError:
+        connection.rollback()
+        raise
+
+
+def set_datetime() -> str:
+    """Sets date_time of new memo.
+
+    Returns:
+        str: date_time of memo generated by module `datetime`.
+
+    """
+    now = datetime.now()
+
+    return now.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def make_memo(
+    title: str, body: str, tags: str, date_time: str = ''
+) -> tuple[str, ...]:
+    """Makes new memo (as tuple) from plain title, text and tags.
+
+    Args:
+        title (str): title of memo (without Markdown's `##`).
+        body (str): text of memo.
+        tags (str): tag(s) of memo divided by spaces (without `#`).
+        date_time (str): date_time of memo; current time if empty.
+
+    Returns:
+        tuple[str, ...]: tuple contains memo's elements
+        (date_time, title, body and tag).
+
+    """
+    return (
+        date_time or set_datetime(),
+        format_title(title),
+        format_body(body),
+        format_tags(tags),
+    )
+
+
+def format_title(title: str) -> str:
+    """Formats title of memo as Markdown's header.
+
+    Args:
+        title (str): title entered by user.
+
+    Returns:
+        str: title of memo; default title `NO_TITLE` if title is empty.
+
+    """
+    title = title.strip()
+
+    return f'## {title}' if title else NO_TITLE
+
+
+def format_body(body: str) -> str:
+    """Formats text of memo.
+
+    Args:
+        body (str): text entered by user.
+
+    Returns:
+        str: text of memo; default text `NO_TEXT` if text is empty.
+
+    """
+    return body.strip() or NO_TEXT
+
+
+def format_tags(tags: str) -> str:
+    """Formats tag(s) of memo.
+
+    Args:
+        tags (str): tag(s) entered by user (divided by spaces).
+
+    Returns:
+        str: tag(s) of memo, e.g. `#a #b`; default tag `NO_TAG`
+        if tags are empty.
+
+    """
+    tags = ' '.join([f'#{tag.strip()}' for tag in tags.split(' ') if tag])
+
+    return tags or NO_TAG
+
+
+def insert_memo(connection: Connection, memo: tuple[str, ...]) -> int:
+    """Inserts new memo (with its tags) into DB using SQL-query.
+
+    Note:
+        Changes are committed by calling function.
+
+    Args:
+        connection (Connection): connection to database.
+        memo (tuple[str, ...]): tuple contains memo's elements
+        (date_time, title, body and tag).
+
+    Returns:
+        int: ROWID of inserted memo.
+
+    """
+    cursor = connection.cursor()
+
+    sql_add_memo = """INSERT INTO memos (date_time, titles, bodies,
+                                         body_format, tags)
+                           VALUES (?, ?, ?, ?, ?);"""
+    date_time, title, body, tags = memo
+    cursor.execute(sql_add_memo, (date_time, title, *pack_body(body), tags))
+    rowid = cursor.lastrowid
+    save_tags(connection, rowid, memo[3])
+
+    return rowid
+
+
+def update_memo(
+    connection: Connection,
+    rowid: int,
+    date_time: str,
+    title: Optional[str] = None,
+    body: Optional[str] = None,
+    tags: Optional[str] = None,
+) -> bool:
+    """Updates memo (date_time and given elements) in one transaction.
+
+    Note:
+        Memo is updated by primary key, its existence is checked by a number
+        of updated rows (nothing is changed if memo has been deleted).
+
+    Args:
+        connection (Connection): connection to database.
+        rowid (int): ROWID of memo.
+        date_time (str): date_time of editing.
+        title (Optional[str]): new title of memo, if any.
+        body (Optional[str]): new text of memo, if any.
+        tags (Optional[str]): new tag(s) of memo, if any.
+
+    Returns:
+        bool: True if memo is updated, False if memo does not exist.
+
+    Raises:
+        DatabaseError: If operation failed (transaction is rolled back).
+
+    """
+    cursor = connection.cursor()
+
+    columns = ['date_time = ?']
+    parameters: list[Any] = [date_time]
+
+    if title is not None:
+        columns.append('titles = ?')
+        parameters.append(title)
+    if body is not None:
+        columns.append('bodies = ?, body_format = ?')
+        parameters.extend(pack_body(body))
+    if tags is not None:
+        columns.append('tags = ?')
+        parameters.append(tags)
+
+    sql_update_memo = f"""UPDATE memos
+                               SET {', '.join(columns)}
+                               WHERE ROWID = ?;"""
+
+    try:
+        cursor.execute(sql_update_memo, (*parameters, rowid))
+
+        if cursor.rowcount == 0:
+            connection.rollback()
+            return False
+
+        if tags is not None:
+            save_tags(connection, rowid, tags)
+
+        connection.commit()
+
+    except DatabaseError:
+        connection.rollback()
+        raise
+
+    return True
+
+
+def delete_memo_by_rowid(connection: Connection, rowid: int) -> bool:
+    """Deletes memo by primary key (its tags are deleted by trigger).
+
+    Args:
+        connection (Connection): connection to database.
+        rowid (int): ROWID of memo.
+
+    Returns:
+        bool: True if memo is deleted, False if memo does not exist.
+
+    Raises:
+        DatabaseError: If operation failed (transaction is rolled back).
+
+    """
+    cursor = connection.cursor()
+
+    sql_delete_memo = """DELETE FROM memos
+                              WHERE ROWID = ?;"""
+
+    try:
+        cursor.execute(sql_delete_memo, (rowid,))
+        deleted = cursor.rowcount
+        connection.commit()
+
+    except DatabaseError:
+        connection.rollback()
+        raise
+
+    return deleted > 0
+
+
+def find_memo_by_rowid(
+    connection: Connection, rowid: int
+) -> tuple[str, ...] | None:
+    """Finds memo by its ROWID (primary key).
+
+    Args:
+        connection (Connection): connection to database.
+        rowid (int): ROWID of memo.
+
+    Returns:
+        tuple[str, ...] | None: memo (rowid, date_time, title, body and tag)
+        or None if memo not found.
+
+    """
+    cursor = connection.cursor()
+
+    sql_select_rowid = """SELECT ROWID, date_time, titles,
+                                 MEMO_BODY(bodies, body_format), tags
+                               FROM memos
+                               WHERE ROWID = ?;"""
+    cursor.execute(sql_select_rowid, (rowid,))
+
+    return cursor.fetchone()
+
+
+def find_revisions(
+    connection: Connection, rowid: int
+) -> list[tuple[str, ...]]:
+    """Finds previous versions of memo (restored from deltas).
+
+    Note:
+        Versions are restored from the current memo back to the first one,
+        every delta is applied to its successor (see `undo_delta`).
+
+    Args:
+        connection (Connection): connection to database.
+        rowid (int): ROWID of memo.
+
+    Returns:
+        list[tuple[str, ...]]: versions (number, date_time, title, body
+        and tag) from the first one; empty if memo has no versions.
+
+    """
+    cursor = connection.cursor()
+
+    sql_select_memo = """SELECT titles, MEMO_BODY(bodies, body_format), tags
+                              FROM memos
+                              WHERE ROWID = ?;"""
+    sql_select_revisions = """SELECT date_time, delta
+                                   FROM memo_revisions
+                                   WHERE memo_id = ?
+                                   ORDER BY id DESC;"""
+    cursor.execute(sql_select_memo, (rowid,))
+    memo = cursor.fetchone()
+
+    if memo is None:
+        return []
+
+    cursor.execute(sql_select_revisions, (rowid,))
+    versions = []
+
+    for date_time, delta in cursor.fetchall():
+        memo = undo_delta(memo, delta)
+        versions.append((date_time, *memo))
+
+    return [
+        (number, *version)
+        for number, version in enumerate(reversed(versions), start=1)
+    ]
+
+
+def find_last_memos(
+    connection: Connection, limit: int
+) -> list[tuple[str, ...]]:
+    """Finds last memos (by order of creation).
+
+    Args:
+        connection (Connection): connection to database.
+        limit (int): a number of memos.
+
+    Returns:
+        list[tuple[str, ...]]: memos (rowid, date_time, title, body and tag)
+        from the latest one.
+
+    """
+    cursor = connection.cursor()
+
+    sql_select_last = """SELECT ROWID, date_time, titles,
+                                MEMO_BODY(bodies, body_format), tags
+                             FROM memos
+                             ORDER BY ROWID DESC
+                             LIMIT ?;"""
+    cursor.execute(sql_select_last, (limit,))
+
+    return cursor.fetchall()
+
+
+def count_total(connection: Connection) -> int:
+    """Counts memos in DB.
+
+    Note:
+        The total is read from table `memos_stats` (maintained by triggers);
+        if the table is empty, memos are counted by aggregate `COUNT(*)`.
+
+    Args:
+        connection (Connection): connection to database.
+
+    Returns:
+        int: a number of existing memos in database.
+
+    """
+    cursor = connection.cursor()
+
+    sql_select_total = """SELECT total FROM memos_stats WHERE id = 1;"""
+    sql_count = """SELECT COUNT(*) FROM memos;"""
+
+    cursor.execute(sql_select_total)
+    stats = cursor.fetchone()
+
+    if stats:
+        return stats[0]
+
+    cursor.execute(sql_count)
+
+    return cursor.fetchone()[0]
+
+
+def iter_memo_pages(
+    connection: Connection, page_size: int = PAGE_SIZE
+) -> Iterator[list[tuple[str, ...]]]:
+    """Reads all memos by pages using keyset pagination.
+
+    Note:
+        Every page is read by its own indexed query (`ROWID > last ROWID`),
+        so no read transaction is left open while user views a page.
+
+    Args:
+        connection (Connection): connection to database.
+        page_size (int): a number of memos on a page.
+
+    Yields:
+        list[tuple[str, ...]]: page of memos (rowid, date_time, title, body
+        and tag) ordered by rowid.
+
+    """
+    cursor = connection.cursor()
+
+    sql_select_page = """SELECT ROWID, date_time, titles,
+                                MEMO_BODY(bodies, body_format), tags
+                              FROM memos
+                              WHERE ROWID > ?
+                              ORDER BY ROWID
+                              LIMIT ?;"""
+    last_rowid = 0
+
+    while True:
+        cursor.execute(sql_select_page, (last_rowid, page_size))
+        page = cursor.fetchall()
+
+        if not page:
+            break
+
+        yield page
+
+        last_rowid = page[-1][0]
+
+
+def read_ahead(items: Iterable[Any], size: int = 1) -> Iterator[Any]:
+    """Reads items (e.g. pages of memos) in a thread ahead of consumer.
+
+    Note:
+        The reader thread keeps up to `size` items in queue, so the next
+        page is read from DB while the current one is printed. While
+        the generator runs, the connection is used by the reader only;
+        when the generator is closed, the reader is stopped and joined.
+
+    Args:
+        items (Iterable[Any]): items to read, e.g. `iter_memo_pages(...)`.
+        size (int): a number of items read ahead.
+
+    Yields:
+        Any: items in order of reading.
+
+    Raises:
+        DatabaseError: If reading failed (raised in consumer's thread).
+
+    """
+    queue: Queue[tuple[bool, Any]] = Queue(maxsize=size)
+    stop = Event()
+
+    def read() -> None:
+        try:
+            for item in items:
+                queue.put((False, item))
+
+                if stop.is_set():
+                    return
+
+            queue.put((True, None))
+        except Exception as error:  # raised again in consumer's thread
+            queue.put((True, error))
+
+    reader = Thread(target=read, name='memopad-reader', daemon=True)
+    reader.start()
+
+    try:
+        while True:
+            is_last, item = queue.get()
+
+            if is_last:
+                if item is not None:
+                    raise item
+
+                return
+
+            yield item
+    finally:
+        stop.set()
+
+        while reader.is_alive():
+            try:
+                queue.get(timeout=0.05)
+            except Empty:
+                pass
+
+        reader.join()
+
+
+def iter_memos(
+    connection: Connection, start: str = '', end: str = '', tag_query: str = ''
+) -> Iterator[tuple[str, ...]]:
+    """Reads memos one by one from cursor (filtered by period and tags).
+
+    Note:
+        Rows are streamed by SQLite's cursor, so memory does not depend
+        on a number of memos; memos of period are read in order of index
+        of `date_time`, otherwise - in order of ROWID.
+
+    Args:
+        connection (Connection): connection to database.
+        start (str): first day of period (see `parse_date_range`), if any.
+        end (str): day after the last day of period, if any.
+        tag_query (str): tag(s) of memos (see `make_tag_query`), if any.
+
+    Yields:
+        tuple[str, ...]: memo (rowid, date_time, title, body and tag).
+
+    """
+    cursor = connection.cursor()
+
+    conditions = []
+    parameters = []
+
+    if start:
+        conditions.append('date_time >= ?')
+        parameters.append(start)
+    if end:
+        conditions.append('date_time < ?')
+        parameters.append(end)
+    if tag_query:
+        sql_tag_query, tags = make_tag_query(tag_query)
+
+        if not tags:
+            return
+
+        conditions.append(f'ROWID IN ({sql_tag_query})')
+        parameters.extend(tags)
+
+    sql_where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    sql_order = 'date_time' if start or end else 'ROWID'
+    sql_select_memos = f"""SELECT ROWID, date_time, titles,
+                                  MEMO_BODY(bodies, body_format), tags
+                               FROM memos
+                               {sql_where}
+                               ORDER BY {sql_order};"""
+
+    yield from cursor.execute(sql_select_memos, parameters)
+
+
+def check_search_cache(connection: Connection) -> None:
+    """Clears cache of search results if DB has been changed.
+
+    Note:
+        Changes committed by other connections (e.g. batch mode) are
+        detected by `PRAGMA data_version`, changes of the connection itself -
+        by its counter `total_changes`; cache is also cleared for another
+        connection (e.g. after `restore-db`).
+
+    Args:
+        connection (Connection): connection to database.
+
+    """
+    cursor = connection.cursor()
+
+    sql_data_version = """PRAGMA data_version;"""
+    cursor.execute(sql_data_version)
+    state = [connection, cursor.fetchone()[0], connection.total_changes]
+
+    if SEARCH_CACHE_STATE != state:
+        SEARCH_CACHE.clear()
+        SEARCH_CACHE_STATE[:] = state
+
+
+def cache_search(
+    make_key: Callable[..., Hashable]
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorates search function to keep its results in LRU-cache.
+
+    Note:
+        Results are cached by name of function and normalized query
+        (up to `SEARCH_CACHE_SIZE` queries and `SEARCH_CACHE_ROWS` memos
+        in all), so repeated search takes no time until DB is changed
+        (see `check_search_cache`); decorated function keeps the original
+        one (`__wrapped__`) searching without cache (e.g. in threads).
+
+    Args:
+        make_key (Callable[..., Hashable]): function normalizing arguments
+        of search (without connection) to key of cache.
+
+    Returns:
+        Callable[[Callable[..., Any]], Callable[..., Any]]: decorator.
+
+    """
+
+    def decorate(function: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(function)
+        def wrapper(connection: Connection, *args: Any) -> Any:
+            check_search_cache(connection)
+            key = (function.__name__, make_key(*args))
+            memos = SEARCH_CACHE.get(key)
+
+            if memos is None:
+                memos = function(connection, *args)
+
+                if len(memos) <= SEARCH_CACHE_ROWS:
+                    SEARCH_CACHE[key] = memos
+
+                while len(SEARCH_CACHE) > SEARCH_CACHE_SIZE or sum(
+                    map(len, SEARCH_CACHE.values())
+                ) > SEARCH_CACHE_ROWS:
+                    SEARCH_CACHE.popitem(last=False)
+            else:
+                SEARCH_CACHE.move_to_end(key)
+
+            return memos
+
+        return wrapper
+
+    return decorate
+
+
+@cache_search(lambda start, end: (start, end))
+def find_memos_by_date(
+    connection: Connection, start: str, end: str
+) -> list[tuple[str, ...]]:
+    """Finds memos created (edited) in period using index of `date_time`.
+
+    Args:
+        connection (Connection): connection to database.
+        start (str): first day of period (in format '%Y-%m-%d').
+        end (str): day after the last day of period (in format '%Y-%m-%d').
+
+    Returns:
+        list[tuple[str, ...]]: found memos (rowid, date_time, title, body
+        and tag) ordered by date_time.
+
+    """
+    cursor = connection.cursor()
+
+    sql_select_date = """SELECT ROWID, date_time, titles,
+                                MEMO_BODY(bodies, body_format), tags
+                              FROM memos
+                              WHERE date_time >= ? AND date_time < ?
+                              ORDER BY date_time;"""
+    cursor.execute(sql_select_date, (start, end))
+
+    return cursor.fetchall()
+
+
+def parse_date_range(date: str) -> tuple[str, str]:
+    """Parses user's date or period to half-open range of days.
+
+    Args:
+        date (str): a day (`2022-10-01`), a month (`2022-10`), a quarter
+        (`2022-Q4`), a year (`2022`) or a range of them (`2022-07..2022-09`,
+        `2022..`, `..2022-06`).
+
+    Returns:
+        tuple[str, str]: first day and the day after the last day of period
+        (in format '%Y-%m-%d').
+
+    Raises:
+        ValueError: If date or period is not valid.
+
+    """
+    first, separator, last = date.partition('..')
+
+    if not separator:
+        last = first
+
+    start = parse_period(first)[0] if first.strip() else date_type.min
+    end = parse_period(last)[1] if last.strip() else date_type.max
+
+    if not separator and not first.strip() or start >= end:
+        raise ValueError
+
+    return start.isoformat(), end.isoformat()
+
+
+def parse_period(period: str) -> tuple[date_type, date_type]:
+    """Parses a day, a month, a quarter or a year to half-open range.
+
+    Args:
+        period (str): `ГГГГ-ММ-ДД`, `ГГГГ-ММ`, `ГГГГ-Q1`...`ГГГГ-Q4`, `ГГГГ`.
+
+    Returns:
+        tuple[date, date]: first day and the day after the last day.
+
+    Raises:
+        ValueError: If period is not valid or its end is out of range
+        of dates (the last day of 9999 year and later).
+
+    """
+    period = period.strip().upper()
+
+    if re.fullmatch(r'\d{4}', period):
+        year = int(period)
+
+        return date_type(year, 1, 1), date_type(year + 1, 1, 1)
+
+    if re.fullmatch(r'\d{4}-Q[1-4]', period):
+        year, quarter = int(period[:4]), int(period[-1])
+        start = date_type(year, 3 * quarter - 2, 1)
+
+        return start, add_months(start, 3)
+
+    if re.fullmatch(r'\d{4}-\d{2}', period):
+        start = datetime.strptime(period, '%Y-%m').date()
+
+        return start, add_months(start, 1)
+
+    if re.fullmatch(r'\d{4}-\d{2}-\d{2}', period):
+        start = datetime.strptime(period, '%Y-%m-%d').date()
+
+        try:
+            return start, start + timedelta(days=1)
+
+        except OverflowError as error:
+            raise ValueError(f'period `{period}` is out of range') from error
+
+    raise ValueError
+
+
+def add_months(first_day: date_type, months: int) -> date_type:
+    """Returns the first day of month shifted by a number of months.
+
+    Args:
+        first_day (date): the first day of month.
+        months (int): a number of months to add.
+
+    Returns:
+        date: the first day of shifted month.
+
+    """
+    month_index = first_day.year * 12 + first_day.month - 1 + months
+
+    return date_type(month_index // 12, month_index % 12 + 1, 1)
+
+
+@cache_search(lambda title: make_fts_query(title))
+def find_memos_by_title(
+    connection: Connection, title: str
+) -> list[tuple[str, ...]]:
+    """Finds memos by words of title using FTS5-query.
+
+    Note:
+        Memos are returned as stored (e.g. for batch mode or export);
+        highlighted matches are shown by `iter_snippet_pages`.
+
+    Args:
+        connection (Connection): connection to database.
+        title (str): words (or beginnings of words) of title to search.
+
+    Returns:
+        list[tuple[str, ...]]: found memos (rowid, date_time, title, body
+        and tag) ordered by relevance; empty if no words are given.
+
+    """
+    cursor = connection.cursor()
+
+    sql_match_title = """SELECT memos.ROWID, memos.date_time, memos.titles,
+                                MEMO_BODY(memos.bodies, memos.body_format),
+                                memos.tags
+                             FROM memos_fts
+                             JOIN memos ON memos.ROWID = memos_fts.rowid
+                             WHERE memos_fts MATCH ?
+                             ORDER BY rank;"""
+    fts_query = make_fts_query(title)
+
+    if not fts_query:
+        return []
+
+    cursor.execute(sql_match_title, (f'titles : ({fts_query})',))
+
+    return cursor.fetchall()
+
+
+@cache_search(lambda text: make_fts_query(text))
+def find_memos_by_text(
+    connection: Connection, text: str
+) -> list[tuple[str, ...]]:
+    """Finds memos by words of text using FTS5-query.
+
+    Note:
+        Memos are returned as stored (e.g. for batch mode or export);
+        highlighted matches are shown by `iter_snippet_pages`.
+
+    Args:
+        connection (Connection): connection to database.
+        text (str): words (or beginnings of words) of text to search.
+
+    Returns:
+        list[tuple[str, ...]]: found memos (rowid, date_time, title, body
+        and tag) ordered by relevance; empty if no words are given.
+
+    """
+    cursor = connection.cursor()
+
+    sql_match_text = """SELECT memos.ROWID, memos.date_time, memos.titles,
+                               MEMO_BODY(memos.bodies, memos.body_format),
+                               memos.tags
+                            FROM memos_fts
+                            JOIN memos ON memos.ROWID = memos_fts.rowid
+                            WHERE memos_fts MATCH ?
+                            ORDER BY rank;"""
+    fts_query = make_fts_query(text)
+
+    if not fts_query:
+        return []
+
+    cursor.execute(sql_match_text, (f'bodies : ({fts_query})',))
+
+    return cursor.fetchall()
+
+
+def iter_snippet_pages(
+    connection: Connection,
+    column: str,
+    words: str,
+    page_size: int = PAGE_SIZE,
+) -> Iterator[list[tuple[str, ...]]]:
+    """Finds memos by words of title or text (FTS5-query) page by page.
+
+    Note:
+        Memos are ranked by relevance (`rank` of FTS5 - BM25) and read
+        by pages (`LIMIT`/`OFFSET`), so matches are highlighted and text
+        is shortened to a snippet only for memos of read pages, not for
+        every found memo.
+
+    Args:
+        connection (Connection): connection to database.
+        column (str): column of FTS5-index - `titles` or `bodies`.
+        words (str): words (or beginnings of words) to search.
+        page_size (int): a number of memos on a page.
+
+    Yields:
+        list[tuple[str, ...]]: page of found memos (rowid, date_time,
+        title, snippet of text and tag) with highlighted matches; nothing
+        if no words are given.
+
+    """
+    cursor = connection.cursor()
+
+    sql_match_page = """SELECT memos.ROWID, memos.date_time,
+                               highlight(memos_fts, 0, '**', '**'),
+                               snippet(memos_fts, 1, '**', '**', '…', 32),
+                               memos.tags
+                            FROM memos_fts
+                            JOIN memos ON memos.ROWID = memos_fts.rowid
+                            WHERE memos_fts MATCH ?
+                            ORDER BY rank
+                            LIMIT ? OFFSET ?;"""
+    fts_query = make_fts_query(words)
+
+    if not fts_query:
+        return
+
+    query = f'{column} : ({fts_query})'
+    offset = 0
+
+    while True:
+        cursor.execute(sql_match_page, (query, page_size, offset))
+        page = cursor.fetchall()
+
+        if not page:
+            break
+
+        yield page
+
+        offset += len(page)
+
+
+def make_fts_query(text: str) -> str:
+    """Makes FTS5-query from user's input.
+
+    Note:
+        Every word of input is quoted (so FTS5 operators and punctuation
+        in user's input are treated as plain text) and searched as a prefix,
+        all words have to be found in memo.
+
+    Args:
+        text (str): user's input (words or beginnings of words).
+
+    Returns:
+        str: FTS5-query, e.g. `"word"* AND "another"*`.
+
+    """
+    words = [word.replace('"', '""') for word in text.split()]
+
+    return ' AND '.join([f'"{word}"*' for word in words])
+
+
+@cache_search(lambda fragment: fragment.casefold())
+def find_memos_by_substring(
+    connection: Connection, fragment: str
+) -> list[tuple[str, ...]]:
+    """Finds memos containing fragment in title, text or tags.
+
+    Note:
+        Fragment is any part of text (e.g. a part of word in its middle),
+        the search is case-insensitive. Fragments of `TRIGRAM_LENGTH`
+        characters and longer are searched by trigram index (FTS5-phrase),
+        shorter ones - by scan of all memos.
+
+    Args:
+        connection (Connection): connection to database.
+        fragment (str): fragment of title, text or tags to search.
+
+    Returns:
+        list[tuple[str, ...]]: found memos (rowid, date_time, title, body
+        and tag) ordered by rowid.
+
+    """
+    cursor = connection.cursor()
+
+    fragment = fragment.casefold()
+
+    sql_match_trigram = """SELECT ROWID, date_time, titles,
+                                  MEMO_BODY(bodies, body_format), tags
+                               FROM memos
+                               WHERE ROWID IN (
+                                   SELECT rowid FROM memos_trigram
+                                       WHERE memos_trigram MATCH ?
+                               )
+                               ORDER BY ROWID;"""
+    sql_scan_memos = """SELECT ROWID, date_time, titles,
+                               MEMO_BODY(bodies, body_format), tags
+                            FROM memos
+                            WHERE instr(CASEFOLD(titles), ?)
+                               OR instr(CASEFOLD(tags), ?)
+                               OR instr(CASEFOLD(MEMO_BODY(bodies,
+                                                           body_format)), ?)
+                            ORDER BY ROWID;"""
+
+    if len(fragment) >= TRIGRAM_LENGTH:
+        phrase = fragment.replace('"', '""')
+        cursor.execute(sql_match_trigram, (f'"{phrase}"',))
+    else:
+        cursor.execute(sql_scan_memos, (fragment,) * 3)
+
+    return cursor.fetchall()
+
+
+@cache_search(lambda query: make_tag_query(query))
+def find_memos_by_tag(
+    connection: Connection, query: str
+) -> list[tuple[str, ...]]:
+    """Finds memos by tags using index of table `memo_tags`.
+
+    Args:
+        connection (Connection): connection to database.
+        query (str): tag(s) to search (see `make_tag_query`).
+
+    Returns:
+        list[tuple[str, ...]]: found memos (rowid, date_time, title, body
+        and tag) ordered by rowid.
+
+    """
+    cursor = connection.cursor()
+
+    sql_tag_query, tags = make_tag_query(query)
+
+    if not tags:
+        return []
+
+    sql_select_tag = f"""SELECT ROWID, date_time, titles,
+                                MEMO_BODY(bodies, body_format), tags
+                              FROM memos
+                              WHERE ROWID IN ({sql_tag_query})
+                              ORDER BY ROWID;"""
+    cursor.execute(sql_select_tag, tags)
+
+    return cursor.fetchall()
+
+
+def make_tag_query(query: str) -> tuple[str, tuple[str, ...]]:
+    """Makes SQL-subquery selecting ROWIDs of memos by tags.
+
+    Note:
+        Query is divided by `|` to groups of tags combined by `UNION`
+        (any group), tags of group divided by spaces are combined by
+        `INTERSECT` (all tags), e.g. `a b | c` selects memos having both
+        `a` and `b` or having `c`. Tag ending with `*` is searched as
+        a beginning of tag by range of index.
+
+    Args:
+        query (str): user's input, e.g. `work`, `proj*`, `a b`, `a | b`.
+
+    Returns:
+        tuple[str, tuple[str, ...]]: SQL-subquery and its parameters.
+
+    """
+    sql_exact = 'SELECT memo_id FROM memo_tags WHERE tag = ?'
+    sql_prefix = 'SELECT memo_id FROM memo_tags WHERE tag >= ? AND tag < ?'
+
+    groups = []
+    tags = []
+
+    for group in query.split('|'):
+        subqueries = []
+
+        for tag in group.split():
+            tag = tag.lstrip('#').casefold()
+
+            if tag.endswith('*'):
+                prefix = tag.rstrip('*')
+
+                if not prefix:
+                    continue
+
+                subqueries.append(sql_prefix)
+                tags.extend([prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)])
+            elif tag:
+                subqueries.append(sql_exact)
+                tags.append(tag)
+
+        if subqueries:
+            groups.append(' INTERSECT '.join(subqueries))
+
+    if len(groups) > 1:
+        # Compound SELECT has no parentheses, so groups are subqueries
+        groups = [f'SELECT memo_id FROM ({group})' for group in groups]
+
+    return ' UNION '.join(groups), tuple(tags)
+
+
+def save_tags(connection: Connection, rowid: int, tags: str) -> None:
+    """Saves tags of memo to table `memo_tags` (replacing previous ones).
+
+    Note:
+        Changes are committed by calling function.
+
+    Args:
+        connection (Connection): connection to database.
+        rowid (int): ROWID of memo.
+        tags (str): tag(s) of memo divided by spaces, e.g. `#a #b`.
+
+    """
+    cursor = connection.cursor()
+
+    sql_delete_tags = """DELETE FROM memo_tags WHERE memo_id = ?;"""
+    sql_insert_tag = """INSERT OR IGNORE INTO memo_tags (tag, memo_id)
+                             VALUES (?, ?);"""
+
+    cursor.execute(sql_delete_tags, (rowid,))
+    cursor.executemany(
+        sql_insert_tag, [(tag, rowid) for tag in split_tags(tags)]
+    )
+
+
+def split_tags(tags: str) -> list[str]:
+    """Splits tags of memo to normalized tags.
+
+    Args:
+        tags (str): tag(s) of memo divided by spaces, e.g. `#Work #idea`.
+
+    Returns:
+        list[str]: casefolded tags without `#`, e.g. `['work', 'idea']`.
+
+    """
+    normalized_tags = [tag.lstrip('#').casefold() for tag in tags.split()]
+
+    return list(dict.fromkeys([tag for tag in normalized_tags if tag]))
@@ -0,0 +1,256 @@
+"""Measures SQL-queries and rendering of session's commands (without UI)."""
+import json
+import math
+from collections import deque
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from sqlite3 import Connection, Cursor
+from time import perf_counter
+from typing import Any, Callable
+
+SAMPLES_LIMIT = 10000
+STATS_LOG = 'stats.jsonl'
+STAGES: list[str] = ['sql', 'render']
+SESSION_START = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+SESSION_SAMPLES: dict[tuple[str, str], deque[list[float]]] = {}
+SESSION_COMMAND = ['session']
+
+
+def start_sample(stage: str) -> list[float]:
+    """Starts sample of stage of the current command.
+
+    Note:
+        Sample is a list `[seconds, rows]` updated by the caller; every
+        command keeps up to `SAMPLES_LIMIT` last samples of each stage.
+
+    Args:
+        stage (str): one of `STAGES`.
+
+    Returns:
+        list[float]: new sample (`[0.0, 0]`).
+
+    """
+    key = (SESSION_COMMAND[0], stage)
+    sample = [0.0, 0]
+
+    if key not in SESSION_SAMPLES:
+        SESSION_SAMPLES[key] = deque(maxlen=SAMPLES_LIMIT)
+
+    SESSION_SAMPLES[key].append(sample)
+
+    return sample
+
+
+def set_command(command: str) -> None:
+    """Sets command to which next queries and rendering are attributed.
+
+    Args:
+        command (str): full name of command, e.g. `view-all`.
+
+    """
+    SESSION_COMMAND[0] = command
+
+
+def profile_render(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorates function printing to terminal (one sample per call).
+
+    Args:
+        function (Callable[..., Any]): function of `modules.mdprinter`.
+
+    Returns:
+        Callable[..., Any]: function recording its time to stage `render`.
+
+    """
+
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        sample = start_sample('render')
+        start = perf_counter()
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            sample[0] += perf_counter() - start
+
+    return wrapper
+
+
+class ProfiledCursor(Cursor):
+    """Cursor recording every SQL-query (with its fetches) as sample."""
+
+    def __init__(self, connection: Connection) -> None:
+        """Opens cursor (sample is started by the first SQL-query)."""
+        super().__init__(connection)
+        self.sample = [0.0, 0]
+
+    def execute(self, sql: str, parameters: Any = ()) -> Cursor:
+        """Executes SQL-query, starts its sample (see `Cursor.execute`)."""
+        self.sample = start_sample('sql')
+        start = perf_counter()
+
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.sample[0] += perf_counter() - start
+            self.sample[1] += max(self.rowcount, 0)
+
+    def executemany(self, sql: str, parameters: Any) -> Cursor:
+        """Executes SQL-query for all parameters as one sample."""
+        self.sample = start_sample('sql')
+        start = perf_counter()
+
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            self.sample[0] += perf_counter() - start
+            self.sample[1] += max(self.rowcount, 0)
+
+    def executescript(self, sql_script: str) -> Cursor:
+        """Executes SQL-script as one sample."""
+        self.sample = start_sample('sql')
+        start = perf_counter()
+
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self.sample[0] += perf_counter() - start
+
+    def fetchone(self) -> Any:
+        """Fetches next row, adds its time to sample of query."""
+        start = perf_counter()
+        row = super().fetchone()
+        self.sample[0] += perf_counter() - start
+        self.sample[1] += row is not None
+
+        return row
+
+    def fetchmany(self, size: int = 1) -> list[Any]:
+        """Fetches rows, adds their time to sample of query."""
+        start = perf_counter()
+        rows = super().fetchmany(size)
+        self.sample[0] += perf_counter() - start
+        self.sample[1] += len(rows)
+
+        return rows
+
+    def fetchall(self) -> list[Any]:
+        """Fetches all rows, adds their time to sample of query."""
+        start = perf_counter()
+        rows = super().fetchall()
+        self.sample[0] += perf_counter() - start
+        self.sample[1] += len(rows)
+
+        return rows
+
+    def __next__(self) -> Any:
+        """Fetches next row while cursor is iterated."""
+        start = perf_counter()
+
+        try:
+            row = super().__next__()
+        finally:
+            self.sample[0] += perf_counter() - start
+
+        self.sample[1] += 1
+
+        return row
+
+
+class ProfiledConnection(Connection):
+    """Connection creating `ProfiledCursor` (see `connect_db`)."""
+
+    def cursor(self, factory: Any = ProfiledCursor) -> Cursor:
+        """Opens cursor recording SQL-queries."""
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()) -> Cursor:
+        """Executes SQL-query by new `ProfiledCursor`."""
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters: Any) -> Cursor:
+        """Executes SQL-query for all parameters by new `ProfiledCursor`."""
+        return self.cursor().executemany(sql, parameters)
+
+    def executescript(self, sql_script: str) -> Cursor:
+        """Executes SQL-script by new `ProfiledCursor`."""
+        return self.cursor().executescript(sql_script)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Finds percentile of values by nearest rank.
+
+    Args:
+        values (list[float]): sorted values.
+        fraction (float): fraction of values, e.g. 0.95.
+
+    Returns:
+        float: value which the fraction of values does not exceed.
+
+    """
+    rank = max(math.ceil(fraction * len(values)), 1)
+
+    return values[min(rank, len(values)) - 1]
+
+
+def summarize_session() -> list[dict[str, Any]]:
+    """Summarizes samples of session by commands and stages.
+
+    Returns:
+        list[dict[str, Any]]: statistics ordered by commands: `command`,
+        `stage`, `calls`, `rows` and `p50_ms`, `p95_ms`, `max_ms`.
+
+    """
+    summary = []
+
+    for (command, stage), samples in sorted(
+        SESSION_SAMPLES.items(),
+        key=lambda item: (item[0][0], STAGES.index(item[0][1])),
+    ):
+        timings = sorted(sample[0] * 1000 for sample in samples)
+        summary.append(
+            {
+                'command': command,
+                'stage': stage,
+                'calls': len(timings),
+                'rows': int(sum(sample[1] for sample in samples)),
+                'p50_ms': round(percentile(timings, 0.5), 3),
+                'p95_ms': round(percentile(timings, 0.95), 3),
+                'max_ms': round(timings[-1], 3),
+            }
+        )
+
+    return summary
+
+
+def set_stats_path(path: Path) -> Path:
+    """Sets path of log of statistics (near DB).
+
+    Args:
+        path (Path): PosixPath of DB.
+
+    Returns:
+        Path: PosixPath of log, e.g. `~/.memopad/stats.jsonl`.
+
+    """
+    return path.parent.joinpath(STATS_LOG)
+
+
+def append_stats(path: Path, summary: list[dict[str, Any]]) -> None:
+    """Appends statistics of session to log (one JSON-object per line).
+
+    Args:
+        path (Path): PosixPath of log (see `set_stats_path`).
+        summary (list[dict[str, Any]]): statistics (see
+        `summarize_session`).
+
+    Raises:
+        OSError: If log can not be written.
+
+    """
+    logged = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    with path.open('a', encoding='utf-8') as file:
+        for stats in summary:
+            record = {'session': SESSION_START, 'date_time': logged, **stats}
+            file.write(json.dumps(record, ensure_ascii=False) + '\n')
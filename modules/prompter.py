@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Uses custom editable prompt from module `prompt-toolkit`."""
+from typing import Optional
+
 from prompt_toolkit import prompt
-from prompt_toolkit.clipboard.pyperclip import PyperclipClipboard
 from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.formatted_text import ANSI
 
@@ -22,6 +23,10 @@ COMMANDS: list[str] = [
     '-c',
     'add',
     '-a',
+    'import',
+    '-i',
+    'export',
+    '-x',
     'edit',
     '-e',
     'edit-title',
@@ -30,6 +35,14 @@ COMMANDS: list[str] = [
     '-ex',
     'edit-tag',
     '-eg',
+    'history',
+    '-hs',
+    'history-list',
+    '-hl',
+    'history-view',
+    '-hv',
+    'history-restore',
+    '-hr',
     'del',
     '-d',
     'del-memo',
@@ -48,6 +61,10 @@ COMMANDS: list[str] = [
     '-sx',
     'search-tag',
     '-sg',
+    'search-part',
+    '-sp',
+    'search-all',
+    '-sa',
     'howto',
     '-w',
     'howto-md',
@@ -62,10 +79,16 @@ COMMANDS: list[str] = [
     '-od',
     'check-db',
     '-kd',
+    'tune-db',
+    '-td',
     'recreate-db',
     '-ed',
     'clear',
     '-r',
+    'stats',
+    '-t',
+    'use',
+    '-u',
     'quit',
     '-q',
 ]
@@ -110,6 +133,22 @@ def check_command() -> str:
     return command
 
 
+def get_command_name(command: str) -> str:
+    """Gets full name of command by its short name.
+
+    Args:
+        command (str): valid command, e.g. `-va`.
+
+    Returns:
+        str: full name of command, e.g. `view-all`.
+
+    """
+    if command.startswith('-'):
+        return COMMANDS[COMMANDS.index(command) - 1]
+
+    return command
+
+
 def confirm_command() -> str:
     """Confirms or cancel operations with database.
 
@@ -154,6 +193,28 @@ def check_confirmation() -> str:
     return confirmation
 
 
+def get_page_command() -> str:
+    """Prompts to show next page of memos or to quit.
+
+    Returns:
+        str: user's input - empty string (`ENTER`) to show next page,
+        `q` to quit.
+
+    """
+    page_command = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mENTER\033[0m'
+            '\033[32;1m - далее, \033[0m'
+            '\033[34;1mq\033[0m'
+            '\033[32;1m - выход\033[0m'
+            '\033[31;1m)\033[0m '
+        )
+    )
+
+    return page_command
+
+
 def get_rowid() -> int:
     """Enters user's choice to choose memo's ROWID.
 
@@ -188,6 +249,50 @@ def get_rowid() -> int:
         return rowid
 
 
+def get_generation() -> Optional[int]:
+    """Enters number of backup's generation.
+
+    Returns:
+        Optional[int]: number of generation entered by user (0 if it is
+        not a number); None if input is empty.
+
+    """
+    generation = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mпоколение\033[0m'
+            '\033[31;1m)\033[0m '
+        )
+    ).strip()
+
+    if not generation:
+        return None
+
+    return int(generation) if generation.isdigit() else 0
+
+
+def get_version() -> Optional[int]:
+    """Enters number of memo's previous version.
+
+    Returns:
+        Optional[int]: number of version entered by user (0 if it is
+        not a number); None if input is empty.
+
+    """
+    version = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mверсия\033[0m'
+            '\033[31;1m)\033[0m '
+        )
+    ).strip()
+
+    if not version:
+        return None
+
+    return int(version) if version.isdigit() else 0
+
+
 def get_new_title() -> str:
     """Prompts to enter title for new memo.
 
@@ -231,6 +336,8 @@ def get_title_to_edit() -> str:
         str: user's input - new or corrected title for existing memo.
 
     """
+    from prompt_toolkit.clipboard.pyperclip import PyperclipClipboard
+
     title_to_edit = prompt(
         ANSI('\033[32;1m##\033[0m '), clipboard=PyperclipClipboard()
     )
@@ -245,6 +352,8 @@ def get_text_to_edit() -> str:
         str: user's input - new or corrected text for existing memo.
 
     """
+    from prompt_toolkit.clipboard.pyperclip import PyperclipClipboard
+
     text_to_edit = prompt(
         ANSI('\033[32;1mТекст\033[0m '),
         multiline=True,
@@ -261,6 +370,8 @@ def get_tag_to_edit() -> str:
         str: user's input - new or corrected tag(s) for existing memo.
 
     """
+    from prompt_toolkit.clipboard.pyperclip import PyperclipClipboard
+
     tag_to_edit = prompt(
         ANSI('\033[32;1m#\033[0m'), clipboard=PyperclipClipboard()
     )
@@ -342,3 +453,129 @@ def get_tag_to_search() -> str:
     )
 
     return tag_to_search
+
+
+def get_part_to_search() -> str:
+    """Prompts to enter fragment of memo's title, text or tags to search.
+
+    Returns:
+        str: user's input - any part of existing memo's title, text or tags.
+
+    """
+    part_to_search = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mФрагмент\033[0m'
+            '\033[31;1m)\033[0m '
+        )
+    )
+
+    return part_to_search
+
+
+def get_dir_to_import() -> str:
+    """Prompts to enter directory of Markdown-files to import.
+
+    Returns:
+        str: user's input - path of directory (with autocomplete).
+
+    """
+    from prompt_toolkit.completion import PathCompleter
+
+    dir_to_import = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mпапка\033[0m'
+            '\033[31;1m)\033[0m '
+        ),
+        completer=PathCompleter(only_directories=True, expanduser=True),
+    )
+
+    return dir_to_import
+
+
+def get_export_format() -> str:
+    """Prompts to choose format of export.
+
+    Returns:
+        str: user's input - `jsonl`, `csv` or `md` (with autocomplete).
+
+    """
+    export_format = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mjsonl\033[0m'
+            '\033[32;1m/\033[0m'
+            '\033[34;1mcsv\033[0m'
+            '\033[32;1m/\033[0m'
+            '\033[34;1mmd\033[0m'
+            '\033[31;1m)\033[0m '
+        ),
+        completer=WordCompleter(['jsonl', 'csv', 'md']),
+    )
+
+    return export_format
+
+
+def get_check_mode() -> str:
+    """Prompts to choose mode of DB's check.
+
+    Returns:
+        str: user's input - `quick` or `full` (with autocomplete).
+
+    """
+    check_mode = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mquick\033[0m'
+            '\033[32;1m/\033[0m'
+            '\033[34;1mfull\033[0m'
+            '\033[31;1m)\033[0m '
+        ),
+        completer=WordCompleter(['quick', 'full']),
+    )
+
+    return check_mode
+
+
+def get_notebook(notebooks: list[str]) -> str:
+    """Prompts to enter name of notebook.
+
+    Args:
+        notebooks (list[str]): names of existing notebooks (to autocomplete).
+
+    Returns:
+        str: user's input - name of notebook (with autocomplete).
+
+    """
+    notebook = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mблокнот\033[0m'
+            '\033[31;1m)\033[0m '
+        ),
+        completer=WordCompleter(notebooks),
+    )
+
+    return notebook
+
+
+def get_path_to_export() -> str:
+    """Prompts to enter file (or directory) to export memos.
+
+    Returns:
+        str: user's input - path of file or directory (with autocomplete).
+
+    """
+    from prompt_toolkit.completion import PathCompleter
+
+    path_to_export = prompt(
+        ANSI(
+            '\033[31;1m(\033[0m'
+            '\033[34;1mпуть\033[0m'
+            '\033[31;1m)\033[0m '
+        ),
+        completer=PathCompleter(expanduser=True),
+    )
+
+    return path_to_export
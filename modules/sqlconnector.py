@@ -1,203 +1,164 @@
 """Connects to SQLite-database and process data (memos)."""
+import os
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
-from sqlite3 import connect, DatabaseError
+from sqlite3 import Connection, DatabaseError
+from typing import Iterator, Optional
 
 from pyperclip import copy as copy_to_clipboard
 
-from modules.dbmanager import check_db, check_backup, set_backup_path
-from modules.dbmanager import restore_db
 from modules.mdprinter import print_memo_from_db, print_md, print_total
+from modules.mdprinter import print_memos_from_db
+from modules.dbchecker import CHECK_MODES, IntegrityCheck, cancel_check
+from modules.dbchecker import find_running_check, start_check
+from modules.dbconfig import apply_config, load_config
+from modules.exporter import EXPORT_FORMATS, export_memos
+from modules.importer import expand_dir, find_md_files, import_md_files
 from modules.memoeditor import input_corrected_body
 from modules.memoeditor import input_corrected_title, input_corrected_tag
+from modules.memostore import count_total, insert_memo, iter_memo_pages
+from modules.memostore import find_last_memos, find_memo_by_rowid
+from modules.memostore import find_memos_by_date, parse_date_range
+from modules.memostore import find_memos_by_text, iter_snippet_pages
+from modules.memostore import find_memos_by_tag, iter_memos, update_memo
+from modules.memostore import find_memos_by_substring, read_ahead
+from modules.memostore import delete_memo_by_rowid, find_revisions
+from modules.memostore import rebuild_db, set_datetime, set_working_dir
+from modules.memostore import list_notebooks, search_notebooks
+from modules.profiler import append_stats, set_stats_path
+from modules.profiler import summarize_session
 from modules.prompter import check_confirmation, get_rowid
-from modules.prompter import get_date_to_search
+from modules.prompter import get_date_to_search, get_page_command
 from modules.prompter import get_title_to_search, get_text_to_search
-from modules.prompter import get_tag_to_search
+from modules.prompter import get_tag_to_search, get_dir_to_import
+from modules.prompter import get_part_to_search
+from modules.prompter import get_export_format, get_path_to_export
+from modules.prompter import get_check_mode, get_version
 
+QUIT_PAGES: list[str] = ['q', 'quit', '-q', 'no', '-n']
 
-def check_db_path_and_table(path: Path) -> None:
-    """Checks database's path and creates DB if not exists.
 
-    Note:
-        If database's backup exist, restores database from backup.
-
-     Args:
-         path (Path): PosixPath of program's working directory.
-
-    """
-    is_db = check_db(path)
-
-    if is_db:
-        print_md(f'Существующая база заметок: `{path}`.')
-    else:
-        is_backup = check_backup(path)
-
-        if is_backup:
-            path_backup = set_backup_path(path)
-
-            print_md(f'База заметок `{path}` не найдена!')
-            print_md(
-                'Восстановить базу заметок из резервной копии '
-                + f'`{path_backup}`?'
-            )
-            confirmation = check_confirmation()
-
-            if confirmation == 'yes':
-                restore_db(path)
-        else:
-            create_db(path)
-
-
-def create_db(path: Path) -> None:
-    """Creates empty DB of memos if not exists using SQL-query.
+def show_recent(connection: Connection) -> None:
+    """Shows the latest memo using SQL-query.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
-
-    sql_create_table = """CREATE TABLE IF NOT EXISTS memos
-                               (
-                               date_time DATETIME NOT NULL,
-                               titles TEXT NOT NULL,
-                               bodies TEXT NOT NULL,
-                               tags TEXT NOT NULL
-                               );"""
-
     try:
-        print_md(f'Будет создана новая база заметок: `{path}`.')
-        cursor.execute(sql_create_table)
-        connection.commit()
+        memos = find_last_memos(connection, 1)
+
+        if memos:
+            print_md('Последняя заметка:')
+            print_memo_from_db(memos[0])
+        else:
+            print_md('Заметка в базе не найдена.')
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def show_recent(path: Path) -> None:
-    """Shows the latest memo using SQL-query.
+def show_last(connection: Connection) -> None:
+    """Shows last 5 memos using SQL-query.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
-
-    sql_select_latest = """SELECT ROWID, date_time, titles, bodies, tags
-                                  FROM memos
-                                  ORDER BY ROWID DESC;"""
-
     try:
-        cursor.execute(sql_select_latest)
-        memo = cursor.fetchone()
+        memos = find_last_memos(connection, 5)
 
-        if memo:
-            print_md('Последняя заметка:')
-            print_memo_from_db(memo)
+        if memos:
+            print_md('Последние заметки:')
+            print_memos_from_db(memos)
         else:
-            print_md('Заметка в базе не найдена.')
+            print_md('Заметки в базе не найдены.')
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def show_last(path: Path) -> None:
-    """Shows last 5 memos using SQL-query.
+def show_all(connection: Connection) -> None:
+    """Show all memos page by page using SQL-query.
+
+    Note:
+        Memos are read by pages (`PAGE_SIZE` memos per page, see
+        `iter_memo_pages`) and shown until user quits or memos end,
+        so only one page of memos is kept in memory; the next page is read
+        by a thread (see `read_ahead`) while the current one is printed.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
-
-    sql_select_last = """SELECT ROWID, date_time, titles, bodies, tags
-                             FROM memos
-                             ORDER BY ROWID DESC;"""
     try:
-        cursor.execute(sql_select_last)
-        memos = cursor.fetchmany(5)
-
-        if memos:
-            print_md('Последние заметки:')
-            for memo in memos:
-                print_memo_from_db(memo)
-        else:
-            print_md('Заметки в базе не найдены.')
+        with closing(read_ahead(iter_memo_pages(connection))) as pages:
+            if not show_pages(
+                pages, 'Все заметки из базы (по порядку создания):'
+            ):
+                print_md('Заметки в базе не найдены.')
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def show_all(path: Path) -> None:
-    """Show all memos using SQL-query.
+def show_pages(pages: Iterator[list[tuple[str, ...]]], header: str) -> bool:
+    """Shows pages of memos until user quits or pages end.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        pages (Iterator[list[tuple[str, ...]]]): pages of memos (rowid,
+        date_time, title, body and tag), e.g. read by `read_ahead`.
+        header (str): message printed before the first page.
 
-    Raises:
-        DatabaseError: If operation failed.
+    Returns:
+        bool: True if any memo is shown, False if there are no pages.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
+    page = next(pages, [])
 
-    sql_select_all = """SELECT ROWID, date_time, titles, bodies, tags
-                             FROM memos
-                             ORDER BY ROWID;"""
+    if page:
+        print_md(header)
 
-    try:
-        cursor.execute(sql_select_all)
-        memos = cursor.fetchall()
+    is_shown = bool(page)
 
-        if memos:
-            print_md('Все заметки из базы (по порядку создания):')
-            for memo in memos:
-                print_memo_from_db(memo)
-        else:
-            print_md('Заметки в базе не найдены.')
+    while page:
+        print_memos_from_db(page)
 
-    except DatabaseError:
-        print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
+        page = next(pages, [])
 
+        if page and get_page_command().strip().lower() in QUIT_PAGES:
+            break
 
-def show_total_memos(path: Path) -> None:
+    return is_shown
+
+
+def show_total_memos(connection: Connection) -> None:
     """Shows total of memos in DB using functions `count_memos`, `print-memos`.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     """
-    total = count_memos(path)
+    total = count_memos(connection)
 
     print_total(total)
 
 
-def add_memo(path: Path, memo: tuple[str, ...]) -> None:
+def add_memo(connection: Connection, memo: tuple[str, ...]) -> None:
     """Adds new memo to DB using SQL-query.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
         memo (tuple[str, ...]): tuple contains memo's elements
         (date_time, title, body and tag).
 
@@ -205,24 +166,122 @@ def add_memo(path: Path, memo: tuple[str, ...]) -> None:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
-
-    sql_add_memo = """INSERT INTO memos (date_time, titles, bodies, tags)
-                           VALUES (?, ?, ?, ?);"""
-
     try:
-        cursor.execute(sql_add_memo, memo)
+        insert_memo(connection, memo)
         connection.commit()
         print_md('Заметка добавлена в базу.')
 
     except DatabaseError:
+        connection.rollback()
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def edit_title(path: Path) -> None:
+def import_memos(connection: Connection) -> None:
+    """Imports memos from directory of Markdown-files.
+
+    Note:
+        Title, tags and date of memo are read from front-matter of file
+        (see `modules.importer.parse_md_file`); subdirectories are imported
+        too.
+
+        User have to confirm operation.
+
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    print_md('Введите путь к папке с Markdown-файлами (`*.md`):')
+    directory = expand_dir(get_dir_to_import())
+
+    if directory is None:
+        print_md('Папка не найдена!')
+        return
+
+    paths = find_md_files(directory)
+
+    if not paths:
+        print_md('Markdown-файлы в папке не найдены.')
+        return
+
+    print_md(f'Импортировать в базу Markdown-файлы ({len(paths)})?')
+    confirmation = check_confirmation()
+
+    if confirmation == 'yes':
+        try:
+            imported, skipped, seconds = import_md_files(connection, paths)
+            print_md(
+                f'Импортировано заметок: {imported} '
+                + f'({imported / max(seconds, 1e-6):.0f} заметок/с).'
+            )
+
+            if skipped:
+                print_md(f'Не удалось прочитать файлов: {skipped}.')
+
+        except DatabaseError:
+            print_md('Ошибка обращения к базе заметок.')
+
+
+def export_to_file(connection: Connection) -> None:
+    """Exports memos to JSON Lines, CSV or Markdown-files.
+
+    Note:
+        User can export all memos or memos of period and (or) with tags,
+        e.g. only memos created since last export (`ГГГГ-ММ-ДД..`).
+
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    print_md(
+        'Выберите формат: `jsonl` (JSON Lines), `csv` или `md` '
+        + '(Markdown-файл для каждой заметки):'
+    )
+    export_format = get_export_format().strip().lower()
+
+    while export_format not in EXPORT_FORMATS:
+        print_md('Введите `jsonl`, `csv` или `md`:')
+        export_format = get_export_format().strip().lower()
+
+    if export_format == 'md':
+        print_md('Введите путь к папке для Markdown-файлов:')
+    else:
+        print_md(f'Введите путь к файлу (`*.{export_format}`):')
+    path = Path(os.path.expanduser(get_path_to_export().strip()))
+
+    print_md(
+        'Введите дату или период (`ГГГГ-ММ-ДД..`) заметок '
+        + '(`ENTER` - за всё время):'
+    )
+    date = get_date_to_search().strip()
+
+    while date and not check_date(date):
+        print_md('Введите правильную дату или период (`ENTER` - все):')
+        date = get_date_to_search().strip()
+
+    print_md('Введите тег(и) заметок (`ENTER` - с любыми тегами):')
+    tag = get_tag_to_search().strip()
+
+    start, end = parse_date_range(date) if date else ('', '')
+
+    try:
+        exported = export_memos(
+            iter_memos(connection, start, end, tag), path, export_format
+        )
+        print_md(f'Экспортировано заметок: {exported} (`{path}`).')
+
+    except OSError:
+        print_md(f'Ошибка записи в `{path}`.')
+    except DatabaseError:
+        print_md('Ошибка обращения к базе заметок.')
+
+
+def edit_title(connection: Connection) -> None:
     """Edits title of existing memo using SQL-query.
 
     Note:
@@ -233,51 +292,30 @@ def edit_title(path: Path) -> None:
         User have to confirm changes.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
+    memo = search_memo_by_rowid(connection)
 
-    sql_select_title = """SELECT titles
-                               FROM memos
-                               WHERE ROWID = ?;"""
-    sql_update_title = """UPDATE memos
-                               SET date_time = ?, titles = ?
-                               WHERE ROWID = ?;"""
-    rowid = search_memo_by_rowid(path)
-    total = count_memos(path)
+    if memo is None:
+        return
 
-    try:
-        if 0 < rowid <= total:
-            cursor.execute(sql_select_title, (rowid,))
+    rowid, _, title, _, _ = memo
+    copy_to_clipboard(title.removeprefix('## '))
 
-            memo = cursor.fetchone()
-            copy_to_clipboard(memo[0].lstrip('## '))
+    updated_date_time, corrected_title = input_corrected_title()
 
-            updated_date_time, corrected_title = input_corrected_title()
+    print_md('Сохранить заметку с отредактированным заголовком?')
+    confirmation = check_confirmation()
 
-            print_md('Сохранить заметку с отредактированным заголовком?')
-            confirmation = check_confirmation()
+    if confirmation == 'yes':
+        save_memo(connection, rowid, updated_date_time, title=corrected_title)
 
-            if confirmation == 'yes':
-                cursor.execute(
-                    sql_update_title,
-                    (updated_date_time, corrected_title, rowid),
-                )
-                connection.commit()
-                print_md('Заметка обновлена.')
 
-    except DatabaseError:
-        print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
-
-
-def edit_body(path: Path) -> None:
+def edit_body(connection: Connection) -> None:
     """Edits body of existing memo using SQL-query.
 
     Note:
@@ -288,50 +326,30 @@ def edit_body(path: Path) -> None:
         User have to confirm changes.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
-
-    sql_select_body = """SELECT bodies
-                              FROM memos
-                              WHERE ROWID = ?;"""
-    sql_update_body = """UPDATE memos
-                               SET date_time = ?, bodies = ?
-                               WHERE ROWID = ?;"""
-    rowid = search_memo_by_rowid(path)
-    total = count_memos(path)
-
-    try:
-        if 0 < rowid <= total:
-            cursor.execute(sql_select_body, (rowid,))
+    memo = search_memo_by_rowid(connection)
 
-            memo = cursor.fetchone()
-            copy_to_clipboard(memo[0])
+    if memo is None:
+        return
 
-            updated_date_time, corrected_text = input_corrected_body()
+    rowid, _, _, body, _ = memo
+    copy_to_clipboard(body)
 
-            print_md('Сохранить заметку с отредактированным текстом?')
-            confirmation = check_confirmation()
+    updated_date_time, corrected_text = input_corrected_body()
 
-            if confirmation == 'yes':
-                cursor.execute(
-                    sql_update_body, (updated_date_time, corrected_text, rowid)
-                )
-                connection.commit()
-                print_md('Заметка обновлена.')
+    print_md('Сохранить заметку с отредактированным текстом?')
+    confirmation = check_confirmation()
 
-    except DatabaseError:
-        print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
+    if confirmation == 'yes':
+        save_memo(connection, rowid, updated_date_time, body=corrected_text)
 
 
-def edit_tag(path: Path) -> None:
+def edit_tag(connection: Connection) -> None:
     """Edit tag(s) of existing memo using SQL-query.
 
     Note:
@@ -342,91 +360,106 @@ def edit_tag(path: Path) -> None:
         User have to confirm changes.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
+    memo = search_memo_by_rowid(connection)
 
-    sql_select_tag = """SELECT tags
-                              FROM memos
-                              WHERE ROWID = ?;"""
-    sql_update_tag = """UPDATE memos
-                               SET date_time = ?, tags = ?
-                               WHERE ROWID = ?;"""
-    rowid = search_memo_by_rowid(path)
-    total = count_memos(path)
+    if memo is None:
+        return
 
-    try:
-        if 0 < rowid <= total:
-            cursor.execute(sql_select_tag, (rowid,))
+    rowid, _, _, _, tags = memo
+    copy_to_clipboard(' '.join([tag.lstrip('#') for tag in tags.split()]))
 
-            memo = cursor.fetchone()
-            copy_to_clipboard(
-                ' '.join([tag.lstrip('#') for tag in memo[0].split()])
-            )
+    updated_date_time, corrected_tag = input_corrected_tag()
+
+    print_md('Сохранить заметку с отредактированным тегом?')
+    confirmation = check_confirmation()
+
+    if confirmation == 'yes':
+        save_memo(connection, rowid, updated_date_time, tags=corrected_tag)
+
+
+def save_memo(
+    connection: Connection, rowid: int, date_time: str, **elements: str
+) -> None:
+    """Saves edited memo (see `update_memo`) and prints result.
+
+    Note:
+        Memo is read once (by `search_memo_by_rowid`) before editing
+        and updated by primary key in one transaction; if memo has been
+        deleted meanwhile (e.g. in batch mode), nothing is changed.
 
-            updated_date_time, corrected_tag = input_corrected_tag()
+    Args:
+        connection (Connection): connection to database.
+        rowid (int): ROWID of memo.
+        date_time (str): date_time of editing.
+        **elements (str): edited `title`, `body` or `tags`.
 
-            print_md('Сохранить заметку с отредактированным тегом?')
-            confirmation = check_confirmation()
+    Raises:
+        DatabaseError: If operation failed.
 
-            if confirmation == 'yes':
-                cursor.execute(
-                    sql_update_tag, (updated_date_time, corrected_tag, rowid)
-                )
-                connection.commit()
-                print_md('Заметка обновлена.')
+    """
+    try:
+        if update_memo(connection, rowid, date_time, **elements):
+            print_md('Заметка обновлена.')
+        else:
+            print_md(f'Заметка с `ID` {rowid} не найдена.')
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def delete_memo(path: Path) -> None:
-    """Delete memo from database (by ROWID)."""
-    connection = connect(path)
-    cursor = connection.cursor()
+def delete_memo(connection: Connection) -> None:
+    """Delete memo from database (by ROWID).
 
-    sql_delete_memo = """DELETE FROM memos
-                              WHERE ROWID == ?;"""
-    rowid = search_memo_by_rowid(path)
-    total = count_memos(path)
+    Note:
+        User have to confirm operation.
 
-    try:
-        if 0 < rowid <= total:
-            print_md(f'Удалить заметку с ID `{rowid}`?')
-            confirmation = check_confirmation()
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    memo = search_memo_by_rowid(connection)
+
+    if memo is None:
+        return
 
-            if confirmation == 'yes':
-                cursor.execute(sql_delete_memo, (rowid,))
-                connection.commit()
+    rowid = memo[0]
+
+    print_md(f'Удалить заметку с ID `{rowid}`?')
+    confirmation = check_confirmation()
+
+    try:
+        if confirmation == 'yes':
+            if delete_memo_by_rowid(connection, rowid):
                 print_md('Заметка удалена из базы.')
+            else:
+                print_md(f'Заметка с `ID` {rowid} не найдена.')
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def delete_all(path: Path) -> None:
+def delete_all(connection: Connection) -> None:
     """Delete all memos from database using SQL-query.
 
     Note:
         User have to confirm operation.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
     cursor = connection.cursor()
 
     sql_delete_all = """DELETE FROM memos;"""
@@ -441,30 +474,178 @@ def delete_all(path: Path) -> None:
             print_md('Все заметки удалены из базы.')
 
     except DatabaseError:
+        connection.rollback()
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def search_memo_by_date(path: Path) -> None:
-    """Search memo in database (by date) using SQL-query.
+def show_history(connection: Connection) -> None:
+    """Shows previous versions of memo (by ROWID) as table.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
+    find_memo_versions(connection)
+
+
+def show_version(connection: Connection) -> None:
+    """Shows previous version of memo chosen by user.
+
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    rowid, versions = find_memo_versions(connection)
+    version = choose_version(versions)
+
+    if version is not None:
+        number, date_time, title, body, tags = version
+
+        print_md(f'Версия {number} заметки с `ID` {rowid}:')
+        print_memo_from_db((rowid, date_time, title, body, tags))
+
+
+def restore_version(connection: Connection) -> None:
+    """Restores previous version of memo chosen by user.
 
-    sql_select_date = """SELECT ROWID, date_time, titles, bodies, tags
-                              FROM memos
-                              WHERE DATE(date_time) = ?;"""
+    Note:
+        User have to confirm operation; the current version of memo
+        is kept as the latest previous version, so restoring may be undone.
+
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    rowid, versions = find_memo_versions(connection)
+    version = choose_version(versions)
+
+    if version is None:
+        return
+
+    number, date_time, title, body, tags = version
+    print_memo_from_db((rowid, date_time, title, body, tags))
+
+    print_md(f'Восстановить версию {number} заметки с ID `{rowid}`?')
+    confirmation = check_confirmation()
+
+    if confirmation == 'yes':
+        save_memo(
+            connection,
+            rowid,
+            set_datetime(),
+            title=title,
+            body=body,
+            tags=tags,
+        )
+
+
+def find_memo_versions(
+    connection: Connection,
+) -> tuple[int, list[tuple[str, ...]]]:
+    """Finds previous versions of memo (by ROWID) and shows them as table.
+
+    Note:
+        To search, user have to input a correct number (rowid).
+
+    Args:
+        connection (Connection): connection to database.
+
+    Returns:
+        tuple[int, list[tuple[str, ...]]]: ROWID entered by user
+        and versions (number, date_time, title, body and tag); versions
+        are empty if user's input is not valid, memo has no versions
+        or DatabaseError is raised.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    rowid = get_rowid()
+    versions: list[tuple[str, ...]] = []
+
+    try:
+        if rowid > 0:
+            versions = find_revisions(connection, rowid)
+
+            if not versions:
+                print_md(f'Прежние версии заметки с `ID` {rowid} не найдены.')
+        else:
+            print_md('Неверный ввод `ID`.')
+
+    except DatabaseError:
+        print_md('Ошибка обращения к базе заметок.')
+
+    if versions:
+        rows = [
+            f'| {number} | {date_time} | '
+            + f'{title.removeprefix("## ").replace("|", "/")} | '
+            + f'{tags.replace("#", "")} |'
+            for number, date_time, title, _, tags in versions
+        ]
+        print_md(
+            '| Версия | Дата | Заголовок | Теги |\n'
+            + '|---|---|---|---|\n'
+            + '\n'.join(rows)
+        )
+
+    return rowid, versions
+
+
+def choose_version(
+    versions: list[tuple[str, ...]],
+) -> Optional[tuple[str, ...]]:
+    """Prompts user to choose one of previous versions of memo.
+
+    Args:
+        versions (list[tuple[str, ...]]): versions of memo (see
+        `find_memo_versions`).
+
+    Returns:
+        Optional[tuple[str, ...]]: chosen version; None if there are
+        no versions or user cancels choice.
+
+    """
+    if not versions:
+        return None
+
+    print_md('Введите номер версии (`ENTER` - отмена):')
+    number = get_version()
+
+    while number is not None and not 0 < number <= len(versions):
+        print_md('Такой версии нет, введите номер из таблицы:')
+        number = get_version()
+
+    return versions[number - 1] if number is not None else None
+
+
+def search_memo_by_date(connection: Connection) -> None:
+    """Search memo in database (by date or period) using SQL-query.
+
+    Note:
+        User can input a day (`ГГГГ-ММ-ДД`), a month (`ГГГГ-ММ`),
+        a quarter (`ГГГГ-Q1`...`ГГГГ-Q4`), a year (`ГГГГ`) or a range
+        of them (`ГГГГ-ММ..ГГГГ-ММ`, open ranges `ГГГГ..` and `..ГГГГ`).
+
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
     print_md(
         'Введите дату создания (редактирования) заметки '
-        + 'в формате `ГГГГ-ММ-ДД`:'
+        + 'в формате `ГГГГ-ММ-ДД`, месяц (`ГГГГ-ММ`), квартал (`ГГГГ-Q1`), '
+        + 'год (`ГГГГ`) или период (`ГГГГ-ММ-ДД..ГГГГ-ММ-ДД`):'
     )
     date = get_date_to_search().strip()
     date_is_valid = check_date(date)
@@ -472,48 +653,39 @@ def search_memo_by_date(path: Path) -> None:
     while not date_is_valid:
         print_md(
             'Введите правильную дату создания (редактирования) заметки '
-            + 'в формате `ГГГГ-ММ-ДД`:'
+            + 'или период:'
         )
         date = get_date_to_search().strip()
         date_is_valid = check_date(date)
 
     try:
-        cursor.execute(sql_select_date, (date,))
-        memos = cursor.fetchall()
+        memos = find_memos_by_date(connection, *parse_date_range(date))
 
         if memos:
-            for memo in memos:
-                print_memo_from_db(memo)
+            print_memos_from_db(memos)
         else:
-            if date == '':
-                print_md('Дата не задана, заметка не найдена.')
-            else:
-                print_md(f'Заметка от `{date}` не найдена.')
+            print_md(f'Заметки за `{date}` не найдены.')
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
 def check_date(date: str) -> bool:
-    """Checks user's date to search.
+    """Checks user's date (or period) to search.
 
     Args:
-        date (str): date to check (in format '%Y-%m-%d').
+        date (str): date or period to check (see `parse_date_range`).
 
     Returns:
         bool: True if user's date is valid, False otherwise.
 
     """
-    today = datetime.today().date()
+    today = datetime.today().date().isoformat()
 
     try:
+        start, _ = parse_date_range(date)
 
-        date_to_check = datetime.strptime(date, '%Y-%m-%d').date()
-        delta = today - date_to_check
-
-        if delta.total_seconds() < 0:
+        if start > today:
             print('Этот день ещё не наступил.', end=' ')
             raise ValueError
 
@@ -525,141 +697,109 @@ def check_date(date: str) -> bool:
         return False
 
 
-def search_memo_by_title(path: Path) -> None:
-    """Searches memo in database (by title) using SQL-query.
+def search_memo_by_title(connection: Connection) -> None:
+    """Searches memo in database (by title) using full-text index.
 
     Note:
-        To search, user have to input a string (title or keyword - part of it).
+        To search, user have to input a string (title or keywords - words
+        of it, or beginnings of words).
 
-        The search is case-insensitive.
+        The search is case-insensitive, found memos are ranked by relevance
+        (BM25) and shown page by page (see `iter_snippet_pages`), matches
+        in title are highlighted, text is shortened to a snippet.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    connection.create_function('CASEFOLD', 1, lambda x: x.casefold())
-    cursor = connection.cursor()
-
-    sql_select_title = """SELECT ROWID, date_time, titles, bodies, tags
-                               FROM memos
-                               WHERE CASEFOLD(titles) LIKE ?;"""
-    print_md('Введите фрагмент заголовка заметки:')
+    print_md('Введите слова (или начала слов) заголовка заметки:')
     title = get_title_to_search().strip()
 
-    if title != '':
-        title_to_search = f'%{title.casefold()}%'
-    else:
-        title_to_search = title
+    if title == '':
+        print_md('Заголовок не задан, заметка не найдена.')
+        return
 
     try:
-        cursor.execute(sql_select_title, (title_to_search,))
-        memos = cursor.fetchall()
-
-        if memos:
-            for memo in memos:
-                print_memo_from_db(memo)
-        else:
-            if title == '':
-                print_md('Заголовок не задан, заметка не найдена.')
-            else:
+        with closing(
+            read_ahead(iter_snippet_pages(connection, 'titles', title))
+        ) as pages:
+            if not show_pages(pages, f'Заметки с `{title}` в заголовке:'):
                 print_md(f'Заметка с `{title}` в заголовке не найдена.')
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def search_memo_by_text(path: Path) -> None:
-    """Search memo in database (by text) using SQL-query.
+def search_memo_by_text(connection: Connection) -> None:
+    """Search memo in database (by text) using full-text index.
 
     Note:
-        To search, user have to input a string (word or phrase - part of text).
+        To search, user have to input a string (word or phrase - words
+        of text, or beginnings of words).
 
-        The search is case-insensitive.
+        The search is case-insensitive, found memos are ranked by relevance
+        (BM25) and shown page by page (see `iter_snippet_pages`) as snippets
+        of text with highlighted matches.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    connection.create_function('CASEFOLD', 1, lambda x: x.casefold())
-    cursor = connection.cursor()
-
-    sql_select_text = """SELECT ROWID, date_time, titles, bodies, tags
-                              FROM memos
-                              WHERE CASEFOLD(bodies) LIKE ?"""
-    print_md('Введите фрагмент текста заметки:')
+    print_md('Введите слова (или начала слов) текста заметки:')
     text = get_text_to_search().strip()
 
-    if text != '':
-        text_to_search = f'%{text.casefold()}%'
-    else:
-        text_to_search = text
+    if text == '':
+        print_md('Текст не задан, заметка не найдена.')
+        return
 
     try:
-        cursor.execute(sql_select_text, (text_to_search,))
-        memos = cursor.fetchall()
-
-        if memos:
-            for memo in memos:
-                print_memo_from_db(memo)
-        else:
-            if text == '':
-                print_md('Текст не задан, заметка не найдена.')
-            else:
+        with closing(
+            read_ahead(iter_snippet_pages(connection, 'bodies', text))
+        ) as pages:
+            if not show_pages(pages, f'Заметки с текстом `{text}`:'):
                 print_md(f'Заметка с текстом `{text}` не найдена.')
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def search_memo_by_tag(path: Path) -> None:
-    """Search memo in database (by tag) using SQL-query.
+def search_memo_by_tag(connection: Connection) -> None:
+    """Search memo in database (by tag) using index of tags.
 
     Note:
-        To search, user have to input a word.
+        To search, user have to input a tag (`tag`), a beginning of tag
+        (`tag*`) or several tags: divided by spaces, all of them have to be
+        found (`tag1 tag2`); divided by `|`, any of them (`tag1 | tag2`).
+        Groups are combined too: `a b | c` finds memos having both `a` and
+        `b` or having `c`.
 
         The search is case-insensitive.
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Raises:
         DatabaseError: If operation failed
 
     """
-    connection = connect(path)
-    connection.create_function('CASEFOLD', 1, lambda x: x.casefold())
-    cursor = connection.cursor()
-
-    sql_select_tag = """SELECT ROWID, date_time, titles, bodies, tags
-                             FROM memos
-                             WHERE CASEFOLD(tags) LIKE ?;"""
-    print_md('Введите фрагмент тега заметки:')
+    print_md(
+        'Введите тег (`tag`), начало тега (`tag*`) или несколько тегов '
+        + '(`tag1 tag2` - все теги, `tag1 | tag2` - любой из тегов, '
+        + '`a b | c` - теги `a` и `b` или тег `c`):'
+    )
     tag = get_tag_to_search().strip()
 
-    if tag != '':
-        tag_to_search = f'%{tag.casefold()}%'
-    else:
-        tag_to_search = tag
-
     try:
-        cursor.execute(sql_select_tag, (tag_to_search,))
-        memos = cursor.fetchall()
+        memos = find_memos_by_tag(connection, tag)
 
         if memos:
-            for memo in memos:
-                print_memo_from_db(memo)
+            print_memos_from_db(memos)
         else:
             if tag == '':
                 print_md('тег не задан, заметка не найдена.')
@@ -668,66 +808,131 @@ def search_memo_by_tag(path: Path) -> None:
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
-    finally:
-        connection.close()
 
 
-def search_memo_by_rowid(path: Path) -> int:
+def search_memo_by_part(connection: Connection) -> None:
+    """Search memo in database (by any part of title, text or tags).
+
+    Note:
+        To search, user have to input a fragment of title, text or tags
+        (e.g. a part of word), which is found in any place of them.
+
+        The search is case-insensitive, uses trigram index.
+
+    Args:
+        connection (Connection): connection to database.
+
+    Raises:
+        DatabaseError: If operation failed.
+
+    """
+    print_md('Введите фрагмент (часть слова) заголовка, текста или тега:')
+    part = get_part_to_search().strip()
+
+    try:
+        if part != '':
+            memos = find_memos_by_substring(connection, part)
+        else:
+            memos = []
+
+        if memos:
+            print_memos_from_db(memos)
+        else:
+            if part == '':
+                print_md('Фрагмент не задан, заметка не найдена.')
+            else:
+                print_md(f'Заметка с фрагментом `{part}` не найдена.')
+
+    except DatabaseError:
+        print_md('Ошибка обращения к базе заметок.')
+
+
+def search_all_notebooks(path: Path) -> None:
+    """Search memos (by text) in all notebooks at once.
+
+    Note:
+        To search, user have to input a string (words of text, or
+        beginnings of words, see `search_memo_by_text`).
+
+        Notebooks are searched in parallel (see `search_notebooks`), found
+        memos are ordered by date and shown with names of their notebooks,
+        e.g. `ID: work:12` (notebook is opened by command `use`).
+
+    Args:
+        path (Path): PosixPath of the current notebook.
+
+    """
+    print_md('Введите слова (или начала слов) текста заметки:')
+    text = get_text_to_search().strip()
+
+    if text == '':
+        print_md('Текст не задан, заметка не найдена.')
+        return
+
+    found, skipped = search_notebooks(
+        list_notebooks(path), find_memos_by_text, text
+    )
+
+    for notebook in skipped:
+        print_md(f'Ошибка поиска в блокноте `{notebook}`.')
+
+    if found:
+        print_memos_from_db(
+            (f'{notebook}:{memo[0]}', *memo[1:]) for notebook, memo in found
+        )
+    else:
+        print_md(f'Заметка с текстом `{text}` не найдена в блокнотах.')
+
+
+def search_memo_by_rowid(
+    connection: Connection,
+) -> Optional[tuple[str, ...]]:
     """Search memo in database (by rowid) using SQL-query.
 
     Note:
-        To search, user have to input a correct number (rowid).
+        To search, user have to input a correct number (rowid); memo
+        is read by primary key (one indexed lookup).
 
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Returns:
-        int: a number > 0 if database is not empty;
-        -1 if user's input is not valid of raises DatabaseError.
+        Optional[tuple[str, ...]]: found memo (rowid, date_time, title, body
+        and tag); None if user's input is not valid, memo is not found
+        or DatabaseError is raised.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
-
-    sql_select_rowid = """SELECT ROWID, date_time, titles, bodies, tags
-                               FROM memos
-                               WHERE ROWID = ?;"""
     rowid = get_rowid()
+    memo = None
 
     try:
-        if rowid != 0:
-            cursor.execute(sql_select_rowid, (rowid,))
-            memo = cursor.fetchone()
+        if rowid > 0:
+            memo = find_memo_by_rowid(connection, rowid)
 
             if memo:
                 print_memo_from_db(memo)
             else:
                 print_md(f'Заметка с `ID` {rowid} не найдена.')
-
-                rowid = -1
         else:
             print_md('Неверный ввод `ID`.')
 
-            rowid = -1
-
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
 
-        rowid = -1
-    finally:
-        connection.close()
+    return memo
 
-        return rowid
 
-
-def count_memos(path: Path) -> int:
+def count_memos(connection: Connection) -> int:
     """Show a number of memos in DB sing SQL-query.
 
+    Note:
+        Uses function `count_total` (constant time, see `memos_stats`).
+
     Args:
-        path (Path): PosixPath of program's working directory.
+        connection (Connection): connection to database.
 
     Returns:
         int: a number of existing memos in database.
@@ -736,66 +941,230 @@ def count_memos(path: Path) -> int:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
-
-    sql_select = """SELECT * FROM memos;"""
     total = 0
 
     try:
-        cursor.execute(sql_select)
-        total = len(cursor.fetchall())
+        total = count_total(connection)
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
 
-    finally:
-        connection.close()
-
-        return total
+    return total
 
 
 def check_db_integrity(path: Path) -> None:
-    """Check integrity of database using SQL-query.
+    """Starts check of DB's integrity in background or shows its progress.
+
+    Note:
+        Check runs in its own thread (see `modules.dbchecker`), so user
+        can run other commands; result is shown when check is finished.
+        If check is running, command shows its progress and allows
+        to cancel it.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    """
+    check = find_running_check()
+
+    if check is not None:
+        percent = check.done * 100 // check.total
+        print_md(
+            f'Проверка базы заметок (`{check.mode}`) выполняется: '
+            + f'{percent}% (этапов {check.done} из {check.total}).'
+        )
+        print_md('Отменить проверку?')
+        confirmation = check_confirmation()
+
+        if confirmation == 'yes' and cancel_check():
+            print_md('Проверка базы заметок отменена.')
+
+        return
+
+    print_md(
+        'Выберите проверку: `quick` (быстрая, структура файла) '
+        + 'или `full` (полная, включая индексы):'
+    )
+    mode = get_check_mode().strip().lower()
+
+    while mode not in CHECK_MODES:
+        print_md('Введите `quick` или `full`:')
+        mode = get_check_mode().strip().lower()
+
+    start_check(path, mode)
+    print_md(
+        'Проверка базы заметок запущена в фоне, результат будет показан '
+        + 'по её завершении (ход проверки - `check-db`).'
+    )
+
+
+def tune_db(connection: Connection, path: Path) -> None:
+    """Rebuilds file of DB with settings of config file.
 
     Note:
-        Uses SQLite's query `PRAGMA integrity_check`.
+        Config file is read again, so edited settings are applied without
+        restart (except path of DB, which is applied at the next start);
+        file of DB is rebuilt with new size of pages by `rebuild_db`.
+
+        User have to confirm operation.
 
     Args:
+        connection (Connection): connection to database.
         path (Path): PosixPath of program's working directory.
 
     Raises:
         DatabaseError: If operation failed.
 
     """
-    connection = connect(path)
-    cursor = connection.cursor()
+    try:
+        config = load_config(set_working_dir(), reload=True)
+    except ValueError as error:
+        print_md(f'Ошибка в файле настроек: {error}.')
+        return
 
-    sql_integrity_check = """PRAGMA integrity_check;"""
+    cursor = connection.cursor()
+    settings = ['page_size', 'journal_mode', 'mmap_size', 'cache_size']
+    rows = []
 
     try:
-        cursor.execute(sql_integrity_check)
-        result = cursor.fetchone()[0]
-
-        if result == 'ok':
-            print_md(f'База заметок `{path}` в порядке!')
-            print_md(
-                'Если всё же обратиться к ней не удалось, '
-                + 'попробуйте восстановить её из резервной копии '
-                + '(`restore-db`) или пересоздать (`recreate-db`).'
-            )
-        else:
-            print_md(f'База заметок `{path}` повреждена!')
-            print_md(
-                'Попробуйте восстановить её из резервной копии '
-                + '(`restore-db`) или пересоздать (`recreate-db`).'
+        for setting in settings:
+            cursor.execute(f'PRAGMA {setting};')
+            rows.append(
+                f'| `{setting}` | {cursor.fetchone()[0]} '
+                + f'| {getattr(config, setting)} |'
             )
 
     except DatabaseError:
         print_md('Ошибка обращения к базе заметок.')
+        return
+
+    print_md(
+        '| Параметр | Сейчас | В настройках |\n'
+        + '|---|--:|--:|\n'
+        + '\n'.join(rows)
+    )
+
+    if config.path is not None and config.path != path:
+        print_md(
+            f'Путь к базе заметок `{config.path}` будет применён '
+            + 'при следующем запуске.'
+        )
+
+    print_md(f'Перестроить файл базы заметок `{path}` по настройкам?')
+    confirmation = check_confirmation()
+
+    if confirmation != 'yes':
+        return
+
+    cancel_check()
+    size = measure_db(path)
+
+    try:
+        previous_page_size, page_size = rebuild_db(
+            connection, config.page_size, config.journal_mode
+        )
+        apply_config(connection, config)
+        print_md(
+            f'Файл базы заметок перестроен: страница {previous_page_size} '
+            + f'-> {page_size} байт, размер {size // 1024} '
+            + f'-> {measure_db(path) // 1024} КиБ.'
+        )
+
+    except DatabaseError:
+        print_md('Ошибка обращения к базе заметок.')
+
+
+def measure_db(path: Path) -> int:
+    """Measures size of DB with its write-ahead log.
+
+    Args:
+        path (Path): PosixPath of DB.
+
+    Returns:
+        int: size of files (bytes).
+
+    """
+    files = [path, path.with_name(f'{path.name}-wal')]
+
+    return sum(file.stat().st_size for file in files if file.exists())
+
+
+def report_db_integrity(check: IntegrityCheck, path: Path) -> None:
+    """Reports result of finished check of DB's integrity.
+
+    Args:
+        check (IntegrityCheck): finished check (see `pop_finished_check`).
+        path (Path): PosixPath of program's working directory.
+
+    """
+    if check.failure is not None:
+        print_md('Ошибка обращения к базе заметок.')
+        print_md(
+            'Попробуйте восстановить её из резервной копии '
+            + '(`restore-db`) или пересоздать (`recreate-db`).'
+        )
+    elif check.errors:
+        print_md(
+            f'База заметок `{path}` повреждена '
+            + f'(проверка `{check.mode}`, {check.seconds:.1f} с):'
+        )
+        print_md('\n'.join(f'- {error}' for error in check.errors[:10]))
         print_md(
             'Попробуйте восстановить её из резервной копии '
             + '(`restore-db`) или пересоздать (`recreate-db`).'
         )
-    finally:
-        connection.close()
+    else:
+        print_md(
+            f'База заметок `{path}` в порядке '
+            + f'(проверка `{check.mode}`, {check.seconds:.1f} с)!'
+        )
+        print_md(
+            'Если всё же обратиться к ней не удалось, '
+            + 'попробуйте восстановить её из резервной копии '
+            + '(`restore-db`) или пересоздать (`recreate-db`).'
+        )
+
+
+def show_stats(path: Path) -> None:
+    """Shows time of SQL-queries and rendering of session's commands.
+
+    Note:
+        Statistics is collected by `modules.profiler` (p50, p95 and max
+        of samples of every command); user can append it to log
+        `stats.jsonl` in program's working directory.
+
+    Args:
+        path (Path): PosixPath of program's working directory.
+
+    """
+    summary = summarize_session()
+    stages = {'sql': 'SQL', 'render': 'вывод'}
+
+    if not summary:
+        print_md('Статистика сеанса пока пуста.')
+        return
+
+    rows = [
+        f'| `{stats["command"]}` | {stages[stats["stage"]]} '
+        + f'| {stats["calls"]} | {stats["rows"]} | {stats["p50_ms"]:.3f} '
+        + f'| {stats["p95_ms"]:.3f} | {stats["max_ms"]:.3f} |'
+        for stats in summary
+    ]
+    print_md(
+        '| Команда | Этап | Вызовов | Строк | p50, мс | p95, мс | max, мс |\n'
+        + '|---|---|--:|--:|--:|--:|--:|\n'
+        + '\n'.join(rows)
+    )
+
+    stats_path = set_stats_path(path)
+
+    print_md(f'Добавить статистику в журнал `{stats_path}`?')
+    confirmation = check_confirmation()
+
+    if confirmation == 'yes':
+        try:
+            append_stats(stats_path, summary)
+            print_md('Статистика добавлена в журнал.')
+
+        except OSError:
+            print_md(f'Ошибка записи в `{stats_path}`.')
@@ -0,0 +1 @@
+"""Tests for MemoPad (run `python -m pytest` from the project's directory)."""
@@ -0,0 +1,67 @@
+"""Fixtures of tests: databases of memos in temporary directories."""
+import sqlite3
+from pathlib import Path
+from sqlite3 import Connection
+from typing import Callable, Iterator
+
+import pytest
+
+from modules import dbconfig
+from modules.memostore import connect_db, migrate_db
+
+BASELINE_MEMOS: list[tuple[str, ...]] = [
+    ('2022-10-01 10:00:00', '## Рабочая заметка', 'Проверить релиз', '#work'),
+    ('2022-10-02 11:00:00', '## Дом', 'Купить хлеб', '#home #SQLite'),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    """PosixPath of DB of the default notebook (`memos.db`)."""
+    return tmp_path.joinpath('memos.db')
+
+
+@pytest.fixture
+def connection(db_path: Path) -> Iterator[Connection]:
+    """Connection to a new DB of the latest schema."""
+    connection = connect_db(db_path)
+    migrate_db(connection)
+
+    yield connection
+
+    connection.close()
+
+
+@pytest.fixture
+def make_baseline_db() -> Callable[[Path], Path]:
+    """Function creating DB of the baseline schema (before migrations)."""
+
+    def make_db(path: Path) -> Path:
+        connection = sqlite3.connect(path)
+        connection.execute(
+            """CREATE TABLE memos
+                   (
+                   date_time DATETIME NOT NULL,
+                   titles TEXT NOT NULL,
+                   bodies TEXT NOT NULL,
+                   tags TEXT NOT NULL
+                   );"""
+        )
+        connection.executemany(
+            'INSERT INTO memos VALUES (?, ?, ?, ?);', BASELINE_MEMOS
+        )
+        connection.commit()
+        connection.close()
+
+        return path
+
+    return make_db
+
+
+@pytest.fixture
+def home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Home directory of program (`~/.memopad` is created in it)."""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setattr(dbconfig, 'CONFIG', [None])
+
+    return tmp_path
@@ -0,0 +1,166 @@
+"""Tests of generations of backup (full copies and deltas)."""
+from pathlib import Path
+from sqlite3 import Connection
+from typing import Callable
+
+import pytest
+
+from modules import backupstore
+from modules.backupstore import LEGACY_BACKUP, backup_generation
+from modules.backupstore import check_backup, import_legacy_backup
+from modules.backupstore import list_generations, restore_generation
+from modules.memostore import connect_db, find_revisions, insert_memo
+from modules.memostore import iter_memos, make_memo, update_memo
+
+
+def edit(connection: Connection, rowid: int, body: str) -> None:
+    """Changes text of memo (a revision is recorded by trigger)."""
+    assert update_memo(connection, rowid, '2023-05-17 10:30:00', body=body)
+
+
+def read_db(path: Path, rowid: int) -> tuple[list, list]:
+    """Reads memos of DB and revisions of memo."""
+    connection = connect_db(path)
+
+    try:
+        return list(iter_memos(connection)), find_revisions(connection, rowid)
+    finally:
+        connection.close()
+
+
+def test_delta_restore_keeps_revisions(
+    connection: Connection, db_path: Path
+) -> None:
+    """Revisions of memos changed since full copy are restored by delta."""
+    rowid = insert_memo(connection, make_memo('Заметка', 'один', 'x'))
+    connection.commit()
+    edit(connection, rowid, 'два')
+
+    assert backup_generation(db_path).is_full
+
+    edit(connection, rowid, 'три')
+    insert_memo(connection, make_memo('Другая', 'текст', 'y'))
+    connection.commit()
+
+    assert not backup_generation(db_path).is_full
+
+    expected = list(iter_memos(connection)), find_revisions(connection, rowid)
+    edit(connection, rowid, 'четыре')
+    connection.close()
+
+    assert restore_generation(db_path).number == 2
+    assert read_db(db_path, rowid) == expected
+    assert len(expected[1]) == 2
+
+
+def test_rotation_keeps_revisions(
+    connection: Connection, db_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Merging full copy with delta keeps revisions of delta."""
+    monkeypatch.setattr(backupstore, 'BACKUP_GENERATIONS', 2)
+    rowid = insert_memo(connection, make_memo('Заметка', 'один', 'x'))
+    connection.commit()
+    backup_generation(db_path)
+    states = {}
+
+    for number, body in enumerate(['два', 'три'], start=2):
+        edit(connection, rowid, body)
+        backup_generation(db_path)
+        states[number] = (
+            list(iter_memos(connection)),
+            find_revisions(connection, rowid),
+        )
+
+    generations = list_generations(db_path)
+
+    assert [(g.number, g.is_full) for g in generations] == [
+        (2, True),
+        (3, False),
+    ]
+
+    connection.close()
+
+    for number in (2, 3):
+        restore_generation(db_path, number)
+
+        assert read_db(db_path, rowid) == states[number]
+
+
+def test_legacy_backup_is_restored(
+    db_path: Path, make_baseline_db: Callable[[Path], Path]
+) -> None:
+    """Backup of older versions is imported and restored as generation."""
+    path_legacy = make_baseline_db(db_path.with_name(LEGACY_BACKUP))
+
+    assert check_backup(db_path)
+    assert list_generations(db_path) == []
+    assert path_legacy.exists()
+
+    generation = import_legacy_backup(db_path)
+
+    assert (generation.number, generation.is_full) == (1, True)
+    assert list_generations(db_path) == [generation]
+    assert not path_legacy.exists()
+    assert import_legacy_backup(db_path) is None
+
+    restore_generation(db_path)
+    memos = read_db(db_path, 1)[0]
+
+    assert [memo[2] for memo in memos] == ['## Рабочая заметка', '## Дом']
+
+
+def test_legacy_backup_without_number(
+    connection: Connection,
+    db_path: Path,
+    make_baseline_db: Callable[[Path], Path],
+) -> None:
+    """Backup of older versions is kept if generation 0 exists."""
+    backup_generation(db_path).path.rename(
+        db_path.with_name('backups').joinpath('000000.full.db')
+    )
+    path_legacy = make_baseline_db(db_path.with_name(LEGACY_BACKUP))
+
+    with pytest.raises(ValueError):
+        import_legacy_backup(db_path)
+
+    assert path_legacy.exists()
+
+
+def break_file(path: Path) -> None:
+    """Damages compressed file: its end is cut, the middle is overwritten."""
+    data = bytearray(path.read_bytes())
+    middle = len(data) // 2
+    data[middle:middle + 64] = bytes(64)
+    path.write_bytes(bytes(data[:-16]))
+
+
+@pytest.mark.parametrize('compression', ['xz', 'gz'])
+def test_broken_compressed_generation(
+    connection: Connection, db_path: Path, compression: str
+) -> None:
+    """Broken compressed generation raises OSError, DB is not changed."""
+    insert_memo(connection, make_memo('Заметка', 'текст ' * 5000, 'x'))
+    connection.commit()
+    generation = backup_generation(db_path, compression=compression)
+    break_file(generation.path)
+    expected = list(iter_memos(connection))
+    connection.close()
+
+    with pytest.raises(OSError):
+        restore_generation(db_path)
+
+    assert read_db(db_path, 1)[0] == expected
+
+
+def test_broken_generation_on_rotation(
+    connection: Connection, db_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Broken compressed generation merged on rotation raises OSError."""
+    monkeypatch.setattr(backupstore, 'BACKUP_GENERATIONS', 1)
+    rowid = insert_memo(connection, make_memo('Заметка', 'один ' * 5000, ''))
+    connection.commit()
+    break_file(backup_generation(db_path, compression='xz').path)
+    edit(connection, rowid, 'два')
+
+    with pytest.raises(OSError):
+        backup_generation(db_path)
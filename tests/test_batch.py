@@ -0,0 +1,60 @@
+"""Tests of batch mode (commands given by command-line arguments)."""
+import json
+from pathlib import Path
+
+import pytest
+
+from modules.batch import run_batch
+
+
+def test_search_prints_stored_memos(
+    home: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Found memos are printed as stored (without highlighted matches)."""
+    body = 'Начало. ' + 'текст ' * 100 + 'релиз'
+
+    assert run_batch(['add', '--title', "Don't panic", '--text', body]) == 0
+
+    capsys.readouterr()
+
+    assert run_batch(['search', '--text', 'релиз', '--format', 'jsonl']) == 0
+
+    memo = json.loads(capsys.readouterr().out)
+
+    assert (memo['title'], memo['text']) == ("Don't panic", body)
+
+
+@pytest.mark.parametrize('option', ['--title', '--text'])
+def test_search_without_words(
+    home: Path, capsys: pytest.CaptureFixture[str], option: str
+) -> None:
+    """Search without words finds nothing (it is not an error of DB)."""
+    assert run_batch(['add', '--title', 'Заметка', '--text', 'текст']) == 0
+    assert run_batch(['search', option, '  ']) == 1
+    assert capsys.readouterr().err == 'Заметки не найдены.\n'
+
+
+def test_restore_damaged_db(
+    home: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Damaged DB is not opened by `restore-db` and is restored."""
+    assert run_batch(['add', '--title', 'Заметка', '--text', 'текст']) == 0
+    assert run_batch(['backup-db']) == 0
+
+    home.joinpath('.memopad', 'memos.db').write_bytes(b'not a database' * 512)
+
+    assert run_batch(['count']) == 1
+    assert run_batch(['restore-db']) == 0
+
+    capsys.readouterr()
+
+    assert run_batch(['count']) == 0
+    assert capsys.readouterr().out == '1\n'
+
+
+def test_search_by_last_day(
+    home: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The last supported day is reported as a wrong date."""
+    assert run_batch(['search', '--date', '9999-12-31']) == 2
+    assert capsys.readouterr().err == 'Введена неверная дата!\n'
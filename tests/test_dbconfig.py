@@ -0,0 +1,76 @@
+"""Tests of config file (section `[storage]`)."""
+from pathlib import Path
+
+import pytest
+
+from modules.dbconfig import StorageConfig, read_config
+
+
+def write_config(directory: Path, text: str) -> Path:
+    """Writes config file with section `[storage]`."""
+    path = directory.joinpath('config')
+    path.write_text(f'[storage]\n{text}\n', encoding='utf-8')
+
+    return path
+
+
+def test_defaults(tmp_path: Path) -> None:
+    """Missing config file gives default settings."""
+    assert read_config(tmp_path.joinpath('config')) == StorageConfig()
+
+
+def test_settings(tmp_path: Path) -> None:
+    """Settings are parsed, relative path is relative to config's dir."""
+    path = write_config(
+        tmp_path,
+        'path = notes/work.db\n'
+        + 'mmap_size = 268435456\n'
+        + 'cache_size = -8000\n'
+        + 'page_size = 8192\n'
+        + 'journal_mode = DELETE\n'
+        + 'backup_compression = xz',
+    )
+
+    assert read_config(path) == StorageConfig(
+        path=tmp_path.joinpath('notes/work.db'),
+        mmap_size=268435456,
+        cache_size=-8000,
+        page_size=8192,
+        journal_mode='delete',
+        backup_compression='xz',
+    )
+
+
+def test_backup_compression_none(tmp_path: Path) -> None:
+    """`backup_compression = none` keeps backups uncompressed."""
+    path = write_config(tmp_path, 'backup_compression = none')
+
+    assert read_config(path).backup_compression is None
+
+
+@pytest.mark.parametrize(
+    'setting',
+    [
+        'unknown = 1',
+        'path = /',
+        'mmap_size = -1',
+        'cache_size = 0',
+        'cache_size = many',
+        'page_size = 1000',
+        'journal_mode = off',
+        'backup_compression = zip',
+    ],
+)
+def test_invalid_setting(tmp_path: Path, setting: str) -> None:
+    """Invalid setting raises ValueError."""
+    with pytest.raises(ValueError):
+        read_config(write_config(tmp_path, setting))
+
+
+def test_not_parsed(tmp_path: Path) -> None:
+    """Broken config file raises ValueError."""
+    path = tmp_path.joinpath('config')
+    path.write_text('[storage\npath = x\n', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        read_config(path)
@@ -0,0 +1,23 @@
+"""Tests of session's connection to DB (REPL)."""
+from pathlib import Path
+from sqlite3 import DatabaseError
+
+import pytest
+
+from modules.dbconnector import create_db, open_db
+from modules.memostore import connect_db
+
+
+def test_damaged_db_is_opened(db_path: Path) -> None:
+    """Damaged DB is reported, but session's connection is opened."""
+    db_path.write_bytes(b'not a database' * 512)
+
+    with pytest.raises(DatabaseError):
+        connect_db(db_path)
+
+    connection = open_db(db_path)
+
+    try:
+        create_db(connection)
+    finally:
+        connection.close()
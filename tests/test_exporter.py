@@ -0,0 +1,72 @@
+"""Tests of export to Markdown-files and import of them back."""
+from pathlib import Path
+from sqlite3 import Connection
+
+from modules.exporter import export_memos
+from modules.importer import find_md_files, import_md_files
+from modules.importer import parse_front_matter
+from modules.memostore import connect_db, insert_memo, iter_memos
+from modules.memostore import make_memo, migrate_db
+
+TITLES: list[str] = [
+    "Don't panic",
+    'Say "hi": #1 [draft]',
+    "it's \\ back, 'quoted'",
+    '"Quoted" title "end"',
+    '[draft] notes, [1]',
+    'Заметка о работе',
+]
+
+
+def test_md_round_trip(connection: Connection, tmp_path: Path) -> None:
+    """Memos exported to Markdown are imported without changes."""
+    for title in TITLES:
+        insert_memo(
+            connection,
+            make_memo(
+                title,
+                f'Текст: {title}\nвторая строка',
+                'work it\'s "q"',
+                '2023-05-17 10:30:00',
+            ),
+        )
+
+    connection.commit()
+    directory = tmp_path.joinpath('md')
+
+    assert export_memos(iter_memos(connection), directory, 'md') == len(TITLES)
+
+    imported = connect_db(tmp_path.joinpath('imported.db'))
+    migrate_db(imported)
+
+    try:
+        inserted = import_md_files(imported, find_md_files(directory))[0]
+
+        assert inserted == len(TITLES)
+        assert sorted(memo[1:] for memo in iter_memos(imported)) == sorted(
+            memo[1:] for memo in iter_memos(connection)
+        )
+    finally:
+        imported.close()
+
+
+def test_front_matter_keeps_inner_quotes() -> None:
+    """Only one pair of surrounding quotes is removed from values."""
+    meta = parse_front_matter(
+        'title: Don\'t panic\n'
+        + 'tags: [work, "a\\"b", \'it\'\'s\']\n'
+        + 'date: "2023-05-17"'
+    )
+
+    assert meta == {
+        'title': "Don't panic",
+        'tags': 'work a"b it\'s',
+        'date': '2023-05-17',
+    }
+
+
+def test_front_matter_block_list() -> None:
+    """Items of block list are unquoted and joined by spaces."""
+    meta = parse_front_matter('tags:\n  - "x y"\n  - z')
+
+    assert meta == {'tags': 'x y z'}
@@ -0,0 +1,149 @@
+"""Tests of schema's migrations and of indexes kept in sync by triggers."""
+from pathlib import Path
+from sqlite3 import Connection
+from typing import Callable
+
+import pytest
+
+from modules.memostore import SQL_MIGRATIONS, connect_db, count_total
+from modules.memostore import delete_memo_by_rowid, find_memos_by_substring
+from modules.memostore import find_memos_by_tag, find_memos_by_text
+from modules.memostore import find_memos_by_title, find_revisions
+from modules.memostore import insert_memo, iter_snippet_pages, make_memo
+from modules.memostore import migrate_db, parse_date_range, update_memo
+
+LONG_BODY = 'слово ' * 400 + 'годовой план'
+
+
+def ids(memos: list[tuple[str, ...]]) -> list[int]:
+    """ROWIDs of found memos."""
+    return [memo[0] for memo in memos]
+
+
+def check_fts(connection: Connection) -> None:
+    """Checks full-text index against memos (raises if it is broken)."""
+    connection.execute(
+        "INSERT INTO memos_fts (memos_fts) VALUES ('integrity-check');"
+    )
+
+
+def test_migration_from_baseline(
+    db_path: Path, make_baseline_db: Callable[[Path], Path]
+) -> None:
+    """DB of the baseline schema is upgraded with indexes of its memos."""
+    make_baseline_db(db_path)
+    connection = connect_db(db_path)
+
+    try:
+        migrate_db(connection)
+        migrate_db(connection)
+        version = connection.execute('PRAGMA user_version;').fetchone()[0]
+
+        assert version == len(SQL_MIGRATIONS)
+        assert count_total(connection) == 2
+        assert ids(find_memos_by_title(connection, 'рабоч')) == [1]
+        assert ids(find_memos_by_text(connection, 'хлеб')) == [2]
+        assert ids(find_memos_by_tag(connection, 'sqlite')) == [2]
+        assert ids(find_memos_by_substring(connection, 'елиз')) == [1]
+        check_fts(connection)
+    finally:
+        connection.close()
+
+
+def test_indexes_follow_changes(connection: Connection) -> None:
+    """Triggers keep indexes and total of memos up to date."""
+    rowid = insert_memo(
+        connection, make_memo('Отчёт', 'квартальный отчёт', 'work')
+    )
+    connection.commit()
+
+    assert ids(find_memos_by_text(connection, 'квартальн')) == [rowid]
+
+    update_memo(
+        connection, rowid, '2023-01-01 10:00:00', 'План', LONG_BODY, 'plan'
+    )
+
+    assert find_memos_by_title(connection, 'отчёт') == []
+    assert find_memos_by_text(connection, 'квартальн') == []
+    assert find_memos_by_tag(connection, 'work') == []
+    assert ids(find_memos_by_title(connection, 'план')) == [rowid]
+    assert ids(find_memos_by_text(connection, 'годов')) == [rowid]
+    assert ids(find_memos_by_tag(connection, 'plan')) == [rowid]
+    assert ids(find_memos_by_substring(connection, 'одовой')) == [rowid]
+    assert find_memos_by_text(connection, 'годов')[0][3] == LONG_BODY
+    check_fts(connection)
+
+    assert delete_memo_by_rowid(connection, rowid)
+    assert count_total(connection) == 0
+    assert find_memos_by_text(connection, 'годов') == []
+    assert find_memos_by_substring(connection, 'одовой') == []
+    check_fts(connection)
+
+
+def test_snippet_pages(connection: Connection) -> None:
+    """Found memos are read by pages with highlighted matches."""
+    for number in range(5):
+        insert_memo(connection, make_memo(f'План {number}', LONG_BODY, ''))
+
+    connection.commit()
+    pages = list(iter_snippet_pages(connection, 'bodies', 'годов', 2))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert all('**годовой**' in memo[3] for page in pages for memo in page)
+    assert len(pages[0][0][3]) < len(LONG_BODY)
+
+
+def test_revisions(connection: Connection) -> None:
+    """Changes of memo are kept as revisions until memo is deleted."""
+    rowid = insert_memo(connection, make_memo('Заметка', 'один два', 'x'))
+    connection.commit()
+    update_memo(connection, rowid, '2023-01-01 10:00:00', body='один три')
+    update_memo(connection, rowid, '2023-01-02 10:00:00', title='Новая')
+
+    versions = find_revisions(connection, rowid)
+
+    assert [version[2:] for version in versions] == [
+        ('## Заметка', 'один два', '#x'),
+        ('## Заметка', 'один три', '#x'),
+    ]
+
+    delete_memo_by_rowid(connection, rowid)
+    total = connection.execute('SELECT COUNT(*) FROM memo_revisions;')
+
+    assert total.fetchone()[0] == 0
+
+
+@pytest.mark.parametrize('date, expected', [
+    ('2022-10-01', ('2022-10-01', '2022-10-02')),
+    ('2022-Q4', ('2022-10-01', '2023-01-01')),
+    ('2022..2023-02', ('2022-01-01', '2023-03-01')),
+])
+def test_date_range(date: str, expected: tuple[str, str]) -> None:
+    """Period is parsed to the first day and the day after the last day."""
+    assert parse_date_range(date) == expected
+
+
+@pytest.mark.parametrize(
+    'date', ['9999-12-31', '9999-12', '9999-Q4', '9999', '2022..9999-12-31']
+)
+def test_date_range_out_of_dates(date: str) -> None:
+    """Period ending after the last supported day is not valid."""
+    with pytest.raises(ValueError):
+        parse_date_range(date)
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('a b', [1]),
+    ('a | c', [1, 2, 3]),
+    ('a b | c', [1, 3]),
+    ('c | b a*', [1, 3]),
+    ('* | c', [3]),
+])
+def test_tag_query(
+    connection: Connection, query: str, expected: list[int]
+) -> None:
+    """Groups divided by `|` are united, tags of group are intersected."""
+    for tags in ['#a #b', '#a', '#c']:
+        insert_memo(connection, make_memo('Заметка', 'текст', tags))
+
+    assert ids(find_memos_by_tag(connection, query)) == expected